@@ -0,0 +1,173 @@
+import queue
+import threading
+import time
+import arcade
+from enums.alien_type import AlienType
+from settings import *
+
+# ------------ Manifest ------------ #
+# Small sprite textures, packed together into the texture atlas
+SPRITE_TEXTURES = [alien_type.texture_path for alien_type in AlienType] + [
+    SHIP_TEXTURE,
+    UFO_TEXTURE,
+    BULLET_TEXTURE,
+]
+# Full-screen images, drawn on their own
+IMAGES = [BACKGROUND_IMAGE]
+SOUNDS = [SHOOT_SOUND, EXPLOSION_SOUND, PLAYER_HIT_SOUND]
+ASSET_COUNT = len(SPRITE_TEXTURES) + len(IMAGES) + len(SOUNDS)
+
+
+# ------------ Decoding (no OpenGL, safe on any thread) ------------ #
+def decode_texture(path):
+    """Texture for an image file and its (seconds to load, bytes in memory)."""
+    start = time.perf_counter()
+    texture = arcade.load_texture(path)
+    elapsed = time.perf_counter() - start
+    image = texture.image
+    return texture, (elapsed, image.width * image.height * len(image.getbands()))
+
+
+def decode_sound(path):
+    """Fully decoded sound for a WAV file and its (seconds to load, bytes in memory)."""
+    start = time.perf_counter()
+    sound = arcade.load_sound(path)
+    elapsed = time.perf_counter() - start
+    audio_format = sound.source.audio_format
+    size = int(sound.source.duration * audio_format.sample_rate * audio_format.channels * audio_format.sample_size / 8)
+    return sound, (elapsed, size)
+
+
+class AssetManager:
+    """Loads every texture and sound in the manifest once and hands out shared handles.
+
+    `load()` only decodes files and does not need a window; `pack()` puts
+    the sprite textures into one texture atlas and needs an OpenGL context.
+    Load time and decoded size of every asset are kept for `report()`.
+
+    `start_loading()` decodes on a background thread instead, and the main
+    thread collects the results with `poll()`, which also uploads the
+    sprite textures, so a loading screen can keep drawing meanwhile."""
+
+    def __init__(self):
+        self.textures = {}
+        self.sounds = {}
+        # path -> (seconds to load, bytes in memory)
+        self.load_stats = {}
+        self.pack_time = 0.0
+        self.atlas = None
+        # Background loading: the thread only ever puts decoded assets into the queue
+        self.thread = None
+        self.decoded = queue.Queue()
+
+    @property
+    def loaded(self):
+        return len(self.textures) + len(self.sounds) == ASSET_COUNT
+
+    @property
+    def progress(self):
+        """Fraction of the manifest that is loaded."""
+        return (len(self.textures) + len(self.sounds)) / ASSET_COUNT
+
+    def load(self):
+        """Decode every texture and sound in the manifest that is not loaded yet."""
+        for path in SPRITE_TEXTURES + IMAGES:
+            if path not in self.textures:
+                self.load_texture(path)
+        for path in SOUNDS:
+            if path not in self.sounds:
+                self.load_sound(path)
+
+    def load_texture(self, path):
+        texture, self.load_stats[path] = decode_texture(path)
+        self.textures[path] = texture
+        return texture
+
+    def load_sound(self, path):
+        sound, self.load_stats[path] = decode_sound(path)
+        self.sounds[path] = sound
+        return sound
+
+    def start_loading(self):
+        """Decode everything that is not loaded yet on a background thread."""
+        if self.thread is not None or self.loaded:
+            return
+        textures = [path for path in SPRITE_TEXTURES + IMAGES if path not in self.textures]
+        sounds = [path for path in SOUNDS if path not in self.sounds]
+        self.thread = threading.Thread(target=self.decode_all, args=(textures, sounds), name="asset-loader", daemon=True)
+        self.thread.start()
+
+    def decode_all(self, textures, sounds):
+        """Loader thread: decode files and queue them for the main thread."""
+        try:
+            for path in textures:
+                self.decoded.put((self.textures, path, *decode_texture(path)))
+            for path in sounds:
+                self.decoded.put((self.sounds, path, *decode_sound(path)))
+        except Exception as error:
+            self.decoded.put((None, None, error, None))
+
+    def poll(self, atlas=None):
+        """Take in whatever the loader thread decoded so far and return the fraction loaded.
+
+        Runs on the main thread, so sprite textures are uploaded to `atlas`
+        here. An error on the loader thread is raised from here."""
+        while True:
+            try:
+                assets, path, asset, stats = self.decoded.get_nowait()
+            except queue.Empty:
+                break
+            if assets is None:
+                self.thread = None
+                raise asset
+            # Something may have loaded it on first use in the meantime; keep that one
+            if path in assets:
+                continue
+            assets[path] = asset
+            self.load_stats[path] = stats
+            if atlas is not None and path in SPRITE_TEXTURES:
+                start = time.perf_counter()
+                atlas.add(asset)
+                self.pack_time += time.perf_counter() - start
+        if self.loaded:
+            self.thread = None
+            if atlas is not None:
+                self.atlas = atlas
+        return self.progress
+
+    def pack(self, atlas):
+        """Add every sprite texture to one atlas so all sprite lists share it."""
+        if self.atlas is atlas:
+            return
+        start = time.perf_counter()
+        for path in SPRITE_TEXTURES:
+            atlas.add(self.texture(path))
+        self.pack_time = time.perf_counter() - start
+        self.atlas = atlas
+
+    def texture(self, path):
+        """Shared texture for a path, loaded on first use if it was not preloaded."""
+        texture = self.textures.get(path)
+        return texture if texture is not None else self.load_texture(path)
+
+    def sound(self, path):
+        """Shared sound for a path, loaded on first use if it was not preloaded."""
+        sound = self.sounds.get(path)
+        return sound if sound is not None else self.load_sound(path)
+
+    def report(self):
+        """Load time and memory of every asset, one line each."""
+        lines = [f"{'asset':<32} {'load ms':>8} {'memory KiB':>11}"]
+        total_time = total_size = 0
+        for path, (elapsed, size) in self.load_stats.items():
+            lines.append(f"{path:<32} {elapsed * 1000:8.2f} {size / 1024:11.1f}")
+            total_time += elapsed
+            total_size += size
+        lines.append(f"{'total':<32} {total_time * 1000:8.2f} {total_size / 1024:11.1f}")
+        if self.atlas is not None:
+            lines.append(f"atlas {self.atlas.width}x{self.atlas.height} packed in {self.pack_time * 1000:.2f} ms")
+        return "\n".join(lines)
+
+
+# Shared by every view and sprite
+assets = AssetManager()
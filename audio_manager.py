@@ -0,0 +1,84 @@
+import time
+import arcade
+from settings import MAX_VOICES, MAX_VOICES_PER_SOUND, SOUND_COALESCE_WINDOW
+
+
+class Voice:
+    """A sound that was started and is assumed to play until `ends_at`."""
+    def __init__(self, sound, player, started_at):
+        self.sound = sound
+        self.player = player
+        self.started_at = started_at
+        self.ends_at = started_at + sound.get_length()
+
+
+class AudioManager:
+    """Queues sound requests during a tick and starts them once per frame.
+
+    - Requests for the same sound in one frame are merged into one voice.
+    - A sound is not started again within `SOUND_COALESCE_WINDOW` seconds.
+    - At most `MAX_VOICES_PER_SOUND` voices of one sound and `MAX_VOICES`
+      voices in total play at once; when full, the oldest voice is stopped
+      to make room.
+
+    `active`, `dropped` and `stolen` say how busy the mixer is."""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.queue = []
+        self.voices = []
+        self.last_started = {}
+        self.dropped = 0
+        self.stolen = 0
+
+    @property
+    def active(self):
+        return len(self.voices)
+
+    def request(self, sound):
+        """Ask for a sound to be played at the next `flush()`."""
+        if sound in self.queue:
+            self.dropped += 1
+        else:
+            self.queue.append(sound)
+
+    def flush(self):
+        """Start the queued sounds, applying the coalescing window and voice caps."""
+        now = self.clock()
+        # Forget voices that have finished on their own (in place, this runs every frame)
+        voices = self.voices
+        for i in range(len(voices) - 1, -1, -1):
+            if voices[i].ends_at <= now:
+                del voices[i]
+
+        for sound in self.queue:
+            if now - self.last_started.get(sound, float("-inf")) < SOUND_COALESCE_WINDOW:
+                self.dropped += 1
+                continue
+            oldest = None
+            same_sound = 0
+            for voice in voices:
+                if voice.sound is sound:
+                    oldest = oldest or voice
+                    same_sound += 1
+            if same_sound >= MAX_VOICES_PER_SOUND:
+                self.steal(oldest)
+            elif len(voices) >= MAX_VOICES:
+                self.steal(self.voices[0])
+            player = arcade.play_sound(sound)
+            if player is not None:
+                self.voices.append(Voice(sound, player, now))
+            self.last_started[sound] = now
+        self.queue.clear()
+
+    def steal(self, voice):
+        """Stop a voice early to make room for a new one."""
+        arcade.stop_sound(voice.player)
+        self.voices.remove(voice)
+        self.stolen += 1
+
+    def stop_all(self):
+        for voice in self.voices:
+            arcade.stop_sound(voice.player)
+        self.voices.clear()
+        self.queue.clear()
@@ -0,0 +1,113 @@
+"""Allocation gate for the steady-state tick.
+
+Plays a scripted headless session, then traces a stretch of ticks with
+tracemalloc (fleet moving, bullets flying, no wave reset) and fails if the
+memory our own code holds on to grows by more than the budget per tick.
+Temporaries that are freed within the tick do not count; what is left
+behind is what makes the garbage collector run and frames drop.
+
+    python -m benchmarks.allocations
+    python -m benchmarks.allocations --view     # GameView.on_update/on_draw in a hidden window
+"""
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+from settings import SNAPSHOT_HISTORY, SNAPSHOT_INTERVAL, TICK_RATE
+from sim.policy import ScriptedPlayer
+from sim.world import World
+
+DT = 1 / TICK_RATE
+SEED = 1
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Long enough for every pool and the snapshot ring to reach their steady size
+WARMUP_TICKS = SNAPSHOT_INTERVAL * SNAPSHOT_HISTORY + TICK_RATE
+# Net bytes per tick our code may keep; the input recording alone grows by one byte a tick
+BYTES_PER_TICK_BUDGET = 8
+
+
+def world_session():
+    """Step function for a headless world and the world itself."""
+    world = World(SEED)
+    world.setup()
+    player = ScriptedPlayer()
+
+    def tick():
+        world.step(DT, player.act(world))
+
+    return tick, world
+
+
+def view_session():
+    """Step function running GameView.on_update and on_draw in a hidden window."""
+    os.environ.setdefault("ARCADE_HEADLESS", "1")
+    from asset_manager import assets
+    from window import GameWindow
+
+    window = GameWindow(seed=SEED, telemetry_dir=None, high_score_file=None)
+    assets.load()
+    assets.pack(window.ctx.default_atlas)
+    window.show_game()
+    view = window.current_view
+    player = ScriptedPlayer()
+
+    def tick():
+        view.inputs = player.act(view.world)
+        view.on_update(DT)
+        view.on_draw()
+
+    return tick, view.world
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--view", action="store_true", help="trace GameView.on_update/on_draw instead of World.step")
+    parser.add_argument("--ticks", type=int, default=600, help="traced ticks")
+    parser.add_argument("--budget", type=float, default=BYTES_PER_TICK_BUDGET, help="allowed net bytes per tick")
+    parser.add_argument("--top", type=int, default=10, help="lines with the biggest growth to print")
+    args = parser.parse_args()
+
+    tick, world = view_session() if args.view else world_session()
+    collections = [0]
+    gc.callbacks.append(lambda phase, info: phase == "start" and collections.__setitem__(0, collections[0] + 1))
+
+    # Trace the warm-up too, so frees of objects it allocated are seen
+    tracemalloc.start()
+    for _ in range(WARMUP_TICKS):
+        tick()
+    wave = world.wave
+    collections[0] = 0
+    before = tracemalloc.take_snapshot()
+    for _ in range(args.ticks):
+        tick()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    if world.wave != wave or world.game_over:
+        print("the session did not stay in steady state (wave cleared or game over); use fewer --ticks")
+        sys.exit(2)
+
+    ours = [tracemalloc.Filter(True, os.path.join(ROOT, "*"))]
+    stats = after.filter_traces(ours).compare_to(before.filter_traces(ours), "lineno")
+    growth = sum(stat.size_diff for stat in stats)
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    per_tick = growth / args.ticks
+
+    print(f"{args.ticks} ticks, {len(world.fleet)} aliens left, {collections[0]} garbage collections")
+    print(f"net growth in our code: {growth} B ({per_tick:.2f} B/tick, budget {args.budget:g})")
+    print(f"net growth including libraries: {total} B")
+    for stat in stats[:args.top]:
+        if stat.size_diff:
+            frame = stat.traceback[0]
+            print(f"  {os.path.relpath(frame.filename, ROOT)}:{frame.lineno}  {stat.size_diff:+} B  {stat.count_diff:+} blocks")
+
+    if per_tick > args.budget:
+        print("FAIL: allocations over budget")
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
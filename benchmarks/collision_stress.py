@@ -0,0 +1,128 @@
+"""Collision stress scenario: bullet storms through `World.check_collisions`.
+
+Both sides' projectile arrays are filled with bullets spread over the
+window, at several storm sizes, and one `check_collisions` call (the path
+the game runs every tick) is timed with bullet cancellation off and on.
+
+Cancellation pairs every player bullet with the alien bullets near it;
+`Projectiles.overlapping` does that for a whole tick at once. It is also
+compared with scanning every alien bullet for each player bullet (the
+quadratic way): every pair the scan finds must be among its candidates,
+and the run fails if it is not at least `--min-speedup` times faster in
+the largest storm.
+
+    python -m benchmarks.collision_stress
+    python -m benchmarks.collision_stress --bullets 1000 8000 --columns 44 --rows 20
+"""
+import argparse
+import gc
+import random
+import sys
+import time
+from sim.config import GameConfig
+from sim.projectiles import HALF_HEIGHT, HALF_WIDTH
+from sim.world import World
+
+from settings import ALIEN_COLUMNS, ALIEN_ROWS, WINDOW_HEIGHT, WINDOW_WIDTH
+
+
+def make_world(bullet_count, columns, rows, cancellation, seed=1):
+    """A world with a full fleet and `bullet_count` bullets a side spread over the window."""
+    config = GameConfig(alien_columns=columns, alien_rows=rows, bullet_cancellation=cancellation)
+    world = World(seed, config)
+    world.setup()
+    world.events.clear()
+    rng = random.Random(seed)
+    for _ in range(bullet_count):
+        world.player_bullets.add(rng.uniform(0, WINDOW_WIDTH), rng.uniform(0, WINDOW_HEIGHT), config.bullet_speed)
+    for _ in range(bullet_count):
+        world.alien_bullets.add(rng.uniform(0, WINDOW_WIDTH), rng.uniform(0, WINDOW_HEIGHT), -config.alien_bullet_speed)
+    return world
+
+
+def scan_pairs(world):
+    """Every player bullet's box compared with every alien bullet's, one player bullet at a time."""
+    player_bullets = world.player_bullets
+    alien_bullets = world.alien_bullets
+    count = alien_bullets.count
+    ax = alien_bullets.x[:count]
+    ay = alien_bullets.y[:count]
+    pairs = {}
+    for bullet in player_bullets.live().tolist():
+        x = player_bullets.x.item(bullet)
+        y = player_bullets.y.item(bullet)
+        near = ax + HALF_WIDTH > x - HALF_WIDTH
+        near &= ax - HALF_WIDTH < x + HALF_WIDTH
+        near &= ay + HALF_HEIGHT > y - HALF_HEIGHT
+        near &= ay - HALF_HEIGHT < y + HALF_HEIGHT
+        near &= alien_bullets.alive[:count]
+        if near.any():
+            pairs[bullet] = near.nonzero()[0].tolist()
+    return pairs
+
+
+def sorted_pairs(world):
+    return world.alien_bullets.overlapping(world.player_bullets)
+
+
+def check_collisions(world):
+    world.check_collisions()
+    return world
+
+
+def best_time(make, run, repeat):
+    """Best time of `run(world)` over `repeat` fresh worlds from `make()`, and its last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        world = make()
+        # Building the world leaves the collector due; keep it out of the timing
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        result = run(world)
+        best = min(best, time.perf_counter() - start)
+        gc.enable()
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bullets", type=int, nargs="+", default=[500, 1000, 2000, 4000], help="bullets a side in each storm")
+    parser.add_argument("--columns", type=int, default=ALIEN_COLUMNS)
+    parser.add_argument("--rows", type=int, default=ALIEN_ROWS)
+    parser.add_argument("--repeat", type=int, default=5, help="timed calls per measurement, the best one counts")
+    parser.add_argument("--min-speedup", type=float, default=3.0, help="required speedup of the pairing in the largest storm")
+    args = parser.parse_args()
+
+    sizes = sorted(args.bullets)
+    print(f"{args.columns}x{args.rows} fleet, ms per call (best of {args.repeat}): check_collisions with bullet "
+          f"cancellation off and on, crossing bullets paired by scanning and by sorting")
+    print(f"{'bullets a side':<16}{'off':>9}{'on':>9}{'us/bullet':>11}{'cancelled':>11}"
+          f"{'pairs':>9}{'scan':>9}{'sorted':>9}{'speedup':>9}")
+    speedup = 0.0
+    for bullet_count in sizes:
+        def make(cancellation=True):
+            return make_world(bullet_count, args.columns, args.rows, cancellation)
+
+        off, _ = best_time(lambda: make(False), check_collisions, args.repeat)
+        on, world = best_time(make, check_collisions, args.repeat)
+        scan, scanned = best_time(make, scan_pairs, args.repeat)
+        fast, paired = best_time(make, sorted_pairs, args.repeat)
+        assert all(set(slots) <= set(paired.get(bullet, ())) for bullet, slots in scanned.items()), \
+            f"{bullet_count} bullets a side: sorting missed pairs the scan found"
+        speedup = scan / fast
+        print(
+            f"{bullet_count:<16}{off * 1000:>9.2f}{on * 1000:>9.2f}{on / bullet_count * 1e6:>11.2f}"
+            f"{bullet_count - len(world.alien_bullets):>11}{sum(map(len, scanned.values())):>9}"
+            f"{scan * 1000:>9.2f}{fast * 1000:>9.2f}{speedup:>8.1f}x"
+        )
+
+    if speedup < args.min_speedup:
+        print(f"FAIL: pairing crossing bullets is only {speedup:.1f}x faster than scanning (budget {args.min_speedup:g}x)")
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
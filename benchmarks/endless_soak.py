@@ -0,0 +1,122 @@
+"""Endless mode soak: plays ever bigger waves until ticks go over budget.
+
+Plays endless mode with the scripted bot (given lives enough never to
+lose) for a fixed number of ticks per wave, then clears what is left of
+the fleet so the next, bigger wave comes in. Prints the tick time of every
+wave with what was alive, and stops at the first wave whose 99th
+percentile tick is over budget. The wave before it is the biggest one the
+game holds at full rate.
+
+    python -m benchmarks.endless_soak
+    python -m benchmarks.endless_soak --budget 2000 --ticks-per-wave 600
+    python -m benchmarks.endless_soak --view     # GameView.on_update/on_draw in a hidden window
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+from settings import TICK_RATE
+from sim.config import GameConfig
+from sim.policy import ScriptedPlayer
+from sim.world import World
+
+DT = 1 / TICK_RATE
+SEED = 1
+# Everything a tick does has to fit in one frame at the tick rate
+TICK_BUDGET_US = 1e6 / TICK_RATE
+WARMUP_TICKS = TICK_RATE
+CONFIG = GameConfig(endless_mode=True, player_lives=10**9)
+
+
+def world_session():
+    """Step function for a headless world, the world, and a hook to call after changing it outside a step."""
+    world = World(SEED, CONFIG)
+    world.setup()
+    player = ScriptedPlayer()
+
+    def tick():
+        world.step(DT, player.act(world))
+
+    return tick, world, lambda: None
+
+
+def view_session():
+    """Same, running GameView.on_update and on_draw in a hidden window."""
+    os.environ.setdefault("ARCADE_HEADLESS", "1")
+    from asset_manager import assets
+    from window import GameWindow
+
+    window = GameWindow(seed=SEED, telemetry_dir=None, game_config=CONFIG, high_score_file=None)
+    assets.load()
+    assets.pack(window.ctx.default_atlas)
+    window.show_game()
+    view = window.current_view
+    player = ScriptedPlayer()
+
+    def tick():
+        view.inputs = player.act(view.world)
+        view.on_update(DT)
+        view.on_draw()
+
+    return tick, view.world, view.handle_events
+
+
+def clear_wave(world, changed):
+    """Kill every alien left and bring in the next wave, like a step does once the fleet is gone."""
+    world.events.clear()
+    for alien in list(world.fleet):
+        world.kill_alien(alien)
+    world.reset()
+    changed()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--view", action="store_true", help="time GameView.on_update/on_draw instead of World.step")
+    parser.add_argument("--ticks-per-wave", type=int, default=TICK_RATE * 5, help="ticks played before a wave is cleared")
+    parser.add_argument("--budget", type=float, default=TICK_BUDGET_US, help="allowed p99 microseconds per tick")
+    parser.add_argument("--max-waves", type=int, default=1000, help="give up after this many waves")
+    args = parser.parse_args()
+
+    tick, world, changed = view_session() if args.view else world_session()
+    # First ticks compile shaders and fill caches; collections are part of what a tick costs,
+    # but not the ones left over from setting up
+    for _ in range(WARMUP_TICKS):
+        tick()
+    gc.collect()
+    print(f"{'wave':>5}{'fleet':>9}{'aliens':>8}{'bullets':>9}{'ufos':>6}{'p50 us':>10}{'p99 us':>10}{'max us':>10}")
+    over = None
+    while over is None and world.wave <= args.max_waves:
+        wave = world.wave
+        fleet = world.fleet
+        timings = []
+        bullets = ufos = 0
+        for _ in range(args.ticks_per_wave):
+            start = time.perf_counter()
+            tick()
+            timings.append(time.perf_counter() - start)
+            bullets = max(bullets, len(world.player_bullets) + len(world.alien_bullets))
+            ufos = max(ufos, len(world.ufos))
+        timings = sorted(timing * 1e6 for timing in timings)
+        p99 = percentile(timings, 0.99)
+        print(
+            f"{wave:>5}{f'{fleet.columns}x{fleet.rows}':>9}{fleet.capacity:>8}{bullets:>9}{ufos:>6}"
+            f"{percentile(timings, 0.5):>10.0f}{p99:>10.0f}{timings[-1]:>10.0f}"
+        )
+        if p99 > args.budget:
+            over = wave
+        clear_wave(world, changed)
+    if over is None:
+        print(f"every tick of {args.max_waves} waves was within budget ({args.budget:g} us at p99)")
+        sys.exit(0)
+    print(f"wave {over} went over budget ({args.budget:g} us at p99); wave {over - 1} is the biggest held at {TICK_RATE} ticks/s")
+
+
+if __name__ == "__main__":
+    main()
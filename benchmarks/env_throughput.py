@@ -0,0 +1,58 @@
+"""Environment steps per second of `sim.env`, with random actions.
+
+Measures a single environment, a vectorized one in this process, and a
+vectorized one spread over worker processes with shared memory.
+
+    python -m benchmarks.env_throughput --envs 64 --workers 8
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+
+from sim.env import ACTION_COUNT, SpaceInvadersEnv, VectorEnv
+
+SEED = 1
+
+
+def bench_single(steps):
+    env = SpaceInvadersEnv(SEED)
+    env.reset()
+    actions = np.random.default_rng(SEED).integers(0, ACTION_COUNT, steps)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(action)
+        if terminated or truncated:
+            env.reset()
+    return steps / (time.perf_counter() - start)
+
+
+def bench_vector(envs, workers, batches):
+    env = VectorEnv(envs, SEED, workers=workers)
+    try:
+        env.reset()
+        actions = np.random.default_rng(SEED).integers(0, ACTION_COUNT, (batches, envs))
+        start = time.perf_counter()
+        for batch in actions:
+            env.step(batch)
+        return envs * batches / (time.perf_counter() - start)
+    finally:
+        env.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--steps", type=int, default=20000, help="steps of the single environment")
+    parser.add_argument("--envs", type=int, default=64, help="environments in the vectorized runs")
+    parser.add_argument("--batches", type=int, default=300, help="lockstep steps of the vectorized runs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes of the parallel run")
+    args = parser.parse_args()
+
+    print(f"{'single env':<28} {bench_single(args.steps):10.0f} steps/s")
+    print(f"{f'{args.envs} envs, in process':<28} {bench_vector(args.envs, 0, args.batches):10.0f} steps/s")
+    print(f"{f'{args.envs} envs, {args.workers} workers':<28} {bench_vector(args.envs, args.workers, args.batches):10.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
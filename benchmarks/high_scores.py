@@ -0,0 +1,87 @@
+"""High-score store: main-thread cost of submitting a score.
+
+Submits thousands of scores to a store in a temporary directory, timing
+every `submit()` call, then closes it (which waits for the writer thread)
+and opens the database again to check that every row was written and that
+the reloaded top list matches the one kept in memory. Fails if a submit
+costs more than the budget at the 99th percentile, or if even one submit
+takes longer than the stall budget (a single slow one is a dropped frame).
+
+    python -m benchmarks.high_scores
+    python -m benchmarks.high_scores --scores 20000 --budget 20 --max-budget 500
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from high_scores import HighScoreStore
+
+# Microseconds a submit may take on the main thread (99th percentile)
+SUBMIT_BUDGET_US = 50
+# Microseconds the slowest submit may take
+SUBMIT_MAX_US = 1000
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scores", type=int, default=5000, help="scores to submit")
+    parser.add_argument("--budget", type=float, default=SUBMIT_BUDGET_US, help="allowed p99 microseconds per submit")
+    parser.add_argument("--max-budget", type=float, default=SUBMIT_MAX_US, help="allowed microseconds for the slowest submit")
+    args = parser.parse_args()
+    rng = random.Random(1)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "high_scores.db")
+        store = HighScoreStore(path)
+        timings = []
+        for _ in range(args.scores):
+            score = rng.randrange(0, 100_000, 10)
+            start = time.perf_counter()
+            store.submit(score, rng.randint(1, 10))
+            timings.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        store.close()
+        drain = time.perf_counter() - start
+        in_memory = store.top()
+
+        with sqlite3.connect(path) as connection:
+            (rows,) = connection.execute("SELECT COUNT(*) FROM scores").fetchone()
+        reloaded = HighScoreStore(path)
+        reloaded.close()
+
+    timings = sorted(timing * 1e6 for timing in timings)
+    p99 = percentile(timings, 0.99)
+    print(f"{args.scores} submits, {rows} rows written, writer finished {drain * 1000:.1f} ms after the last one")
+    print(
+        f"submit us  p50 {percentile(timings, 0.5):.2f}  p99 {p99:.2f}  max {timings[-1]:.2f}"
+        f"  (budget {args.budget:g} at p99, {args.max_budget:g} at most)"
+    )
+
+    failed = False
+    if rows != args.scores:
+        print(f"FAIL: {args.scores - rows} scores were not written")
+        failed = True
+    if reloaded.top() != in_memory:
+        print("FAIL: the top list read back from disk differs from the one kept in memory")
+        failed = True
+    if p99 > args.budget:
+        print("FAIL: submitting a score is over budget")
+        failed = True
+    if timings[-1] > args.max_budget:
+        print("FAIL: a submit stalled the main thread")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
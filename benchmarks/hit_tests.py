@@ -0,0 +1,125 @@
+"""Narrowphase microbenchmark: cost of one hit test between two bodies.
+
+Times the same pairs three ways:
+- arcade's sprite-vs-sprite check, which moves the hit box polygons to
+  the sprites' positions and scales before testing them (how the game
+  tested hits before the rules moved into `sim`)
+- a plain box overlap of the full sprite rectangles
+- `Body.collides_with`: cached hit shapes, tight box rejection first and
+  the polygon test only when the boxes overlap
+
+Pairs are split into ones whose boxes are apart (most broadphase
+candidates) and ones that are close enough for the polygon test to run.
+
+    python -m benchmarks.hit_tests
+    python -m benchmarks.hit_tests --pairs 100000 --repeat 10
+"""
+import argparse
+import random
+import time
+import arcade
+from sim.config import GameConfig
+from sim.entities import Body, PlayerBody, UFOBody
+from sim.fleet import Fleet
+from sim.hit_shapes import hit_shape
+
+from settings import *
+
+
+class BulletBody(Body):
+    """A bullet as a body, so it is tested the same way as everything else (the world keeps them in `sim.projectiles`)."""
+    __slots__ = ()
+
+    def __init__(self):
+        super().__init__(BULLET_WIDTH, BULLET_HEIGHT, shape=hit_shape(BULLET_TEXTURE))
+
+
+def box_overlap(a, b):
+    """The plain box test bodies used before they had hit shapes."""
+    return a.left < b.right and b.left < a.right and a.bottom < b.top and b.bottom < a.top
+
+
+def sprite_for(body):
+    if isinstance(body, BulletBody):
+        return arcade.Sprite(BULLET_TEXTURE)
+    if isinstance(body, PlayerBody):
+        return arcade.Sprite(SHIP_TEXTURE, scale=PLAYER_SCALING)
+    if isinstance(body, UFOBody):
+        return arcade.Sprite(UFO_TEXTURE)
+    return arcade.Sprite(body.alien_type.texture_path, scale=ALIEN_SCALING * body.alien_type.scale)
+
+
+def make_pairs(count, near, seed=1):
+    """(a, b, offset x, offset y) pairs of the kinds the game tests, placed near each other or apart."""
+    rng = random.Random(seed)
+    fleet = Fleet(rng, GameConfig())
+    fleet.reset()
+    aliens = [fleet.slots[0][row] for row in range(fleet.rows)]
+    player = PlayerBody(GameConfig())
+    ufo = UFOBody(1, UFO_SPEED)
+    targets = aliens + [ufo, player]
+    pairs = []
+    for _ in range(count):
+        target = rng.choice(targets)
+        bullet = BulletBody()
+        # Boxes overlap within this distance along both axes
+        reach_x = (bullet.width + target.width) / 2
+        reach_y = (bullet.height + target.height) / 2
+        if near:
+            dx, dy = rng.uniform(-reach_x, reach_x), rng.uniform(-reach_y, reach_y)
+        else:
+            dx, dy = rng.choice((-1, 1)) * rng.uniform(reach_x, 2 * reach_x), rng.uniform(-reach_y, reach_y)
+        pairs.append((bullet, target, dx, dy))
+    return pairs
+
+
+def place(pairs):
+    """Put every bullet at its offset from its target, and a sprite on top of both."""
+    placed = []
+    for bullet, target, dx, dy in pairs:
+        bullet.center_x = target.center_x + dx
+        bullet.center_y = target.center_y + dy
+        bullet_sprite, target_sprite = sprite_for(bullet), sprite_for(target)
+        bullet_sprite.position = bullet.center_x, bullet.center_y
+        target_sprite.position = target.center_x, target.center_y
+        placed.append((bullet, target, bullet_sprite, target_sprite))
+    return placed
+
+
+def time_per_test(test, placed, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for pair in placed:
+            test(pair)
+        best = min(best, time.perf_counter() - start)
+    return best / len(placed) * 1e9
+
+
+def sprite_test(pair):
+    _, _, bullet_sprite, target_sprite = pair
+    # Bullets move every tick, which throws away their adjusted hit box; nudge it by a hair
+    bullet_sprite.center_y += 1e-9
+    return arcade.check_for_collision(bullet_sprite, target_sprite)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pairs", type=int, default=20000, help="pairs of each kind to test")
+    parser.add_argument("--repeat", type=int, default=5, help="timed passes over the pairs, the best one counts")
+    args = parser.parse_args()
+    count = args.pairs
+    print(f"{count} pairs each, ns per test (best of {args.repeat})")
+    print(f"{'pairs':<14}{'arcade sprites':>16}{'box':>10}{'hit shape':>12}{'hits':>8}{'box hits':>10}")
+    for label, near in (("boxes apart", False), ("boxes overlap", True)):
+        placed = place(make_pairs(count, near))
+        hits = sum(bullet.collides_with(target) for bullet, target, _, _ in placed)
+        box_hits = sum(box_overlap(bullet, target) for bullet, target, _, _ in placed)
+        sprite_ns = time_per_test(sprite_test, placed, args.repeat)
+        box_ns = time_per_test(lambda pair: box_overlap(pair[0], pair[1]), placed, args.repeat)
+        shape_ns = time_per_test(lambda pair: pair[0].collides_with(pair[1]), placed, args.repeat)
+        print(f"{label:<14}{sprite_ns:>16.0f}{box_ns:>10.0f}{shape_ns:>12.0f}{hits:>8}{box_hits:>10}")
+
+
+if __name__ == "__main__":
+    main()
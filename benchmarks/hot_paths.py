@@ -0,0 +1,276 @@
+"""Benchmark suite for the per-tick hot paths.
+
+Runs scripted scenarios headless and reports latency percentiles and
+throughput of a whole tick and of its expensive parts, optionally
+compared against a saved baseline.
+
+    python -m benchmarks.hot_paths --output results.json
+    python -m benchmarks.hot_paths --baseline results.json
+    python -m benchmarks.hot_paths --draw      # also time GameView.on_draw (software OpenGL is fine)
+    python -m benchmarks.hot_paths --snapshot quicksave.snapshot    # also from a saved mid-game state
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from settings import TICK_RATE
+from sim import snapshot
+from sim.config import GameConfig
+from sim.policy import ScriptedPlayer
+from sim.world import World
+
+DT = 1 / TICK_RATE
+SEED = 1
+WARMUP_TICKS = 60
+# Phases of World.step that are timed separately
+PHASES = ["check_collisions", "update_fleet", "move_fleet"]
+
+
+# ------------ Scenarios ------------ #
+def keep_fraction(world, fraction):
+    """Kill aliens until only `fraction` of the fleet is left."""
+    aliens = list(world.fleet)
+    for alien in aliens[int(len(aliens) * fraction):]:
+        world.kill_alien(alien)
+
+
+def storm(world):
+    """Keep the screen full of bullets: everyone shoots every tick."""
+    world.player.can_shoot = True
+
+
+def hold_fire(world):
+    """Keep the fleet the way the scenario set it up: the player never gets to shoot."""
+    world.player.can_shoot = False
+
+
+# name -> (config overrides, setup(world), per tick hook or None,
+#          (least, most) of the wave's fleet alive on every measured tick or None)
+SCENARIOS = {
+    "full_fleet": ({}, None, hold_fire, (1.0, 1.0)),
+    "nearly_cleared": ({}, lambda world: keep_fraction(world, 0.05), hold_fire, (0.01, 0.05)),
+    # Bigger formations squeezed onto the screen; no drop, so the fleet never lands
+    "fleet_10x": (
+        {"alien_columns": 22, "alien_rows": 25, "alien_x_spacing": 26, "alien_y_spacing": 15, "alien_drop": 0},
+        None, None, None,
+    ),
+    "fleet_100x": (
+        {"alien_columns": 110, "alien_rows": 50, "alien_x_spacing": 5, "alien_y_spacing": 7, "alien_drop": 0},
+        None, None, None,
+    ),
+    "bullet_storm": (
+        {"alien_shoot_cooldown": 0.0, "min_cooldown": 0.0, "shoot_cooldown": 0.0, "alien_drop": 0, "player_lives": 10**9},
+        None, storm, None,
+    ),
+}
+
+
+def make_world(name):
+    overrides, setup, _, _ = SCENARIOS[name]
+    world = World(SEED, GameConfig().with_overrides(overrides))
+    world.setup()
+    if setup:
+        setup(world)
+    return world
+
+
+# ------------ Measuring ------------ #
+def stats(samples_ns):
+    """Latency percentiles (microseconds) and throughput of a list of timings."""
+    if not samples_ns:
+        return None
+    ordered = sorted(samples_ns)
+    count = len(ordered)
+
+    def pct(fraction):
+        return ordered[min(int(fraction * count), count - 1)] / 1000
+
+    mean = sum(ordered) / count
+    return {
+        "count": count,
+        "mean_us": mean / 1000,
+        "p50_us": pct(0.5),
+        "p90_us": pct(0.9),
+        "p99_us": pct(0.99),
+        "max_us": ordered[-1] / 1000,
+        "per_second": 1e9 / mean if mean else float("inf"),
+    }
+
+
+def check_fleet(name, world):
+    """Stop the run if the fleet is no longer what the scenario is named after."""
+    shares = SCENARIOS[name][3]
+    if shares is None:
+        return
+    least, most = (share * world.initial_alien_count for share in shares)
+    if not least <= len(world.fleet) <= most:
+        sys.exit(f"{name}: {len(world.fleet)} aliens alive at tick {world.tick}, expected {least:g} to {most:g}")
+
+
+def wrap_timed(obj, name, samples):
+    """Shadow a bound method with one that records how long each call took."""
+    method = getattr(obj, name)
+
+    def timed(*args, **kwargs):
+        start = time.perf_counter_ns()
+        result = method(*args, **kwargs)
+        samples.append(time.perf_counter_ns() - start)
+        return result
+
+    setattr(obj, name, timed)
+
+
+def bench_ticks(name, ticks):
+    """Time World.step and its main phases for one scenario."""
+    world = make_world(name)
+    hook = SCENARIOS[name][2]
+    player = ScriptedPlayer()
+    for _ in range(WARMUP_TICKS):
+        if hook:
+            hook(world)
+        world.step(DT, player.act(world))
+
+    phase_samples = {phase: [] for phase in PHASES}
+    for phase in PHASES:
+        wrap_timed(world, phase, phase_samples[phase])
+
+    tick_samples = []
+    for _ in range(ticks):
+        if hook:
+            hook(world)
+        inputs = player.act(world)
+        start = time.perf_counter_ns()
+        world.step(DT, inputs)
+        tick_samples.append(time.perf_counter_ns() - start)
+        check_fleet(name, world)
+
+    result = {"tick": stats(tick_samples)}
+    for phase in PHASES:
+        result[phase] = stats(phase_samples[phase])
+    result["create_fleet"] = bench_create_fleet(name)
+    return result
+
+
+def bench_create_fleet(name, repeat=50):
+    world = make_world(name)
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter_ns()
+        world.create_fleet()
+        samples.append(time.perf_counter_ns() - start)
+        world.events.clear()
+    return stats(samples)
+
+
+def bench_draw(name, frames):
+    """Time GameView.on_update and on_draw in a hidden window."""
+    os.environ.setdefault("ARCADE_HEADLESS", "1")
+    import arcade
+    from asset_manager import assets
+    from window import GameWindow
+    from views.game_view import GameView
+
+    try:
+        window = arcade.get_window()
+    except RuntimeError:
+        window = GameWindow(telemetry_dir=None, high_score_file=None)
+        assets.load()
+        assets.pack(window.ctx.default_atlas)
+    overrides, setup, hook, _ = SCENARIOS[name]
+    view = GameView(SEED, config=GameConfig().with_overrides(overrides))
+    view.setup()
+    window.show_view(view)
+    if setup:
+        setup(view.world)
+        view.handle_events()
+
+    player = ScriptedPlayer()
+    update_samples, draw_samples = [], []
+    for frame in range(WARMUP_TICKS + frames):
+        if hook:
+            hook(view.world)
+        view.inputs = player.act(view.world)
+        start = time.perf_counter_ns()
+        view.on_update(DT)
+        middle = time.perf_counter_ns()
+        view.on_draw()
+        window.ctx.finish()
+        end = time.perf_counter_ns()
+        if frame >= WARMUP_TICKS:
+            update_samples.append(middle - start)
+            draw_samples.append(end - middle)
+            check_fleet(name, view.world)
+        # Keep measuring the same scenario even if the bot loses
+        view.world.game_over = False
+    return {"on_update": stats(update_samples), "on_draw": stats(draw_samples)}
+
+
+# ------------ Baseline comparison ------------ #
+def compare(results, baseline, tolerance):
+    """Print p50 changes against a baseline and return the regressions."""
+    regressions = []
+    print(f"\n{'scenario':<16} {'metric':<18} {'baseline p50':>13} {'now p50':>10} {'change':>8}")
+    for scenario, metrics in results["scenarios"].items():
+        for metric, now in metrics.items():
+            before = baseline.get("scenarios", {}).get(scenario, {}).get(metric)
+            if not now or not before:
+                continue
+            change = now["p50_us"] / before["p50_us"] - 1 if before["p50_us"] else 0.0
+            flag = "  REGRESSION" if change > tolerance else ""
+            print(f"{scenario:<16} {metric:<18} {before['p50_us']:>11.1f}us {now['p50_us']:>8.1f}us {change:>+7.1%}{flag}")
+            if flag:
+                regressions.append((scenario, metric, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", action="append", choices=SCENARIOS, help="only run these scenarios")
+    parser.add_argument("--ticks", type=int, default=2000, help="measured ticks per scenario")
+    parser.add_argument("--draw", action="store_true", help="also time GameView.on_update/on_draw in a hidden window")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per scenario with --draw")
+    parser.add_argument("--snapshot", metavar="FILE", help="add a scenario starting from a quick-saved state")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against results saved with --output")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed p50 slowdown before failing")
+    args = parser.parse_args()
+
+    results = {
+        "python": sys.version.split()[0],
+        "ticks": args.ticks,
+        "scenarios": {},
+    }
+    names = list(args.scenario or SCENARIOS)
+    if args.snapshot:
+        blob = snapshot.load(args.snapshot)
+        SCENARIOS["snapshot"] = ({}, lambda world: snapshot.restore(world, blob), None, None)
+        names.append("snapshot")
+    for name in names:
+        scenario = bench_ticks(name, args.ticks)
+        if args.draw:
+            scenario.update(bench_draw(name, args.frames))
+        results["scenarios"][name] = scenario
+        tick = scenario["tick"]
+        line = f"{name:<16} tick p50 {tick['p50_us']:8.1f}us  p99 {tick['p99_us']:8.1f}us  {tick['per_second']:9.0f} ticks/s"
+        if args.draw:
+            line += f"  on_draw p50 {scenario['on_draw']['p50_us']:8.1f}us"
+        print(line)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
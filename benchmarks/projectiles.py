@@ -0,0 +1,242 @@
+"""Bullets as projectile arrays vs an object and a sprite per bullet: memory and tick cost.
+
+Both ways keep the same alien bullets falling over the whole screen
+(10,000 by default), topped up at the top as they fall off the bottom, with
+the player in the way:
+- sprites: how bullets were kept before `sim.projectiles`. A body object
+  per bullet with its attributes in an instance dict, moved and culled in
+  a loop, rebuilt into a spatial hash grid to find the ones near the
+  player, dead ones handed back and reused; in the view, an
+  `arcade.Sprite` per bullet in a SpriteList, whose position is
+  interpolated and set bullet by bullet every frame
+- arrays: `Projectiles.advance`, `in_box` and `compact` on one side's
+  arrays, and `BulletBatch.sync` copying every position to the vertex
+  array at once
+
+Memory is what tracemalloc sees per bullet (for the sprites, with the
+view's sprite, previous position and pool bookkeeping); times are per
+tick, the draw including waiting for the renderer.
+
+    python -m benchmarks.projectiles
+    python -m benchmarks.projectiles --bullets 2000 --ticks 300
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+from settings import BULLET_HEIGHT, BULLET_TEXTURE, BULLET_WIDTH, TICK_RATE, WINDOW_HEIGHT, WINDOW_WIDTH
+from sim.config import GameConfig
+from sim.entities import PlayerBody
+from sim.hit_shapes import hit_shape, overlaps
+from sim.projectiles import ALIEN, FIELDS, Projectiles
+from sim.spatial_hash import SpatialHash
+
+DT = 1 / TICK_RATE
+SEED = 1
+SPEED = -GameConfig().alien_bullet_speed
+WARMUP_TICKS = 30
+
+
+class BulletObject:
+    """A bullet the way the world kept them before: a body with its attributes in an instance dict."""
+    def __init__(self, x, y, speed):
+        self.width = BULLET_WIDTH
+        self.height = BULLET_HEIGHT
+        self.center_x = x
+        self.center_y = y
+        self.alive = True
+        self.shape = hit_shape(BULLET_TEXTURE)
+        self.speed = speed
+
+    @property
+    def left(self):
+        return self.center_x - self.width / 2
+
+    @property
+    def right(self):
+        return self.center_x + self.width / 2
+
+    @property
+    def bottom(self):
+        return self.center_y - self.height / 2
+
+    @property
+    def top(self):
+        return self.center_y + self.height / 2
+
+
+def spread(count, rng):
+    """Starting (x, y) of `count` bullets over the whole screen."""
+    return [(rng.uniform(0, WINDOW_WIDTH), rng.uniform(0, WINDOW_HEIGHT)) for _ in range(count)]
+
+
+# ------------ Sprite per bullet ------------ #
+class SpriteBullets:
+    def __init__(self, count, texture):
+        import arcade
+
+        self.rng = random.Random(SEED)
+        self.count = count
+        self.bullets = []
+        self.free = []
+        self.grid = SpatialHash()
+        self.sprite_list = arcade.SpriteList()
+        self.sprites = {}           # body -> sprite
+        self.previous = {}          # body -> position before the last tick
+        self.pool_of = {}           # sprite -> pool it came from
+        for x, y in spread(count, self.rng):
+            bullet = BulletObject(x, y, SPEED)
+            sprite = arcade.Sprite(texture)
+            sprite.position = x, y
+            self.sprite_list.append(sprite)
+            self.bullets.append(bullet)
+            self.sprites[bullet] = sprite
+            self.previous[bullet] = x, y
+            self.pool_of[sprite] = self.free
+
+    def step(self, player):
+        for bullet in self.bullets:
+            self.previous[bullet] = bullet.center_x, bullet.center_y
+        for bullet in self.bullets:
+            if bullet.alive:
+                bullet.center_y += bullet.speed * DT
+                if bullet.top < 0:
+                    bullet.alive = False
+        self.grid.rebuild(self.bullets)
+        for bullet in self.grid.query(player.left, player.bottom, player.right, player.top):
+            if bullet.alive and overlaps(bullet.shape, bullet.center_x, bullet.center_y, player.shape, player.center_x, player.center_y):
+                bullet.alive = False
+        kept = 0
+        for bullet in self.bullets:
+            if bullet.alive:
+                self.bullets[kept] = bullet
+                kept += 1
+            else:
+                self.free.append(bullet)
+        del self.bullets[kept:]
+        # Top up with pooled bodies and their sprites
+        while len(self.bullets) < self.count:
+            bullet = self.free.pop()
+            bullet.center_x, bullet.center_y = self.rng.uniform(0, WINDOW_WIDTH), WINDOW_HEIGHT
+            bullet.alive = True
+            self.bullets.append(bullet)
+            self.previous[bullet] = bullet.center_x, bullet.center_y
+
+    def sync(self, alpha):
+        for bullet in self.bullets:
+            previous_x, previous_y = self.previous[bullet]
+            self.sprites[bullet].position = (
+                previous_x + (bullet.center_x - previous_x) * alpha,
+                previous_y + (bullet.center_y - previous_y) * alpha,
+            )
+
+    def draw(self):
+        self.sprite_list.draw(pixelated=True)
+
+
+# ------------ Projectile arrays ------------ #
+class ArrayBullets:
+    def __init__(self, count, ctx=None):
+        self.rng = random.Random(SEED)
+        self.count = count
+        self.bullets = Projectiles(ALIEN)
+        for x, y in spread(count, self.rng):
+            self.bullets.add(x, y, SPEED)
+        self.batch = None
+        if ctx is not None:
+            from views.bullet_batch import BulletBatch
+            self.batch = BulletBatch(ctx)
+
+    def step(self, player):
+        bullets = self.bullets
+        bullets.advance(DT)
+        for bullet in bullets.in_box(player.left, player.bottom, player.right, player.top).tolist():
+            if bullets.hits(bullet, player.shape, player.center_x, player.center_y):
+                bullets.kill(bullet)
+        bullets.compact()
+        for _ in range(self.count - len(bullets)):
+            bullets.add(self.rng.uniform(0, WINDOW_WIDTH), WINDOW_HEIGHT, SPEED)
+
+    def sync(self, alpha):
+        self.batch.sync((self.bullets,), (1.0 - alpha) * DT)
+
+    def draw(self):
+        self.batch.draw()
+
+
+# ------------ Measuring ------------ #
+def bytes_per_bullet(build, count):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / count
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def time_ticks(bullets, ctx, ticks):
+    """p50 and p99 microseconds per tick of the simulation, the sync and the draw."""
+    player = PlayerBody(GameConfig())
+    samples = {"sim": [], "sync": [], "draw": []}
+    for tick in range(WARMUP_TICKS + ticks):
+        start = time.perf_counter()
+        bullets.step(player)
+        simulated = time.perf_counter()
+        bullets.sync(0.5)
+        synced = time.perf_counter()
+        bullets.draw()
+        ctx.finish()
+        drawn = time.perf_counter()
+        if tick >= WARMUP_TICKS:
+            samples["sim"].append((simulated - start) * 1e6)
+            samples["sync"].append((synced - simulated) * 1e6)
+            samples["draw"].append((drawn - synced) * 1e6)
+    return {name: (percentile(sorted(values), 0.5), percentile(sorted(values), 0.99)) for name, values in samples.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bullets", type=int, default=10000, help="bullets in flight")
+    parser.add_argument("--ticks", type=int, default=600, help="measured ticks per way")
+    args = parser.parse_args()
+
+    os.environ.setdefault("ARCADE_HEADLESS", "1")
+    import arcade
+    from asset_manager import assets
+
+    window = arcade.Window(WINDOW_WIDTH, WINDOW_HEIGHT, visible=False)
+    assets.load()
+    assets.pack(window.ctx.default_atlas)
+    texture = assets.texture(BULLET_TEXTURE)
+    hit_shape(BULLET_TEXTURE)
+
+    count = args.bullets
+    sprite_bytes = bytes_per_bullet(lambda: SpriteBullets(count, texture), count)
+    array_bytes = bytes_per_bullet(lambda: ArrayBullets(count), count)
+    slot_bytes = sum(dtype().itemsize for dtype in FIELDS.values())
+    print(f"{count} bullets")
+    print(f"memory per bullet: sprites {sprite_bytes:.0f} B, arrays {array_bytes:.1f} B "
+          f"({slot_bytes} B a slot, the rest is room to grow), {sprite_bytes / array_bytes:.0f}x less")
+    print("  plus 8 B of vertex data per bullet drawn, on the CPU and the GPU")
+
+    print(f"\nus per tick, {args.ticks} ticks{'':<6}{'p50':>10}{'p99':>10}")
+    results = {}
+    for name, bullets in (("sprites", SpriteBullets(count, texture)), ("arrays", ArrayBullets(count, window.ctx))):
+        results[name] = time_ticks(bullets, window.ctx, args.ticks)
+        for stage, (p50, p99) in results[name].items():
+            print(f"{name + ' ' + stage:<31}{p50:>10.0f}{p99:>10.0f}")
+    print()
+    for stage in ("sim", "sync", "draw"):
+        print(f"{stage:<5} sprites take {results['sprites'][stage][0] / results['arrays'][stage][0]:.1f}x as long as arrays at p50")
+    window.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""Frame time at several window sizes: fixed logical resolution vs drawing at window resolution.
+
+For every window size a hidden window is opened in a fresh process (on
+the software OpenGL renderer unless told otherwise) and the same mid-game
+frame is drawn two ways:
+- logical: `GameView.on_draw`, which draws at WINDOW_WIDTH x WINDOW_HEIGHT
+  into the logical screen and scales it to the window in one draw
+- native: the same sprites, particles and HUD drawn straight into the
+  window through a camera scaled to the same letterboxed area, over the
+  background pre-blended at window size and copied in with a framebuffer
+  blit (how frames were drawn before), so every sprite is filled at
+  window resolution
+
+Frame times include waiting for the renderer to finish.
+
+    python -m benchmarks.render_scaling
+    python -m benchmarks.render_scaling --sizes 800x600 1920x1080 --frames 60
+    python -m benchmarks.render_scaling --hardware     # use the default OpenGL driver
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+from settings import BACKGROUND_ALPHA, BACKGROUND_IMAGE, TICK_RATE, WINDOW_HEIGHT, WINDOW_WIDTH
+from sim.policy import ScriptedPlayer
+
+DT = 1 / TICK_RATE
+SEED = 1
+# Played before measuring, so there are bullets, particles and a dented fleet to draw
+WARMUP_TICKS = TICK_RATE * 5
+SIZES = ["800x600", "1280x720", "1920x1080", "2560x1440", "3840x2160"]
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def measure(size, frames):
+    """Frame time samples (ms) of both ways of drawing, in a window of `size`."""
+    import arcade
+    from asset_manager import assets
+    from window import GameWindow
+
+    window = GameWindow(seed=SEED, telemetry_dir=None, size=size, high_score_file=None)
+    assets.load()
+    assets.pack(window.ctx.default_atlas)
+    window.show_game()
+    view = window.current_view
+    player = ScriptedPlayer()
+    for _ in range(WARMUP_TICKS):
+        view.inputs = player.act(view.world)
+        view.on_update(DT)
+        view.world.game_over = False
+
+    ctx = window.ctx
+    left, bottom, width, height = window.logical_screen.viewport
+    camera = arcade.Camera2D(
+        viewport=arcade.LBWH(left, bottom, width, height),
+        projection=arcade.LRBT(-WINDOW_WIDTH / 2, WINDOW_WIDTH / 2, -WINDOW_HEIGHT / 2, WINDOW_HEIGHT / 2),
+        position=(WINDOW_WIDTH / 2, WINDOW_HEIGHT / 2),
+    )
+    background = ctx.framebuffer(color_attachments=[ctx.texture(window.get_framebuffer_size(), components=4)])
+    background.clear(color=arcade.color.BLACK)
+    with arcade.Camera2D(
+        viewport=camera.viewport, projection=camera.projection, position=camera.position, render_target=background,
+    ).activate():
+        arcade.draw_texture_rect(
+            assets.texture(BACKGROUND_IMAGE), arcade.LBWH(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT), alpha=BACKGROUND_ALPHA,
+        )
+
+    def draw_native():
+        ctx.copy_framebuffer(background, ctx.screen, depth=False)
+        ctx.screen.use(force=True)
+        with camera.activate():
+            view.bullets.draw()
+            view.sprite_batch.draw()
+            view.particles.draw()
+            view.hud.draw()
+
+    samples = {}
+    for name, draw in (("logical", view.on_draw), ("native", draw_native)):
+        timings = []
+        # A few untimed frames first, to compile shaders and upload buffers
+        for frame in range(10 + frames):
+            start = time.perf_counter()
+            draw()
+            ctx.finish()
+            if frame >= 10:
+                timings.append((time.perf_counter() - start) * 1000)
+        samples[name] = timings
+    window.close()
+    return samples
+
+
+def run_child(size, frames, hardware):
+    """Measure one window size in a fresh process, since a hidden window cannot be resized."""
+    env = dict(os.environ, ARCADE_HEADLESS="1")
+    if not hardware:
+        env["LIBGL_ALWAYS_SOFTWARE"] = "1"
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.render_scaling", "--child", size, "--frames", str(frames)],
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode:
+        sys.stderr.write(result.stderr)
+        raise SystemExit(f"measuring {size} failed")
+    return json.loads(result.stdout.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=SIZES, metavar="WxH", help="window sizes to compare")
+    parser.add_argument("--frames", type=int, default=120, help="measured frames per size and way of drawing")
+    parser.add_argument("--hardware", action="store_true", help="use the default OpenGL driver instead of the software one")
+    parser.add_argument("--child", metavar="WxH", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        size = tuple(int(value) for value in args.child.split("x"))
+        print(json.dumps(measure(size, args.frames)))
+        return
+
+    print(f"frame ms, {args.frames} frames each ({'default' if args.hardware else 'software'} OpenGL)")
+    print(f"{'window':<12}{'logical p50':>12}{'p99':>8}{'native p50':>12}{'p99':>8}{'native/logical':>16}")
+    for size in args.sizes:
+        samples = run_child(size, args.frames, args.hardware)
+        logical, native = sorted(samples["logical"]), sorted(samples["native"])
+        logical_p50, native_p50 = percentile(logical, 0.5), percentile(native, 0.5)
+        print(
+            f"{size:<12}{logical_p50:>12.2f}{percentile(logical, 0.99):>8.2f}"
+            f"{native_p50:>12.2f}{percentile(native, 0.99):>8.2f}{native_p50 / logical_p50:>15.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+from enum import Enum, auto
+
+class EventType(Enum):
+    """Things that happen inside the simulation that a renderer may want to react to."""
+    # Entity lifecycle, used to keep sprites in sync with the world
+    SPAWNED = auto()
+    DESPAWNED = auto()
+    # Gameplay events, used for sounds and explosion particles
+    SHOT_FIRED = auto()
+    ALIEN_KILLED = auto()
+    UFO_KILLED = auto()
+    PLAYER_HIT = auto()
+    WAVE_CLEARED = auto()
+    GAME_OVER = auto()
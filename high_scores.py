@@ -0,0 +1,118 @@
+import bisect
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from settings import HIGH_SCORE_COUNT, HIGH_SCORE_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    score INTEGER NOT NULL,
+    wave INTEGER NOT NULL,
+    played_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_by_score ON scores (score DESC, id);
+"""
+# Best first; among equal scores the earlier one ranks higher
+TOP_QUERY = "SELECT score, wave, played_at FROM scores ORDER BY score DESC, id LIMIT ?"
+INSERT = "INSERT INTO scores (score, wave, played_at) VALUES (?, ?, ?)"
+# Put on the queue by close() to stop the writer thread
+STOP = None
+# Seconds the writer waits after waking, so scores submitted together go in one transaction
+# and the writer takes the CPU from the game as seldom as it can
+WRITE_DELAY = 0.05
+
+
+def connect(path):
+    connection = sqlite3.connect(path)
+    # Readers never wait for the writer, and a commit does not fsync the whole database
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+class HighScoreStore:
+    """Local leaderboard in an SQLite database, written on a background thread.
+
+    The best `size` scores are read once when the store is opened and kept
+    in memory from then on, so `top()` never touches the disk. `submit()`
+    only updates that list and queues the row; the writer thread inserts
+    whatever is queued in one transaction. If writing fails the error is
+    printed and the store stops taking scores; `close()` writes what is
+    left and raises any error the writer thread ran into."""
+
+    def __init__(self, path=HIGH_SCORE_FILE, size=HIGH_SCORE_COUNT):
+        self.path = path
+        self.size = size
+        connection = connect(path)
+        try:
+            # (score, wave, played_at), best first
+            self.entries = connection.execute(TOP_QUERY, (size,)).fetchall()
+        finally:
+            connection.close()
+        self.pending = queue.SimpleQueue()
+        self.written = 0
+        self.error = None
+        # Cleared when the writer thread stops, after close() or an error
+        self.writing = True
+        self.thread = threading.Thread(target=self.write_all, name="high-score-writer", daemon=True)
+        self.thread.start()
+
+    def top(self):
+        """The best scores as (score, wave, played_at), best first."""
+        return self.entries
+
+    def submit(self, score, wave=1):
+        """Record a finished game and return its place on the leaderboard.
+
+        None if it did not make it, or if the store can no longer save it."""
+        if not self.writing:
+            return None
+        entry = (score, wave, time.time())
+        self.pending.put(entry)
+        # After every entry with at least this score, so an earlier equal score stays ahead
+        index = bisect.bisect_right(self.entries, -score, key=lambda other: -other[0])
+        if index >= self.size:
+            return None
+        self.entries.insert(index, entry)
+        del self.entries[self.size:]
+        return index + 1
+
+    def write_all(self):
+        """Writer thread: insert queued scores, batching whatever piled up meanwhile."""
+        connection = None
+        try:
+            connection = connect(self.path)
+            running = True
+            while running:
+                batch = [self.pending.get()]
+                time.sleep(WRITE_DELAY)
+                while not self.pending.empty():
+                    batch.append(self.pending.get_nowait())
+                if STOP in batch:
+                    running = False
+                    batch = [entry for entry in batch if entry is not STOP]
+                if batch:
+                    with connection:
+                        connection.executemany(INSERT, batch)
+                    self.written += len(batch)
+        except sqlite3.Error as error:
+            self.error = error
+            print(f"high scores: writing {self.path} failed, scores are no longer saved: {error}", file=sys.stderr)
+        finally:
+            self.writing = False
+            if connection is not None:
+                connection.close()
+
+    def close(self):
+        """Write every queued score and stop the writer thread."""
+        if self.thread is None:
+            return
+        self.pending.put(STOP)
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            raise self.error
@@ -0,0 +1,60 @@
+import time
+
+
+class InputLatency:
+    """Input-to-photon latency of the game keys.
+
+    Every key press and release is timestamped when its handler runs, again
+    when the first tick that samples it starts, and again when the first
+    frame drawn after that tick has been presented (after the buffer swap,
+    which waits for vsync when it is on). What the OS takes to deliver the
+    event and the display takes to scan the frame out come on top.
+
+    `key_event()`, `tick_started()` and `presented()` only append a
+    timestamp or move a few, so measuring does not change what is measured."""
+
+    def __init__(self):
+        self.waiting = []       # Event times no tick has sampled yet
+        self.applied = []       # (event time, tick start) not presented yet
+        # Milliseconds per event, by stage
+        self.samples = {"event_to_tick": [], "tick_to_present": [], "total": []}
+        self.frames = 0
+        self.started = time.perf_counter()
+
+    def key_event(self):
+        self.waiting.append(time.perf_counter())
+
+    def tick_started(self):
+        """A tick is about to sample the input state."""
+        if self.waiting:
+            now = time.perf_counter()
+            self.applied.extend((event, now) for event in self.waiting)
+            self.waiting.clear()
+
+    def presented(self):
+        """A frame has just been presented."""
+        self.frames += 1
+        if self.applied:
+            now = time.perf_counter()
+            for event, tick in self.applied:
+                self.samples["event_to_tick"].append((tick - event) * 1000)
+                self.samples["tick_to_present"].append((now - tick) * 1000)
+                self.samples["total"].append((now - event) * 1000)
+            self.applied.clear()
+
+    def report(self, tick_rate, vsync):
+        """Percentiles of every stage, with the settings they were measured under."""
+        elapsed = time.perf_counter() - self.started
+        lines = [
+            f"input latency: {len(self.samples['total'])} key events, tick rate {tick_rate}, "
+            f"vsync {'on' if vsync else 'off'}, {self.frames / max(elapsed, 1e-9):.1f} frames/s",
+            f"{'stage':<16}{'p50':>8}{'p90':>8}{'p99':>8}{'max':>8} ms",
+        ]
+        for stage, values in self.samples.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            last = len(ordered) - 1
+            p50, p90, p99 = (ordered[min(int(fraction * len(ordered)), last)] for fraction in (0.5, 0.9, 0.99))
+            lines.append(f"{stage:<16}{p50:8.2f}{p90:8.2f}{p99:8.2f}{ordered[-1]:8.2f}")
+        return "\n".join(lines)
@@ -1,13 +1,49 @@
+# Imported first so the startup trace starts before anything slow is imported
+from startup_trace import trace
+import argparse
 import arcade
+from settings import TELEMETRY_DIR, TICK_RATE, WINDOW_HEIGHT, WINDOW_WIDTH
+from sim.config import GameConfig
+from sim.world import SEED_LIMIT
 from window import GameWindow
 
 
 def main():
-    window = GameWindow()
-    window.show_game()
+    parser = argparse.ArgumentParser(description="Space Invaders")
+    parser.add_argument("--asset-report", action="store_true", help="print load time and memory of every asset")
+    parser.add_argument("--startup-trace", action="store_true", help="print how long each startup stage took, up to the first game frame")
+    parser.add_argument("--seed", type=int, help="seed for the game's random numbers")
+    parser.add_argument("--record", metavar="FILE", help="save the inputs of the game to FILE")
+    parser.add_argument("--replay", metavar="FILE", help="play back a game saved with --record")
+    parser.add_argument("--snapshot", metavar="FILE", help="start from a state saved with quick-save (F5)")
+    parser.add_argument("--profile-log", metavar="FILE", help="stream per-tick and per-frame phase timings to FILE (.jsonl or .csv)")
+    parser.add_argument("--endless", action="store_true", help="every wave brings a bigger fleet and heavier fire")
+    parser.add_argument("--latency", action="store_true", help="print key-to-present latency percentiles on exit")
+    parser.add_argument("--fullscreen", action="store_true", help="start fullscreen (F11 toggles)")
+    parser.add_argument("--window-size", metavar="WxH", help="window size; the game is drawn at WINDOW_WIDTH x WINDOW_HEIGHT and scaled up")
+    parser.add_argument("--vsync", action="store_true", help="wait for the display's vertical sync before presenting a frame")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation ticks per second")
+    parser.add_argument("--no-telemetry", action="store_true", help="do not record gameplay events")
+    args = parser.parse_args()
+    if args.seed is not None and not -SEED_LIMIT <= args.seed < SEED_LIMIT:
+        parser.error("--seed has to fit in a signed 64-bit integer")
+    if args.startup_trace:
+        trace.enable()
+        trace.mark("import modules")
+
+    window = GameWindow(
+        seed=args.seed, replay_path=args.replay, record_path=args.record, profile_path=args.profile_log,
+        snapshot_path=args.snapshot, asset_report=args.asset_report,
+        telemetry_dir=None if args.no_telemetry else TELEMETRY_DIR,
+        game_config=GameConfig(endless_mode=True) if args.endless else None,
+        tick_rate=args.tick_rate, vsync=args.vsync, latency=args.latency, fullscreen=args.fullscreen,
+        size=tuple(map(int, args.window_size.split("x"))) if args.window_size else (WINDOW_WIDTH, WINDOW_HEIGHT),
+    )
+    # Shows a loading view first; the game starts once the assets are in
+    window.start()
     # Start the arcade game loop
     arcade.run()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
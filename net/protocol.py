@@ -0,0 +1,180 @@
+"""Wire format of the game server.
+
+Every message is a 4-byte little-endian length followed by the payload,
+whose first byte is the message type. The server streams one frame per
+tick: a keyframe with the whole state, or a delta against the last frame
+the client acknowledged, holding only what changed since then.
+"""
+import struct
+from sim import projectiles
+from sim.entities import UFOBody
+
+from settings import DELTA_HISTORY
+
+# ------------ Message types ------------ #
+# Client -> server
+HELLO = 1       # role
+INPUT = 2       # input bits (sim.replay.encode)
+ACK = 3         # tick of the last frame applied
+# Server -> client
+WELCOME = 16    # client id, seed, tick rate, fleet size
+KEYFRAME = 17
+DELTA = 18
+
+# ------------ Roles ------------ #
+SPECTATOR = 0
+PLAYER = 1
+
+# ------------ Entity kinds ------------ #
+PLAYER_BULLET = 0
+ALIEN_BULLET = 1
+UFO = 2
+# Side in `sim.projectiles` -> kind of its bullets
+BULLET_KINDS = {projectiles.PLAYER: PLAYER_BULLET, projectiles.ALIEN: ALIEN_BULLET}
+
+LENGTH = struct.Struct("<I")
+HELLO_MESSAGE = struct.Struct("<BB")
+INPUT_MESSAGE = struct.Struct("<BB")
+ACK_MESSAGE = struct.Struct("<BI")
+WELCOME_MESSAGE = struct.Struct("<BHqHHH")
+# type, tick, baseline tick, game, score, wave, lives, player x, fleet offset x, fleet offset y, alien mask bytes
+FRAME_HEADER = struct.Struct("<BIIHIHifffB")
+COUNT = struct.Struct("<H")
+ENTITY_ID = struct.Struct("<H")
+ENTITY = struct.Struct("<HBhh")     # id, kind, x, y
+
+
+def message(payload):
+    """Length-prefixed message ready to be written to a stream."""
+    return LENGTH.pack(len(payload)) + payload
+
+
+async def read_message(reader):
+    """Payload of the next message, or None when the stream has ended."""
+    try:
+        header = await reader.readexactly(LENGTH.size)
+        return await reader.readexactly(LENGTH.unpack(header)[0])
+    except (ConnectionError, EOFError, OSError):
+        return None
+
+
+def entity_kind(entity):
+    if isinstance(entity, UFOBody):
+        return UFO
+    return None
+
+
+class FrameState:
+    """What clients are sent about one tick, quantized to whole pixels.
+
+    `alive` is the fleet's occupancy as an int bitmask (bit `col * rows +
+    row`), and `entities` maps the network id of every bullet and UFO to
+    `(kind, x, y)`."""
+    __slots__ = ("tick", "game", "score", "wave", "lives", "player_x", "offset_x", "offset_y", "alive", "entities")
+
+    def __init__(self, tick=0, game=0, score=0, wave=1, lives=0, player_x=0.0, offset_x=0.0, offset_y=0.0, alive=0, entities=None):
+        self.tick = tick
+        self.game = game
+        self.score = score
+        self.wave = wave
+        self.lives = lives
+        self.player_x = player_x
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.alive = alive
+        self.entities = entities if entities is not None else {}
+
+    def copy(self):
+        return FrameState(
+            self.tick, self.game, self.score, self.wave, self.lives,
+            self.player_x, self.offset_x, self.offset_y, self.alive, dict(self.entities),
+        )
+
+
+def encode_frame(state, baseline=None, mask_size=8):
+    """A keyframe, or with a `baseline` a delta holding only what changed since it.
+
+    A delta carries the aliens killed since the baseline as a bitmask, the
+    ids of entities that went away and the entities that are new or moved.
+    Aliens only ever come back with a new wave or game, which always gets a
+    keyframe, so killed aliens are all a delta needs about the fleet."""
+    if baseline is None:
+        frame_type, baseline_tick, mask = KEYFRAME, 0, state.alive
+        removed = ()
+        changed = state.entities.items()
+    else:
+        frame_type, baseline_tick, mask = DELTA, baseline.tick, baseline.alive & ~state.alive
+        before = baseline.entities
+        removed = [net_id for net_id in before if net_id not in state.entities]
+        changed = [(net_id, entity) for net_id, entity in state.entities.items() if before.get(net_id) != entity]
+
+    parts = [
+        FRAME_HEADER.pack(
+            frame_type, state.tick, baseline_tick, state.game, state.score, state.wave, state.lives,
+            state.player_x, state.offset_x, state.offset_y, mask_size,
+        ),
+        mask.to_bytes(mask_size, "little"),
+        COUNT.pack(len(removed)),
+    ]
+    parts.extend(ENTITY_ID.pack(net_id) for net_id in removed)
+    parts.append(COUNT.pack(len(changed)))
+    parts.extend(ENTITY.pack(net_id, kind, x, y) for net_id, (kind, x, y) in changed)
+    return b"".join(parts)
+
+
+class StateMirror:
+    """Client-side copy of the game state, rebuilt from keyframes and deltas.
+
+    A delta is relative to a frame the client acknowledged earlier, not
+    necessarily to the last one it applied, so recent states are kept by
+    tick to apply deltas to."""
+
+    def __init__(self, history=DELTA_HISTORY):
+        self.history = history
+        self.states = {}
+        self.state = None
+        self.keyframes = 0
+        self.deltas = 0
+
+    def apply(self, payload):
+        """Apply one frame and return its tick, or None if its baseline is no longer known."""
+        (
+            frame_type, tick, baseline_tick, game, score, wave, lives,
+            player_x, offset_x, offset_y, mask_size,
+        ) = FRAME_HEADER.unpack_from(payload)
+        offset = FRAME_HEADER.size
+        mask = int.from_bytes(payload[offset:offset + mask_size], "little")
+        offset += mask_size
+
+        if frame_type == KEYFRAME:
+            state = FrameState(alive=mask)
+            self.keyframes += 1
+        else:
+            baseline = self.states.get(baseline_tick)
+            if baseline is None:
+                return None
+            state = baseline.copy()
+            state.alive &= ~mask
+            self.deltas += 1
+        state.tick, state.game, state.score, state.wave, state.lives = tick, game, score, wave, lives
+        state.player_x, state.offset_x, state.offset_y = player_x, offset_x, offset_y
+
+        (removed,) = COUNT.unpack_from(payload, offset)
+        offset += COUNT.size
+        for _ in range(removed):
+            state.entities.pop(ENTITY_ID.unpack_from(payload, offset)[0], None)
+            offset += ENTITY_ID.size
+        (changed,) = COUNT.unpack_from(payload, offset)
+        offset += COUNT.size
+        for _ in range(changed):
+            net_id, kind, x, y = ENTITY.unpack_from(payload, offset)
+            state.entities[net_id] = (kind, x, y)
+            offset += ENTITY.size
+
+        self.states[tick] = state
+        if len(self.states) > 2 * self.history:
+            # Frames can be skipped, so sweep out everything too old now and then
+            for old in [old for old in self.states if old <= tick - self.history]:
+                del self.states[old]
+        self.state = state
+        return tick
@@ -0,0 +1,257 @@
+"""Asyncio game server: runs the rules at a fixed tick and streams the state to clients over TCP.
+
+Up to MAX_PLAYERS clients steer the ship together (their inputs are
+merged every tick), any number of others spectate. Every tick each client
+gets a delta against the last frame it acknowledged, or a keyframe when it
+has none, the wave or game changed, or KEYFRAME_INTERVAL ticks passed.
+
+    python -m net.server --port 7777
+"""
+import argparse
+import asyncio
+import statistics
+from collections import deque
+from enums.event_type import EventType
+from net import protocol
+from net.protocol import FrameState, encode_frame, message, read_message
+from sim.config import GameConfig
+from sim.inputs import InputState
+from sim.replay import FIRE, decode
+from sim.world import World
+
+from settings import (
+    DELTA_HISTORY, KEYFRAME_INTERVAL, MAX_PLAYERS, MAX_TICKS_PER_FRAME, RANDOM_SEED,
+    SEND_BUFFER_LIMIT, SERVER_HOST, SERVER_PORT, TICK_RATE,
+)
+
+
+class Client:
+    """One connection and what the server knows about it."""
+    def __init__(self, client_id, role, writer):
+        self.id = client_id
+        self.role = role
+        self.writer = writer
+        self.bits = 0           # Latest input bits of a player
+        self.acked = None       # Server tick of the last frame it applied
+        self.sent_bytes = 0
+        self.skipped = 0        # Frames not sent because its send buffer was full
+
+
+class GameServer:
+    """Steps one `World` on a fixed tick and broadcasts frames to every client.
+
+    Writes never wait: a client whose send buffer is over
+    `SEND_BUFFER_LIMIT` simply misses frames until it catches up, and since
+    deltas are against acknowledged frames it is never sent anything it
+    cannot apply. Frames sent to several clients against the same baseline
+    are encoded once per tick."""
+
+    def __init__(self, seed=RANDOM_SEED, config: GameConfig | None = None, tick_rate=TICK_RATE):
+        if config is not None and config.endless_mode:
+            raise ValueError("clients are told the fleet size once, so the server cannot play endless mode")
+        self.world = World(seed, config)
+        self.world.setup()
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.inputs = InputState()
+        self.clients = {}
+        self.next_client_id = 0
+        # Server ticks keep counting across games, so a tick names one frame for good
+        self.tick = 0
+        self.game = 0
+        self.history = {}       # tick -> FrameState, the last DELTA_HISTORY ticks
+        self.net_ids = {}       # UFO body -> network id
+        self.bullet_ids = {}    # (kind, serial) of a bullet in flight -> network id
+        self.next_net_id = 0
+        fleet = self.world.fleet
+        self.mask_size = (fleet.capacity + 7) // 8
+        self.lateness = deque(maxlen=tick_rate * 60)   # Seconds each tick started late
+        self.keyframes = 0
+        self.deltas = 0
+
+    # ------------ Connections ------------ #
+    async def handle_client(self, reader, writer):
+        payload = await read_message(reader)
+        if payload is None or payload[0] != protocol.HELLO:
+            writer.close()
+            return
+        _, role = protocol.HELLO_MESSAGE.unpack(payload)
+        players = sum(1 for client in self.clients.values() if client.role == protocol.PLAYER)
+        if role == protocol.PLAYER and players >= MAX_PLAYERS:
+            role = protocol.SPECTATOR
+        client = Client(self.next_client_id, role, writer)
+        self.next_client_id = (self.next_client_id + 1) & 0xFFFF
+        fleet = self.world.fleet
+        writer.write(message(protocol.WELCOME_MESSAGE.pack(
+            protocol.WELCOME, client.id, self.world.seed, self.tick_rate, fleet.columns, fleet.rows,
+        )))
+        self.clients[writer] = client
+
+        try:
+            while (payload := await read_message(reader)) is not None:
+                if payload[0] == protocol.ACK:
+                    client.acked = protocol.ACK_MESSAGE.unpack(payload)[1]
+                elif payload[0] == protocol.INPUT and client.role == protocol.PLAYER:
+                    bits = protocol.INPUT_MESSAGE.unpack(payload)[1]
+                    # Keep a fire press until the tick that consumes it
+                    client.bits = bits | (client.bits & FIRE)
+        finally:
+            del self.clients[writer]
+            writer.close()
+
+    # ------------ Simulation ------------ #
+    async def run(self, duration=None):
+        """Tick until cancelled (or for `duration` seconds), recording how late each tick starts."""
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        end = next_tick + duration if duration is not None else None
+        while end is None or next_tick < end:
+            next_tick += self.dt
+            delay = next_tick - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            late = loop.time() - next_tick
+            self.lateness.append(max(late, 0.0))
+            # After a long stall, drop the backlog instead of trying to catch up forever
+            if late > self.dt * MAX_TICKS_PER_FRAME:
+                next_tick = loop.time()
+            self.step()
+
+    def step(self):
+        """Advance the game one tick and send the new frame to everyone."""
+        world = self.world
+        bits = 0
+        for client in self.clients.values():
+            if client.role == protocol.PLAYER:
+                bits |= client.bits
+                client.bits &= ~FIRE
+        world.step(self.dt, decode(bits, self.inputs))
+        self.track_entities()
+        if world.game_over:
+            self.restart()
+        self.tick += 1
+        state = self.capture()
+        self.history[self.tick] = state
+        self.history.pop(self.tick - DELTA_HISTORY, None)
+        self.broadcast(state)
+
+    def restart(self):
+        """Start a new game; every client gets a keyframe next."""
+        self.world.setup()
+        self.track_entities()
+        self.game += 1
+        self.history.clear()
+
+    def track_entities(self):
+        """Give every UFO that spawned a network id and forget the ones that went away."""
+        for event, entity in self.world.events:
+            if event == EventType.SPAWNED and protocol.entity_kind(entity) is not None:
+                self.net_ids[entity] = self.new_net_id()
+            elif event == EventType.DESPAWNED:
+                self.net_ids.pop(entity, None)
+        self.world.events.clear()
+
+    def new_net_id(self):
+        net_id = self.next_net_id
+        self.next_net_id = (self.next_net_id + 1) & 0xFFFF
+        return net_id
+
+    def capture(self):
+        world = self.world
+        fleet = world.fleet
+        alive = 0
+        for column in fleet.slots:
+            for alien in column:
+                if alien.alive:
+                    alive |= 1 << (alien.col * fleet.rows + alien.row)
+        entities = {}
+        for ufo in world.ufos:
+            entities[self.net_ids[ufo]] = (protocol.UFO, round(ufo.center_x), round(ufo.center_y))
+        # Bullets keep their network id for as long as their serial is in flight
+        bullet_ids = {}
+        for bullets in (world.player_bullets, world.alien_bullets):
+            kind = protocol.BULLET_KINDS[bullets.owner]
+            slots = bullets.live()
+            for serial, x, y in zip(bullets.serial[slots].tolist(), bullets.x[slots].tolist(), bullets.y[slots].tolist()):
+                net_id = self.bullet_ids.get((kind, serial))
+                if net_id is None:
+                    net_id = self.new_net_id()
+                bullet_ids[kind, serial] = net_id
+                entities[net_id] = (kind, round(x), round(y))
+        self.bullet_ids = bullet_ids
+        return FrameState(
+            self.tick, self.game, world.score, world.wave, world.player.lives,
+            world.player.center_x, fleet.offset_x, fleet.offset_y, alive, entities,
+        )
+
+    # ------------ Streaming ------------ #
+    def baseline_for(self, client, state):
+        """The acknowledged frame to send a delta against, or None for a keyframe."""
+        if state.tick % KEYFRAME_INTERVAL == 0 or client.acked is None:
+            return None
+        baseline = self.history.get(client.acked)
+        if baseline is None or baseline.game != state.game or baseline.wave != state.wave:
+            return None
+        return baseline
+
+    def broadcast(self, state):
+        encoded = {}    # baseline tick (None for a keyframe) -> message
+        for client in self.clients.values():
+            transport = client.writer.transport
+            if transport.is_closing():
+                continue
+            if transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+                client.skipped += 1
+                continue
+            baseline = self.baseline_for(client, state)
+            key = baseline.tick if baseline is not None else None
+            data = encoded.get(key)
+            if data is None:
+                data = encoded[key] = message(encode_frame(state, baseline, self.mask_size))
+                if baseline is None:
+                    self.keyframes += 1
+                else:
+                    self.deltas += 1
+            client.writer.write(data)
+            client.sent_bytes += len(data)
+
+    def report(self):
+        """Tick lateness percentiles and what was sent, one line each."""
+        lateness = sorted(self.lateness) or [0.0]
+
+        def pct(fraction):
+            return lateness[min(int(fraction * len(lateness)), len(lateness) - 1)] * 1000
+
+        return "\n".join([
+            f"ticks {self.tick}  clients {len(self.clients)}  keyframes encoded {self.keyframes}  deltas encoded {self.deltas}",
+            f"tick lateness ms  p50 {pct(0.5):.2f}  p99 {pct(0.99):.2f}  max {lateness[-1] * 1000:.2f}"
+            f"  stdev {statistics.pstdev(lateness) * 1000:.2f}",
+        ])
+
+
+async def serve(host=SERVER_HOST, port=SERVER_PORT, seed=RANDOM_SEED, duration=None, tick_rate=TICK_RATE):
+    game = GameServer(seed, tick_rate=tick_rate)
+    server = await asyncio.start_server(game.handle_client, host, port)
+    async with server:
+        try:
+            await game.run(duration)
+        finally:
+            print(game.report(), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--seed", type=int, help="seed for the game's random numbers")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds and print the tick report")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="simulation ticks per second")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.seed, args.duration, args.tick_rate))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -26,4 +26,81 @@ ALIEN_DROP = 35
 ALIEN_BULLET_SPEED = 200
 ALIEN_SHOOT_COOLDOWN = 2.0  # 2 seconds
 MIN_COOLDOWN = 1.5 # Minimum cooldown for alien shooting
-MAX_FLEET_SPEED = 85  # Max speed for alien fleet 
\ No newline at end of file
+MAX_FLEET_SPEED = 85  # Max speed for alien fleet 
+# Endless mode: every wave cleared brings a bigger fleet and heavier fire
+ENDLESS_MODE = False
+ENDLESS_ROWS_PER_WAVE = 1  # Rows added on top of the formation each wave, above the screen once it is full
+ENDLESS_COLUMNS_PER_WAVE = 1  # Columns added each wave, up to ENDLESS_MAX_COLUMNS
+ENDLESS_MAX_COLUMNS = 14  # Widest formation that still has room to march across the window
+ENDLESS_SHOOTERS_PER_WAVE = 1  # Extra aliens firing at once each wave
+ENDLESS_WAVES_PER_UFO = 3  # Waves between each extra UFO flying in together, at least 1
+ENDLESS_MAX_UFOS = 8  # Most UFOs flying in together
+# Source sprite dimensions (pixels), used by the headless simulation for hit boxes
+SPRITE_SIZE = 32
+BULLET_WIDTH = 5
+BULLET_HEIGHT = 15
+# Player start position
+PLAYER_START_Y = 60
+# UFO configuration
+UFO_SPEED = 100
+UFO_SCORE = 100
+UFO_SPAWN_RATE = 0.06  # Average UFOs per second
+UFO_Y = WINDOW_HEIGHT - 40
+# Collision broadphase
+COLLISION_CELL_SIZE = 64  # Should be at least as big as the largest sprite
+BULLET_CANCELLATION = False  # Player and alien bullets destroy each other on contact
+# Object pools (initial sizes, they grow when exhausted)
+UFO_POOL_SIZE = 2
+# Bullets each side's projectile arrays hold before they double
+BULLET_CAPACITY = 32
+BULLET_BROADPHASE_MIN = 20  # Fewer bullets than this are hit-tested one by one, without comparing boxes first
+# Explosion particles
+PARTICLE_BUDGET = 4096  # Live particles at most, the oldest are culled to make room
+PARTICLE_SIZE = 3  # pixels
+PARTICLE_LIFETIME = 0.6  # seconds, each particle lives between half of this and all of it
+PARTICLE_GRAVITY = 200  # pixels/s² pulling the debris down
+# Bursts: (particles, fastest speed in pixels/s, colour)
+ALIEN_BURST = (40, 150, (239, 246, 235))
+UFO_BURST = (120, 220, (89, 125, 206))
+PLAYER_BURST = (200, 260, (199, 59, 59))
+# Simulation timing
+TICK_RATE = 60  # Fixed simulation ticks per second, independent of the display refresh rate
+MAX_TICKS_PER_FRAME = 5  # Ticks run at most per rendered frame before dropping time
+RANDOM_SEED = None  # Seed for the game's random numbers, None for a new one every game
+# Snapshots
+SNAPSHOT_INTERVAL = 30  # Ticks between snapshots kept for rewinding
+SNAPSHOT_HISTORY = 20  # Snapshots kept, so rewinding goes back up to SNAPSHOT_INTERVAL * SNAPSHOT_HISTORY ticks
+QUICKSAVE_FILE = "quicksave.snapshot"  # Written by quick-save, can be started from with --snapshot
+# High scores
+HIGH_SCORE_FILE = "high_scores.db"  # SQLite database of every finished game
+HIGH_SCORE_COUNT = 10  # Best scores kept in memory and shown after a game
+# Telemetry (sim.telemetry)
+TELEMETRY_DIR = "telemetry"  # Where gameplay event files are written, None to record nothing
+TELEMETRY_BUFFER = 65536  # Records buffered in memory; more than this waiting to be written are dropped
+TELEMETRY_BATCH = 4096  # Records that wake the writer thread
+# Training environment (sim.env)
+ENV_MAX_BULLETS = 16  # Bullets per side included in an observation
+ENV_MAX_TICKS = TICK_RATE * 60 * 10  # Episodes are cut off after this many ticks
+# Network server (net.server)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 7777
+MAX_PLAYERS = 2  # Clients whose inputs steer the ship; everyone else spectates
+KEYFRAME_INTERVAL = TICK_RATE  # Ticks between full-state frames sent to every client
+DELTA_HISTORY = TICK_RATE  # Past ticks kept to send deltas against a client's last acknowledged frame
+SEND_BUFFER_LIMIT = 64 * 1024  # Bytes queued for a client before its frames are skipped
+# Profiler
+PROFILER_WINDOW = 240  # Ticks/frames the rolling percentiles are computed over
+PROFILER_REFRESH = 0.25  # Seconds between overlay text updates
+# Sound
+MAX_VOICES = 8  # Sounds playing at once before the oldest one is stopped
+MAX_VOICES_PER_SOUND = 3  # Same, for copies of one sound
+SOUND_COALESCE_WINDOW = 0.05  # Seconds during which the same sound is not started again
+# Asset paths (alien textures live on AlienType)
+BACKGROUND_IMAGE = "assets/bg.jpg"
+BACKGROUND_ALPHA = 120  # How strongly the background shows through the black
+SHIP_TEXTURE = "assets/Sprite-Ship.png"
+UFO_TEXTURE = "assets/Sprite-UFO.png"
+BULLET_TEXTURE = "assets/bullet.png"
+SHOOT_SOUND = "assets/sfx/Shoot24.wav"
+EXPLOSION_SOUND = "assets/sfx/Boom75.wav"
+PLAYER_HIT_SOUND = "assets/sfx/Hit61.wav"
@@ -0,0 +1,30 @@
+from settings import TICK_RATE, MAX_TICKS_PER_FRAME
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation ticks.
+
+    Leftover time is carried over to the next frame, and `alpha` says how far
+    the renderer is between the last two ticks so it can interpolate."""
+
+    def __init__(self, tick_rate=TICK_RATE, max_ticks=MAX_TICKS_PER_FRAME):
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        self.max_ticks = max_ticks
+        self.accumulator = 0.0
+
+    def advance(self, delta_time):
+        """Add a frame's worth of time and return how many ticks to run."""
+        self.accumulator += delta_time
+        ticks = 0
+        while self.accumulator >= self.dt and ticks < self.max_ticks:
+            self.accumulator -= self.dt
+            ticks += 1
+        # After a long stall, drop the backlog instead of trying to catch up forever
+        if ticks == self.max_ticks:
+            self.accumulator = min(self.accumulator, self.dt)
+        return ticks
+
+    @property
+    def alpha(self):
+        return min(self.accumulator / self.dt, 1.0)
@@ -0,0 +1,67 @@
+from dataclasses import dataclass, fields, replace
+import settings
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """Difficulty and gameplay knobs for one game.
+
+    Defaults come from `settings.py`; field names are the lowercase names of
+    the settings they replace. Sprite sizes and the playfield size are not
+    here since they have to match the textures and the window."""
+    player_lives: int = settings.PLAYER_LIVES
+    movement_speed: float = settings.MOVEMENT_SPEED
+    bullet_speed: float = settings.BULLET_SPEED
+    shoot_cooldown: float = settings.SHOOT_COOLDOWN
+    alien_rows: int = settings.ALIEN_ROWS
+    alien_columns: int = settings.ALIEN_COLUMNS
+    top_alien_rows: int = settings.TOP_ALIEN_ROWS
+    mid_alien_rows: int = settings.MID_ALIEN_ROWS
+    alien_x_spacing: float = settings.ALIEN_X_SPACING
+    alien_y_spacing: float = settings.ALIEN_Y_SPACING
+    alien_start_x: float = settings.ALIEN_START_X
+    alien_start_y: float = settings.ALIEN_START_Y
+    alien_speed: float = settings.ALIEN_SPEED
+    alien_drop: float = settings.ALIEN_DROP
+    alien_bullet_speed: float = settings.ALIEN_BULLET_SPEED
+    alien_shoot_cooldown: float = settings.ALIEN_SHOOT_COOLDOWN
+    min_cooldown: float = settings.MIN_COOLDOWN
+    max_fleet_speed: float = settings.MAX_FLEET_SPEED
+    ufo_speed: float = settings.UFO_SPEED
+    ufo_score: int = settings.UFO_SCORE
+    ufo_spawn_rate: float = settings.UFO_SPAWN_RATE
+    bullet_cancellation: bool = settings.BULLET_CANCELLATION
+    endless_mode: bool = settings.ENDLESS_MODE
+    endless_rows_per_wave: int = settings.ENDLESS_ROWS_PER_WAVE
+    endless_columns_per_wave: int = settings.ENDLESS_COLUMNS_PER_WAVE
+    endless_max_columns: int = settings.ENDLESS_MAX_COLUMNS
+    endless_shooters_per_wave: int = settings.ENDLESS_SHOOTERS_PER_WAVE
+    endless_waves_per_ufo: int = settings.ENDLESS_WAVES_PER_UFO
+    endless_max_ufos: int = settings.ENDLESS_MAX_UFOS
+
+    def __post_init__(self):
+        if self.endless_waves_per_ufo < 1:
+            raise ValueError(f"endless_waves_per_ufo must be at least 1, not {self.endless_waves_per_ufo}")
+        if self.endless_max_ufos < 1:
+            raise ValueError(f"endless_max_ufos must be at least 1, not {self.endless_max_ufos}")
+
+    def with_overrides(self, overrides):
+        """Copy of this config with some values changed.
+
+        `overrides` maps setting names, in either case (`ALIEN_SPEED` or
+        `alien_speed`), to new values, which are converted to the field's type."""
+        types = {field.name: field.type for field in fields(self)}
+        changes = {}
+        for name, value in overrides.items():
+            key = name.lower()
+            if key not in types:
+                raise KeyError(f"unknown setting: {name}")
+            changes[key] = parse_value(types[key], value)
+        return replace(self, **changes)
+
+
+def parse_value(field_type, value):
+    """Convert a value (possibly a command-line string) to a config field type."""
+    if field_type is bool and isinstance(value, str):
+        return value.lower() in ("1", "true", "yes", "on")
+    return field_type(value)
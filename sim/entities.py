@@ -0,0 +1,171 @@
+from enums.alien_type import AlienType
+from sim.config import GameConfig
+from sim.hit_shapes import box_shape, hit_shape, overlaps
+from settings import (
+    SPRITE_SIZE, PLAYER_SCALING, ALIEN_SCALING,
+    PLAYER_START_Y, UFO_Y, WINDOW_WIDTH, SHIP_TEXTURE, UFO_TEXTURE,
+)
+
+
+class Body:
+    """Axis-aligned box with the same position API as `arcade.Sprite`.
+
+    The simulation only needs positions and sizes, so it works on these
+    instead of sprites and never touches a window. The box is what moves
+    and bounces off the screen edges; hits are tested against `shape`, the
+    outline of the sprite's opaque pixels, shared by every body drawn with
+    the same texture and scale.
+
+    Bodies keep their attributes in `__slots__` rather than an instance
+    dict. Bullets are not bodies: see `sim.projectiles`."""
+    __slots__ = ("width", "height", "center_x", "center_y", "alive", "shape")
+
+    def __init__(self, width, height, center_x=0.0, center_y=0.0, shape=None):
+        self.width = width
+        self.height = height
+        self.center_x = center_x
+        self.center_y = center_y
+        self.alive = True
+        self.shape = shape or box_shape(width, height)
+
+    @property
+    def left(self):
+        return self.center_x - self.width / 2
+
+    @left.setter
+    def left(self, value):
+        self.center_x = value + self.width / 2
+
+    @property
+    def right(self):
+        return self.center_x + self.width / 2
+
+    @right.setter
+    def right(self, value):
+        self.center_x = value - self.width / 2
+
+    @property
+    def bottom(self):
+        return self.center_y - self.height / 2
+
+    @bottom.setter
+    def bottom(self, value):
+        self.center_y = value + self.height / 2
+
+    @property
+    def top(self):
+        return self.center_y + self.height / 2
+
+    @top.setter
+    def top(self, value):
+        self.center_y = value - self.height / 2
+
+    def collides_with(self, other):
+        """Check if the hit shapes of this body and another one overlap."""
+        return overlaps(self.shape, self.center_x, self.center_y, other.shape, other.center_x, other.center_y)
+
+
+class PlayerBody(Body):
+    """Player spaceship at the bottom of the screen."""
+    __slots__ = ("config", "shoot_cooldown", "can_shoot", "speed", "change_x", "lives")
+
+    def __init__(self, config: GameConfig):
+        self.config = config
+        size = SPRITE_SIZE * PLAYER_SCALING
+        super().__init__(size, size, WINDOW_WIDTH // 2, PLAYER_START_Y, hit_shape(SHIP_TEXTURE, PLAYER_SCALING))
+        # Shoot cooldown timer
+        self.shoot_cooldown = 0 # start at 0 so player can shoot immediately
+        self.can_shoot = True
+        self.speed = config.movement_speed
+        self.change_x = 0
+
+        self.lives = config.player_lives
+
+    def update(self, delta_time: float = 1/60):
+        # Player movement
+        self.center_x += self.change_x * self.speed * delta_time
+        self.clamp_player_to_screen()
+        # Update shoot cooldown timer
+        if not self.can_shoot:
+            self.shoot_cooldown -= delta_time
+            if self.shoot_cooldown <= 0:
+                self.can_shoot = True
+
+    def shoot_bullet(self, projectiles):
+        """Shoot a bullet from player ship into the player's `projectiles`; returns its slot, or None while reloading."""
+        if self.can_shoot:
+            bullet = projectiles.add(self.center_x, self.top, self.config.bullet_speed)
+            # Reset shoot cooldown
+            self.can_shoot = False
+            self.shoot_cooldown = self.config.shoot_cooldown
+            return bullet
+        else:
+            return None
+
+    def clamp_player_to_screen(self):
+        """Keep the player on the screen."""
+        if self.left < 0:
+            self.left = 0
+        elif self.right > WINDOW_WIDTH:
+            self.right = WINDOW_WIDTH
+
+
+class AlienBody(Body):
+    """Alien enemy in a slot of the fleet grid.
+
+    Its position is not stored: it is the slot position plus the offset the
+    whole fleet shares, so moving the fleet never touches single aliens."""
+    __slots__ = ("alien_type", "score_value", "fleet", "col", "row")
+
+    def __init__(self, alien_type: AlienType, fleet, col, row):
+        scale = ALIEN_SCALING * alien_type.scale
+        self.width = self.height = SPRITE_SIZE * scale
+        self.shape = hit_shape(alien_type.texture_path, scale)
+        self.alien_type = alien_type
+        self.score_value = alien_type.score
+        self.fleet = fleet
+        self.col = col
+        self.row = row
+        self.alive = False
+
+    @property
+    def center_x(self):
+        return self.fleet.column_x(self.col)
+
+    @property
+    def center_y(self):
+        return self.fleet.row_y(self.row)
+
+    def shoot(self, projectiles):
+        """Alien shoots a bullet downward towards the player, into the aliens' `projectiles`; returns its slot."""
+        return projectiles.add(self.center_x, self.bottom, -self.fleet.config.alien_bullet_speed)
+
+
+class UFOBody(Body):
+    """UFO that occasionally flies across the top of the screen."""
+    __slots__ = ("speed", "direction")
+
+    def __init__(self, direction, speed):
+        super().__init__(SPRITE_SIZE, SPRITE_SIZE, 0, UFO_Y, hit_shape(UFO_TEXTURE))
+        self.speed = speed
+        self.reset(direction)
+
+    def reset(self, direction):
+        """Send a (pooled) UFO across the screen from one side."""
+        self.direction = direction  # 1 for right, -1 for left
+        self.alive = True
+
+        if direction == 1:
+            self.center_x = 0  # Start from left
+        else:
+            self.center_x = WINDOW_WIDTH  # Start from right
+
+    def update(self, delta_time: float = 1/60):
+        """Move the UFO across the screen."""
+        self.center_x += self.direction * self.speed * delta_time
+
+    @property
+    def off_screen(self):
+        if self.direction == 1:
+            return self.left > WINDOW_WIDTH
+        return self.right < 0
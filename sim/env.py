@@ -0,0 +1,275 @@
+"""Gymnasium-style environments over `sim.world.World` for training automated players.
+
+`SpaceInvadersEnv` is one game with `reset()`/`step(action)`; `VectorEnv`
+steps many games in lockstep, in this process or spread over worker
+processes that write straight into shared-memory buffers. Needs NumPy.
+"""
+import random
+import numpy as np
+from multiprocessing import Pipe, Process
+from multiprocessing.shared_memory import SharedMemory
+from enums.event_type import EventType
+from sim.config import GameConfig
+from sim.inputs import InputState
+from sim.world import World
+
+from settings import ENV_MAX_BULLETS, ENV_MAX_TICKS, TICK_RATE, UFO_POOL_SIZE
+
+# ------------ Actions ------------ #
+NOOP = 0
+LEFT = 1
+RIGHT = 2
+FIRE = 3
+ACTION_COUNT = 4
+
+
+class ObservationLayout:
+    """Where each part of the flat float32 observation vector lives.
+
+    - `fleet`: occupancy of every fleet slot, column by column (1 = alive)
+    - `fleet_offset`: x and y offset of the fleet from its starting formation
+    - `player`: x, lives left, 1 if the player can shoot
+    - `player_bullets` / `alien_bullets`: x, y of up to ENV_MAX_BULLETS bullets each, zero-padded
+    - `ufos`: x and direction of up to UFO_POOL_SIZE UFOs, zero-padded
+
+    One flat vector per game keeps a batch of observations in one array,
+    which is what shared memory and most training code want."""
+
+    def __init__(self, config: GameConfig):
+        if config.endless_mode:
+            raise ValueError("observations have a fixed size, so they cannot follow an endless mode fleet as it grows")
+        sizes = {
+            "fleet": config.alien_columns * config.alien_rows,
+            "fleet_offset": 2,
+            "player": 3,
+            "player_bullets": ENV_MAX_BULLETS * 2,
+            "alien_bullets": ENV_MAX_BULLETS * 2,
+            "ufos": UFO_POOL_SIZE * 2,
+        }
+        self.slices = {}
+        start = 0
+        for name, size in sizes.items():
+            self.slices[name] = slice(start, start + size)
+            start += size
+        self.size = start
+
+    def split(self, observation):
+        """Views of the named parts of one observation (or a batch of them)."""
+        return {name: observation[..., part] for name, part in self.slices.items()}
+
+
+class SpaceInvadersEnv:
+    """One headless game behind a `reset()`/`step(action)` interface.
+
+    Every step applies one of NOOP/LEFT/RIGHT/FIRE for `frame_skip` ticks.
+    The reward is the score gained, so it comes from `AlienType.score` and
+    the UFO bonus. An episode ends (`terminated`) when the game is over and
+    is cut off (`truncated`) after `max_ticks` ticks.
+
+    Observations are written into `observation` (a new array if None)
+    and that same array is returned every step, so copy it to keep it.
+    Each reset starts a new game with a seed drawn from `seed`."""
+
+    def __init__(self, seed=None, config: GameConfig | None = None, max_ticks=ENV_MAX_TICKS, frame_skip=1, observation=None):
+        self.config = config or GameConfig()
+        self.layout = ObservationLayout(self.config)
+        self.observation = observation if observation is not None else np.zeros(self.layout.size, np.float32)
+        self.parts = self.layout.split(self.observation)
+        self.max_ticks = max_ticks
+        self.frame_skip = frame_skip
+        self.dt = 1 / TICK_RATE
+        self.seeds = random.Random(seed)
+        self.world = World(0, self.config)
+        self.inputs = InputState()
+
+    def reset(self, seed=None):
+        """Start a new game and return `(observation, info)`."""
+        self.world.seed = seed if seed is not None else self.seeds.randrange(2**32)
+        self.world.setup()
+        self.parts["fleet"][:] = 1
+        self.observe()
+        return self.observation, {"seed": self.world.seed}
+
+    def step(self, action):
+        """Play one action and return `(observation, reward, terminated, truncated, info)`."""
+        world = self.world
+        inputs = self.inputs
+        inputs.left = action == LEFT
+        inputs.right = action == RIGHT
+        score = world.score
+        fleet = self.parts["fleet"]
+        rows = world.fleet.rows
+        for _ in range(self.frame_skip):
+            inputs.fire = action == FIRE
+            world.step(self.dt, inputs)
+            # Keep the occupancy grid up to date from the events instead of scanning the fleet
+            for event, entity in world.events:
+                if event == EventType.ALIEN_KILLED:
+                    fleet[entity.col * rows + entity.row] = 0
+                elif event == EventType.WAVE_CLEARED:
+                    fleet[:] = 1
+            if world.game_over:
+                break
+        self.observe()
+        return self.observation, world.score - score, world.game_over, world.tick >= self.max_ticks, {}
+
+    def observe(self):
+        """Write everything but the fleet grid into the observation."""
+        world = self.world
+        parts = self.parts
+        parts["fleet_offset"][:] = world.fleet.offset_x, world.fleet.offset_y
+        player = world.player
+        parts["player"][:] = player.center_x, player.lives, player.can_shoot
+        # One slice assignment per part: writing NumPy elements one at a time is slow
+        for name, bullets in (("player_bullets", world.player_bullets), ("alien_bullets", world.alien_bullets)):
+            slots = bullets.live()[:ENV_MAX_BULLETS]
+            out = parts[name]
+            out[0:len(slots) * 2:2] = bullets.x[slots]
+            out[1:len(slots) * 2:2] = bullets.y[slots]
+            out[len(slots) * 2:] = 0
+        fill(parts["ufos"], [value for ufo in world.ufos[:UFO_POOL_SIZE] for value in (ufo.center_x, ufo.direction)])
+
+
+def fill(out, values):
+    """Write `values` to the start of `out` and zero the rest."""
+    out[:len(values)] = values
+    out[len(values):] = 0
+
+
+class SharedBuffers:
+    """The arrays a vectorized environment exchanges with its workers.
+
+    With `shared=True` they live in shared memory, so workers write
+    observations and rewards in place and only tiny messages go through
+    pipes; otherwise they are ordinary arrays."""
+
+    FIELDS = (("observations", np.float32), ("rewards", np.float32), ("terminated", np.bool_), ("truncated", np.bool_), ("actions", np.int8))
+
+    def __init__(self, num_envs, observation_size, shared=False, names=None):
+        self.memory = []
+        for field, dtype in self.FIELDS:
+            shape = (num_envs, observation_size) if field == "observations" else (num_envs,)
+            if shared or names:
+                size = int(np.prod(shape)) * np.dtype(dtype).itemsize
+                memory = SharedMemory(name=names[field], track=False) if names else SharedMemory(create=True, size=size)
+                self.memory.append(memory)
+                array = np.ndarray(shape, dtype, buffer=memory.buf)
+            else:
+                array = np.zeros(shape, dtype)
+            setattr(self, field, array)
+
+    @property
+    def names(self):
+        return {field: memory.name for (field, _), memory in zip(self.FIELDS, self.memory)}
+
+    def close(self, unlink=False):
+        for field, _ in self.FIELDS:
+            setattr(self, field, None)
+        for memory in self.memory:
+            memory.close()
+            if unlink:
+                memory.unlink()
+        self.memory = []
+
+
+def step_envs(envs, buffers, start):
+    """Step a slice of environments with the actions in `buffers`, resetting finished ones."""
+    for i, env in enumerate(envs, start):
+        _, reward, terminated, truncated, _ = env.step(buffers.actions[i])
+        buffers.rewards[i] = reward
+        buffers.terminated[i] = terminated
+        buffers.truncated[i] = truncated
+        if terminated or truncated:
+            env.reset()
+
+
+def make_envs(buffers, start, stop, seed, config, max_ticks, frame_skip):
+    return [
+        SpaceInvadersEnv(
+            None if seed is None else seed + i, config, max_ticks, frame_skip, observation=buffers.observations[i]
+        )
+        for i in range(start, stop)
+    ]
+
+
+def run_worker(connection, names, num_envs, observation_size, start, stop, seed, config, max_ticks, frame_skip):
+    """Worker process: owns environments `start`..`stop` and steps them on request."""
+    buffers = SharedBuffers(num_envs, observation_size, names=names)
+    envs = make_envs(buffers, start, stop, seed, config, max_ticks, frame_skip)
+    try:
+        while True:
+            command = connection.recv()
+            if command == "step":
+                step_envs(envs, buffers, start)
+            elif command == "reset":
+                for env in envs:
+                    env.reset()
+            else:
+                break
+            connection.send(None)
+    finally:
+        buffers.close()
+
+
+class VectorEnv:
+    """`num_envs` games stepped in lockstep with one batch of actions.
+
+    With `workers=0` every game runs in this process; otherwise the games
+    are split evenly over that many worker processes, which write their
+    observations, rewards and done flags straight into shared memory.
+    `step()` returns `(observations, rewards, terminated, truncated, infos)`
+    like a Gymnasium vector env, and finished games are reset right away,
+    so their row already holds the first observation of the next game.
+    The returned arrays are overwritten by the next call."""
+
+    def __init__(self, num_envs, seed=None, config: GameConfig | None = None, workers=0, max_ticks=ENV_MAX_TICKS, frame_skip=1):
+        config = config or GameConfig()
+        self.num_envs = num_envs
+        self.layout = ObservationLayout(config)
+        self.buffers = SharedBuffers(num_envs, self.layout.size, shared=workers > 0)
+        self.envs = []
+        self.workers = []
+        if workers == 0:
+            self.envs = make_envs(self.buffers, 0, num_envs, seed, config, max_ticks, frame_skip)
+            return
+        bounds = [num_envs * w // workers for w in range(workers + 1)]
+        for start, stop in zip(bounds, bounds[1:]):
+            connection, child = Pipe()
+            process = Process(
+                target=run_worker,
+                args=(child, self.buffers.names, num_envs, self.layout.size, start, stop, seed, config, max_ticks, frame_skip),
+                daemon=True,
+            )
+            process.start()
+            self.workers.append((process, connection))
+
+    def broadcast(self, command):
+        for _, connection in self.workers:
+            connection.send(command)
+        for _, connection in self.workers:
+            connection.recv()
+
+    def reset(self):
+        """Start a new game in every environment and return `(observations, infos)`."""
+        if self.workers:
+            self.broadcast("reset")
+        else:
+            for env in self.envs:
+                env.reset()
+        return self.buffers.observations, {}
+
+    def step(self, actions):
+        buffers = self.buffers
+        buffers.actions[:] = actions
+        if self.workers:
+            self.broadcast("step")
+        else:
+            step_envs(self.envs, buffers, 0)
+        return buffers.observations, buffers.rewards, buffers.terminated, buffers.truncated, {}
+
+    def close(self):
+        for process, connection in self.workers:
+            connection.send("close")
+            process.join()
+        self.workers = []
+        self.buffers.close(unlink=True)
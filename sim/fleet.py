@@ -0,0 +1,191 @@
+from enums.alien_type import AlienType
+from sim.config import GameConfig
+from sim.entities import AlienBody
+from sim.spatial_hash import SpatialHash
+
+from settings import ALIEN_SCALING, SPRITE_SIZE, WINDOW_WIDTH
+
+
+def alien_type_for_row(row, config: GameConfig):
+    """Determine alien type based on row."""
+    if row < config.top_alien_rows:
+        return AlienType.TOP
+    elif row < config.top_alien_rows + config.mid_alien_rows:
+        return AlienType.MID
+    return AlienType.BOTTOM
+
+
+class Fleet:
+    """The alien formation as a columns x rows occupancy grid.
+
+    Every alien sits in a fixed grid slot and the whole fleet shares one
+    offset, so moving or dropping the fleet is a single addition no matter
+    how many aliens there are. The leftmost/rightmost live columns, the
+    lowest live alien of every column and the lowest live row are kept up
+    to date as aliens die, which keeps edge detection, shooter selection
+    and the invasion check independent of the fleet size."""
+
+    def __init__(self, rng, config: GameConfig, columns=None, rows=None):
+        self.rng = rng
+        self.config = config
+        self.columns = columns = columns or config.alien_columns
+        self.rows = rows = rows or config.alien_rows
+        self.capacity = columns * rows
+        # Shared offset from the starting formation
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        # slots[col][row] -> alien, alive or not
+        self.slots = [
+            [AlienBody(alien_type_for_row(row, config), self, col, row) for row in range(rows)]
+            for col in range(columns)
+        ]
+        self.row_half_height = [alien_type_for_row(row, config).scale * ALIEN_SCALING * SPRITE_SIZE / 2 for row in range(rows)]
+        self.count = 0
+        self.leftmost = 0
+        self.rightmost = -1
+        self.lowest_row = -1
+        self.bottom_rows = [-1] * columns       # Lowest live row of each column, -1 if empty
+        self.column_counts = [0] * columns
+        self.column_half_widths = [0.0] * columns
+        self.live_columns = []
+        # Broadphase in fleet-local coordinates, so it never needs updating when the fleet moves
+        self.grid = SpatialHash()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Iterate over the live aliens."""
+        for column in self.slots:
+            for alien in column:
+                if alien.alive:
+                    yield alien
+
+    def reset(self):
+        """Bring every alien back to its starting slot."""
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.grid.clear()
+        for column in self.slots:
+            for alien in column:
+                alien.alive = True
+                self.grid.insert(alien)
+        self.count = self.capacity
+        self.leftmost = 0
+        self.rightmost = self.columns - 1
+        self.lowest_row = self.rows - 1
+        self.live_columns = list(range(self.columns))
+        for col in range(self.columns):
+            self.column_counts[col] = self.rows
+            self.update_column(col)
+
+    def restore(self, alive, offset_x, offset_y):
+        """Bring back a saved fleet from the alive flag of every slot (column by column) and its offset."""
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.grid.clear()
+        self.count = 0
+        self.live_columns = []
+        for col, column in enumerate(self.slots):
+            count = 0
+            for alien in column:
+                alien.alive = bool(alive[col * self.rows + alien.row])
+                if alien.alive:
+                    # The grid is in fleet-local coordinates, so insert before applying the offset
+                    self.grid.insert(alien)
+                    count += 1
+            self.column_counts[col] = count
+            self.update_column(col)
+            if count:
+                self.live_columns.append(col)
+            self.count += count
+        self.offset_x = offset_x
+        self.offset_y = offset_y
+        self.leftmost = self.live_columns[0] if self.live_columns else 0
+        self.rightmost = self.live_columns[-1] if self.live_columns else -1
+        self.lowest_row = max(self.bottom_rows[c] for c in self.live_columns) if self.live_columns else -1
+
+    #------------------- Geometry -------------------#
+    def column_x(self, col):
+        return self.config.alien_start_x + col * self.config.alien_x_spacing + self.offset_x
+
+    def row_y(self, row):
+        return self.config.alien_start_y - row * self.config.alien_y_spacing + self.offset_y
+
+    @property
+    def left(self):
+        return self.column_x(self.leftmost) - self.column_half_widths[self.leftmost]
+
+    @property
+    def right(self):
+        return self.column_x(self.rightmost) + self.column_half_widths[self.rightmost]
+
+    @property
+    def bottom(self):
+        return self.row_y(self.lowest_row) - self.row_half_height[self.lowest_row]
+
+    def query(self, left, bottom, right, top):
+        """Live aliens that may overlap a box given in screen coordinates."""
+        return self.grid.query(
+            left - self.offset_x, bottom - self.offset_y, right - self.offset_x, top - self.offset_y
+        )
+
+    def query_body(self, body):
+        return self.query(body.left, body.bottom, body.right, body.top)
+
+    def move(self, dx):
+        """Shift the fleet horizontally.
+
+        Returns True when the outermost live column touches a screen edge."""
+        self.offset_x += dx
+        return self.count > 0 and (self.right >= WINDOW_WIDTH or self.left <= 0)
+
+    def drop(self, dy):
+        """Move the fleet down."""
+        self.offset_y -= dy
+
+    #------------------- Bookkeeping -------------------#
+    def kill(self, alien):
+        """Take an alien out of the grid and update the tracked extremes."""
+        if not alien.alive:
+            return
+        alien.alive = False
+        self.grid.remove(alien)
+        self.count -= 1
+        col = alien.col
+        self.column_counts[col] -= 1
+        self.update_column(col)
+
+        if self.column_counts[col] == 0:
+            self.live_columns.remove(col)
+            # Walk the outer bounds inwards past empty columns
+            while self.leftmost <= self.rightmost and self.column_counts[self.leftmost] == 0:
+                self.leftmost += 1
+            while self.rightmost >= self.leftmost and self.column_counts[self.rightmost] == 0:
+                self.rightmost -= 1
+
+        if alien.row == self.lowest_row:
+            self.lowest_row = max(self.bottom_rows[c] for c in self.live_columns) if self.live_columns else -1
+
+    def update_column(self, col):
+        """Recompute the lowest live alien and the widest live alien of a column."""
+        column = self.slots[col]
+        bottom_row = -1
+        half_width = 0.0
+        for alien in column:
+            if alien.alive:
+                bottom_row = alien.row
+                half_width = max(half_width, alien.width / 2)
+        self.bottom_rows[col] = bottom_row
+        self.column_half_widths[col] = half_width
+
+    def bottom_alien(self, col):
+        """The alien that can shoot from a column, or None if it is empty."""
+        row = self.bottom_rows[col]
+        return self.slots[col][row] if row >= 0 else None
+
+    def random_shooter(self):
+        """Pick a random alien from the bottom of any live column."""
+        if not self.live_columns:
+            return None
+        return self.bottom_alien(self.rng.choice(self.live_columns))
@@ -0,0 +1,130 @@
+from PIL import Image
+
+# (texture path, scale) -> HitShape
+SHAPES = {}
+# (width, height) -> HitShape of a plain box
+BOXES = {}
+# (shape, shape) -> separating axes to test once their bounding boxes overlap
+PAIR_AXES = {}
+
+
+class HitShape:
+    """Convex outline of something that can be hit, relative to its center.
+
+    Nothing in the game rotates, so the tight bounding box of the outline
+    and its extent along any axis never change; they are worked out once
+    per shape (and per pair of shapes) instead of on every test."""
+
+    def __init__(self, points):
+        self.points = points
+        xs = [x for x, _ in points]
+        ys = [y for _, y in points]
+        self.left, self.right = min(xs), max(xs)
+        self.bottom, self.top = min(ys), max(ys)
+        # Normals of the edges that are not horizontal or vertical; the bounding box covers those
+        normals = {}
+        for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]):
+            nx, ny = y1 - y0, x0 - x1
+            if nx and ny:
+                length = (nx * nx + ny * ny) ** 0.5
+                # Parallel edges share one axis
+                nx, ny = nx / length, ny / length
+                if nx < 0:
+                    nx, ny = -nx, -ny
+                normals[round(nx, 9), round(ny, 9)] = (nx, ny)
+        self.normals = list(normals.values())
+
+    def extent(self, nx, ny):
+        """(min, max) of the outline projected onto an axis."""
+        projections = [x * nx + y * ny for x, y in self.points]
+        return min(projections), max(projections)
+
+
+def convex_hull(points):
+    """Convex hull of 2D points, counter-clockwise, without collinear points (monotone chain)."""
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def half(ordered):
+        hull = []
+        for point in ordered:
+            while len(hull) >= 2 and (
+                (hull[-1][0] - hull[-2][0]) * (point[1] - hull[-2][1])
+                - (hull[-1][1] - hull[-2][1]) * (point[0] - hull[-2][0])
+            ) <= 0:
+                hull.pop()
+            hull.append(point)
+        return hull[:-1]
+
+    return half(points) + half(reversed(points))
+
+
+def hit_shape(texture_path, scale=1.0):
+    """Convex outline of the opaque pixels of a texture drawn at `scale`, computed once per pair."""
+    key = (texture_path, scale)
+    shape = SHAPES.get(key)
+    if shape is None:
+        alpha = Image.open(texture_path).convert("RGBA").getchannel("A")
+        width, height = alpha.size
+        pixels = alpha.load()
+        # Outer corners of the leftmost and rightmost opaque pixel of every row are all the hull needs
+        corners = []
+        for row in range(height):
+            opaque = [column for column in range(width) if pixels[column, row]]
+            if opaque:
+                for x in (opaque[0], opaque[-1] + 1):
+                    corners.append((x, row))
+                    corners.append((x, row + 1))
+        if not corners:
+            corners = [(0, 0), (width, 0), (width, height), (0, height)]
+        # Image rows go down; make the points y-up around the center, like sprite positions
+        shape = SHAPES[key] = HitShape([
+            ((x - width / 2) * scale, (height / 2 - y) * scale) for x, y in convex_hull(corners)
+        ])
+    return shape
+
+
+def box_shape(width, height):
+    """Shape of a plain axis-aligned box."""
+    key = (width, height)
+    shape = BOXES.get(key)
+    if shape is None:
+        half_width, half_height = width / 2, height / 2
+        shape = BOXES[key] = HitShape([
+            (-half_width, -half_height), (half_width, -half_height), (half_width, half_height), (-half_width, half_height),
+        ])
+    return shape
+
+
+def pair_axes(a, b):
+    """The sloped axes that can separate two shapes, with both extents along each."""
+    axes = PAIR_AXES.get((a, b))
+    if axes is None:
+        normals = {(round(nx, 9), round(ny, 9)): (nx, ny) for nx, ny in a.normals + b.normals}
+        axes = PAIR_AXES[a, b] = tuple(
+            (nx, ny, *a.extent(nx, ny), *b.extent(nx, ny)) for nx, ny in normals.values()
+        )
+    return axes
+
+
+def overlaps(a, ax, ay, b, bx, by):
+    """Whether shape `a` centered at (ax, ay) overlaps shape `b` centered at (bx, by).
+
+    The tight bounding boxes are compared first, which rejects almost every
+    pair; only boxes that overlap go on to the separating axis test along
+    the sloped edges. Touching edges do not count as overlapping."""
+    dx = bx - ax
+    dy = by - ay
+    if not (
+        a.left < dx + b.right
+        and dx + b.left < a.right
+        and a.bottom < dy + b.top
+        and dy + b.bottom < a.top
+    ):
+        return False
+    for nx, ny, a_min, a_max, b_min, b_max in pair_axes(a, b):
+        offset = dx * nx + dy * ny
+        if b_min + offset >= a_max or a_min >= b_max + offset:
+            return False
+    return True
@@ -0,0 +1,50 @@
+class InputState:
+    """Player input for one simulation step.
+
+    `left`/`right` are held keys, `fire` is a one-shot request that the
+    owner clears after the step that consumed it.
+
+    Key handlers that run between ticks should use `press()`/`release()`
+    and call `sampled()` once a tick has read the state: a key pressed and
+    released before the next tick then still reaches that tick, so a tap
+    shorter than a tick is never lost."""
+    def __init__(self, left=False, right=False, fire=False):
+        self.left = left
+        self.right = right
+        self.fire = fire
+        # Keys pressed since the last tick read the state, and which of those were released again
+        self.unsampled = set()
+        self.released = set()
+
+    @property
+    def direction(self):
+        """Horizontal direction from the keys held.
+        - `-1` = left
+        - `1` = right
+        - `0` = no movement"""
+        if self.left and not self.right:
+            return -1
+        elif self.right and not self.left:
+            return 1
+        return 0
+
+    def press(self, key):
+        """`key` ("left", "right" or "fire") went down; a release earlier in the same tick no longer counts."""
+        setattr(self, key, True)
+        self.unsampled.add(key)
+        self.released.discard(key)
+
+    def release(self, key):
+        """`key` went up; if no tick has seen it down yet, the next one still does."""
+        if key in self.unsampled:
+            self.released.add(key)
+        else:
+            setattr(self, key, False)
+
+    def sampled(self):
+        """A tick has read this state: the shot is spent and taps end."""
+        self.fire = False
+        for key in self.released:
+            setattr(self, key, False)
+        self.unsampled.clear()
+        self.released.clear()
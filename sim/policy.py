@@ -0,0 +1,62 @@
+import numpy as np
+from sim.inputs import InputState
+from sim.projectiles import HALF_HEIGHT
+from settings import WINDOW_WIDTH
+
+# How close (pixels above the ship) an alien bullet has to be before the bot dodges it
+DODGE_DISTANCE = 120
+
+
+class ScriptedPlayer:
+    """Simple deterministic bot used for headless runs.
+
+    It dodges alien bullets that are about to land on the ship, otherwise
+    lines up under the nearest of the lowest columns of the fleet, and fires
+    whenever the cooldown allows."""
+
+    def __init__(self):
+        self.inputs = InputState()
+
+    def act(self, world):
+        """Input state for the next tick of `world`."""
+        player = world.player
+        fleet = world.fleet
+        direction = 0
+
+        # ------------ Dodge incoming bullets ------------ #
+        bullets = world.alien_bullets
+        if len(bullets):
+            slots = bullets.live()
+            x = bullets.x[slots]
+            height = bullets.y[slots] - HALF_HEIGHT - player.top
+            incoming = np.flatnonzero((np.abs(x - player.center_x) < player.width) & (height >= 0) & (height < DODGE_DISTANCE))
+            if len(incoming):
+                # The first one fired
+                direction = 1 if player.center_x >= x[incoming[0]] else -1
+                # Pinned against a wall: run the other way
+                if (direction == 1 and player.right >= WINDOW_WIDTH) or (direction == -1 and player.left <= 0):
+                    direction = -direction
+
+        # ------------ Line up under where the nearest column will be ------------ #
+        if direction == 0 and fleet.live_columns:
+            # Lead the target by how far the fleet moves while a bullet flies up to it
+            flight_time = max(fleet.bottom - player.top, 0) / world.config.bullet_speed
+            lead = world.fleet_direction * world.current_fleet_speed * flight_time
+            # Columns reaching lowest are the invasion threat, so clear those first
+            columns = [col for col in fleet.live_columns if fleet.bottom_rows[col] == fleet.lowest_row]
+            target_x = min((fleet.column_x(col) + lead for col in columns), key=lambda x: abs(x - player.center_x))
+            if abs(target_x - player.center_x) > 4:
+                direction = 1 if target_x > player.center_x else -1
+
+        self.inputs.left = direction == -1
+        self.inputs.right = direction == 1
+        self.inputs.fire = player.can_shoot
+        return self.inputs
+
+
+
+def play(world, player, dt, max_ticks):
+    """Let a bot play `world` until the game is over or `max_ticks` ran out."""
+    while not world.game_over and world.tick < max_ticks:
+        world.step(dt, player.act(world))
+    return world
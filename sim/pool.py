@@ -0,0 +1,43 @@
+from collections import deque
+
+
+class Pool:
+    """Preallocated objects handed out with `acquire()` and given back with `release()`.
+
+    The pool grows when it runs dry, and `high_water` remembers the most
+    objects that were ever in use at once, which is what the initial size
+    should be tuned to.
+
+    Free objects are handed out oldest released first, so an object given
+    back during a tick is not reused in that same tick while others are
+    free, and whoever reads its events still sees where it died."""
+
+    def __init__(self, factory, size=0):
+        self.factory = factory
+        self.size = 0
+        self.active = 0
+        self.high_water = 0
+        self.free = deque()
+        for _ in range(size):
+            self.free.append(self.create())
+
+    def create(self):
+        """Build a new object for the pool."""
+        self.size += 1
+        return self.factory()
+
+    def acquire(self):
+        """Take an object out of the pool, creating one if none is free."""
+        obj = self.free.popleft() if self.free else self.create()
+        self.active += 1
+        if self.active > self.high_water:
+            self.high_water = self.active
+        return obj
+
+    def release(self, obj):
+        """Give an object back to the pool."""
+        self.active -= 1
+        self.free.append(obj)
+
+    def stats(self):
+        return {"size": self.size, "active": self.active, "high_water": self.high_water}
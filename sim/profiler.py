@@ -0,0 +1,114 @@
+import csv
+import json
+import time
+from collections import deque
+from settings import PROFILER_WINDOW
+
+
+class Profiler:
+    """Times the phases of every tick and frame and keeps rolling percentiles.
+
+    Code being profiled calls `start()` at the top of a tick or frame and
+    `lap(name)` after each phase, which records the time since the previous
+    call. Owners only hand a profiler out while profiling, so when it is off
+    the instrumented code pays for nothing more than an `if profiler:` check.
+
+    With a `stream_path`, phase times (microseconds) and counts are written
+    as JSON lines, or as `record,number,name,value` CSV rows if the path
+    ends in `.csv`. Laps and counts between `start_tick()` and
+    `end_tick(tick)` make one record per simulation tick; everything else,
+    the view's work, goes into one record per frame, written by
+    `end_frame()` after drawing, with the laps of a phase run several times
+    in the frame added up. So a frame that runs no tick still has its own
+    record and one that runs several does not spill into them."""
+
+    def __init__(self, window=PROFILER_WINDOW, stream_path=None):
+        self.window = window
+        self.samples = {}       # phase -> recent durations (ns)
+        self.counts = {}        # counter -> latest value
+        self.record = {}        # what happened in the tick being run
+        self.frame_record = {}  # what happened outside ticks since the last end_frame()
+        self.in_tick = False
+        self.frames = 0
+        self.last = time.perf_counter_ns()
+        self.stream = None
+        self.writer = None
+        if stream_path:
+            self.stream = open(stream_path, "w", newline="")
+            self.csv = stream_path.endswith(".csv")
+
+    def start(self):
+        """Mark the beginning of a tick or frame."""
+        self.last = time.perf_counter_ns()
+
+    def start_tick(self):
+        """Mark the beginning of a simulation tick; what is recorded until `end_tick()` belongs to it."""
+        self.in_tick = True
+        self.start()
+
+    def lap(self, name):
+        """Record the time since the last `start()`/`lap()` under `name`."""
+        now = time.perf_counter_ns()
+        self.add(name, now - self.last)
+        self.last = now
+
+    def add(self, name, duration_ns):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+        samples.append(duration_ns)
+        if self.in_tick:
+            self.record[name] = duration_ns / 1000
+        else:
+            self.frame_record[name] = round(self.frame_record.get(name, 0) + duration_ns / 1000, 3)
+
+    def count(self, name, value):
+        """Set a counter of the current tick or frame, such as live entities or removals."""
+        self.counts[name] = value
+        if self.in_tick:
+            self.record[name] = value
+        else:
+            self.frame_record[name] = value
+
+    def end_tick(self, tick):
+        """Write the record of this tick to the stream and start a new one."""
+        self.write("tick", tick, self.record)
+        self.record = {}
+        self.in_tick = False
+
+    def end_frame(self):
+        """Write what the frame did outside its ticks to the stream and start a new record."""
+        self.frames += 1
+        self.write("frame", self.frames, self.frame_record)
+        self.frame_record = {}
+
+    def write(self, kind, number, record):
+        if self.stream is None:
+            return
+        if not self.csv:
+            self.stream.write(json.dumps({kind: number, **record}) + "\n")
+        else:
+            if self.writer is None:
+                self.writer = csv.writer(self.stream)
+                self.writer.writerow(["record", "number", "name", "value"])
+            self.writer.writerows((kind, number, name, value) for name, value in record.items())
+
+    def percentiles(self, name):
+        """Rolling (p50, p95, p99) of a phase, in milliseconds."""
+        ordered = sorted(self.samples[name])
+        last = len(ordered) - 1
+        return tuple(ordered[min(int(fraction * len(ordered)), last)] / 1e6 for fraction in (0.5, 0.95, 0.99))
+
+    def summary_lines(self):
+        """One line per phase and one for the counters, for the overlay."""
+        lines = [f"{'phase':<16}{'p50':>8}{'p95':>8}{'p99':>8} ms"]
+        for name in self.samples:
+            p50, p95, p99 = self.percentiles(name)
+            lines.append(f"{name:<16}{p50:8.3f}{p95:8.3f}{p99:8.3f}")
+        lines.append("  ".join(f"{name}: {value}" for name, value in self.counts.items()))
+        return lines
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
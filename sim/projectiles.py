@@ -0,0 +1,215 @@
+import numpy as np
+from sim.hit_shapes import hit_shape, overlaps
+from settings import BULLET_BROADPHASE_MIN, BULLET_CAPACITY, BULLET_HEIGHT, BULLET_TEXTURE, BULLET_WIDTH, WINDOW_HEIGHT
+
+# Who fired the bullets in a set of projectile arrays
+PLAYER = 0
+ALIEN = 1
+
+HALF_WIDTH = BULLET_WIDTH / 2
+HALF_HEIGHT = BULLET_HEIGHT / 2
+# Column name -> dtype
+FIELDS = {
+    "x": np.float64,
+    "y": np.float64,
+    "vy": np.float64,       # pixels per second, up for the player's bullets and down for the aliens'
+    "alive": np.bool_,
+    "serial": np.int64,     # names a bullet across ticks, whatever slot it is packed into
+}
+
+
+class Projectiles:
+    """The bullets in flight of one side, one NumPy array per field (structure of arrays).
+
+    A bullet is a slot in the arrays rather than an object: its center, its
+    vertical speed, whether it is still alive and a serial number. Slots in
+    use are packed at the front in the order the bullets were fired.
+    `advance()` moves every bullet and flags the ones that flew off the
+    screen with a few array operations, however many there are; bullets
+    that die are only flagged, and `compact()` packs the survivors once per
+    tick, so between two world steps every slot in use is alive. The arrays
+    start at `capacity` slots and double when full.
+
+    The player's bullets and the aliens' are kept apart (`owner` is PLAYER
+    or ALIEN) because they move at different points of a tick, and a side
+    is moved or searched without masking out the other."""
+
+    def __init__(self, owner, capacity=BULLET_CAPACITY):
+        self.owner = owner
+        self.shape = hit_shape(BULLET_TEXTURE)
+        self.count = 0          # Slots in use, alive or flagged dead
+        self.dead = 0           # Slots flagged dead since the last compact()
+        self.dropped = 0        # Slots the last compact() freed
+        self.high_water = 0
+        self.next_serial = 0
+        self.capacity = 0
+        self.arrays = ()
+        self.grow(capacity)
+
+    def __len__(self):
+        return self.count - self.dead
+
+    def grow(self, capacity):
+        """Move the bullets into arrays of `capacity` slots."""
+        count = self.count
+        arrays = []
+        for name, dtype in FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if self.arrays:
+                array[:count] = getattr(self, name)[:count]
+            setattr(self, name, array)
+            arrays.append(array)
+        self.arrays = tuple(arrays)
+        self.capacity = capacity
+
+    def add(self, x, y, vy):
+        """Fire a bullet from (x, y) and return its slot."""
+        slot = self.count
+        if slot == self.capacity:
+            self.grow(self.capacity * 2)
+        self.x[slot] = x
+        self.y[slot] = y
+        self.vy[slot] = vy
+        self.alive[slot] = True
+        self.serial[slot] = self.next_serial
+        self.next_serial += 1
+        self.count = slot + 1
+        if self.count > self.high_water:
+            self.high_water = self.count
+        return slot
+
+    def kill(self, slot):
+        """Flag a bullet dead; its slot is freed by the next `compact()`."""
+        if self.alive[slot]:
+            self.alive[slot] = False
+            self.dead += 1
+
+    def clear(self):
+        self.count = 0
+        self.dead = 0
+
+    def advance(self, delta_time):
+        """Move every bullet and flag the ones that flew off the edge they were heading for.
+
+        The edge is only compared bullet by bullet once the furthest one is past it."""
+        count = self.count
+        if not count:
+            return
+        y = self.y[:count]
+        y += self.vy[:count] * delta_time
+        if self.owner == PLAYER:
+            if y.max() - HALF_HEIGHT <= WINDOW_HEIGHT:
+                return
+            gone = y - HALF_HEIGHT > WINDOW_HEIGHT
+        else:
+            if y.min() + HALF_HEIGHT >= 0:
+                return
+            gone = y + HALF_HEIGHT < 0
+        alive = self.alive[:count]
+        gone &= alive
+        dead = int(np.count_nonzero(gone))
+        if dead:
+            alive[gone] = False
+            self.dead += dead
+
+    def compact(self):
+        """Pack the live bullets at the front, keeping their order."""
+        self.dropped = self.dead
+        if not self.dead:
+            return
+        keep = np.flatnonzero(self.alive[:self.count])
+        kept = len(keep)
+        for array in self.arrays:
+            array[:kept] = array[keep]
+        self.count = kept
+        self.dead = 0
+
+    def live(self):
+        """Slots of the live bullets, in the order they were fired."""
+        if not self.dead:
+            return np.arange(self.count)
+        return np.flatnonzero(self.alive[:self.count])
+
+    def in_box(self, left, bottom, right, top):
+        """Slots of the live bullets that may overlap a box, in the order they were fired.
+
+        This is only a broadphase, like a grid query: callers still test the
+        hit shapes with `hits()`. Boxes are compared for all bullets at once;
+        with fewer than BULLET_BROADPHASE_MIN bullets, testing each one is
+        cheaper than that, so they are all returned."""
+        count = self.count
+        if count < BULLET_BROADPHASE_MIN:
+            return self.live()
+        x = self.x[:count]
+        y = self.y[:count]
+        near = x + HALF_WIDTH > left
+        near &= x - HALF_WIDTH < right
+        near &= y + HALF_HEIGHT > bottom
+        near &= y - HALF_HEIGHT < top
+        if self.dead:
+            near &= self.alive[:count]
+        return np.flatnonzero(near)
+
+    def overlapping(self, other):
+        """Live bullets here whose boxes overlap each live bullet of `other`, as {other's slot: slots here}.
+
+        Slots are listed in the order the bullets were fired. The bullets
+        here are sorted once by a key of their row in a coarse grid of
+        horizontal bands and then x, and every bullet of `other` finds the
+        ones within reach in the two bands it touches with a binary search,
+        so the cost grows with the number of bullets and of pairs found
+        rather than with their product. Like `in_box()`, with fewer than
+        BULLET_BROADPHASE_MIN bullets here every live one is listed for
+        every bullet of `other`."""
+        if not self.count or not other.count:
+            return {}
+        if self.count < BULLET_BROADPHASE_MIN:
+            candidates = self.live().tolist()
+            return dict.fromkeys(other.live().tolist(), candidates)
+        mine = self.live()
+        theirs = other.live()
+        # A pixel further than two boxes reach; the exact box test follows
+        reach_x = HALF_WIDTH * 2 + 1
+        reach_y = HALF_HEIGHT * 2 + 1
+        band = 2 * reach_y
+        my_x = self.x[mine]
+        their_x = other.x[theirs]
+        their_y = other.y[theirs]
+        low = min(my_x.min(), their_x.min()) - reach_x
+        # Keys of one band all sort below the next band's, however far apart the bullets are
+        stride = max(my_x.max(), their_x.max()) + reach_x - low + 1
+        keys = np.floor(self.y[mine] / band) * stride + (my_x - low)
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        first_band = np.floor((their_y - reach_y) / band)
+        # Every bullet of `other` searches the band its reach starts in and the one above
+        bands = np.concatenate((first_band, first_band + 1)) * stride
+        offsets = np.tile(their_x - low, 2)
+        starts = np.searchsorted(sorted_keys, bands + (offsets - reach_x))
+        lengths = np.searchsorted(sorted_keys, bands + (offsets + reach_x)) - starts
+        total = int(lengths.sum())
+        if not total:
+            return {}
+        query = np.repeat(np.tile(theirs, 2), lengths)
+        position = np.arange(total) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        slot = mine[order[position]]
+        x = other.x[query]
+        y = other.y[query]
+        # The same comparisons as in_box() with the other bullet's box
+        near = self.x[slot] + HALF_WIDTH > x - HALF_WIDTH
+        near &= self.x[slot] - HALF_WIDTH < x + HALF_WIDTH
+        near &= self.y[slot] + HALF_HEIGHT > y - HALF_HEIGHT
+        near &= self.y[slot] - HALF_HEIGHT < y + HALF_HEIGHT
+        grouped = np.lexsort((slot[near], query[near]))
+        query = query[near][grouped]
+        slot = slot[near][grouped].tolist()
+        starts = np.flatnonzero(np.diff(query, prepend=-1)).tolist()
+        ends = starts[1:] + [len(slot)]
+        return {their: slot[start:end] for their, start, end in zip(query[starts].tolist(), starts, ends)}
+
+    def hits(self, slot, shape, x, y):
+        """Whether the bullet in `slot` overlaps `shape` centered at (x, y)."""
+        return self.alive[slot] and overlaps(self.shape, self.x.item(slot), self.y.item(slot), shape, x, y)
+
+    def stats(self):
+        return {"size": self.capacity, "active": self.count, "high_water": self.high_water}
@@ -0,0 +1,97 @@
+import json
+from sim import snapshot
+from sim.config import GameConfig
+from sim.inputs import InputState
+from sim.world import World
+
+# Bits of the per-tick input byte
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+
+
+def encode(inputs: InputState):
+    return (LEFT if inputs.left else 0) | (RIGHT if inputs.right else 0) | (FIRE if inputs.fire else 0)
+
+
+def decode(bits, inputs: InputState):
+    inputs.left = bool(bits & LEFT)
+    inputs.right = bool(bits & RIGHT)
+    inputs.fire = bool(bits & FIRE)
+    return inputs
+
+
+class InputRecorder:
+    """Captures the input state of every tick along with the seed, tick rate and game mode.
+
+    That is everything needed to replay a game bit-exactly, since the world
+    has no other source of randomness or timing. When the game jumps to a
+    snapshot (rewind, quick-load), the recording starts over from that
+    snapshot instead of from a new game."""
+
+    def __init__(self, seed, tick_rate, endless=False):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.endless = endless
+        self.ticks = bytearray()
+        self.snapshot = None
+
+    def record(self, inputs: InputState):
+        self.ticks.append(encode(inputs))
+
+    def restart(self, blob):
+        """Record from the state in a snapshot blob from now on."""
+        self.snapshot = blob
+        self.ticks.clear()
+
+    def save(self, path):
+        data = {"seed": self.seed, "tick_rate": self.tick_rate, "inputs": self.ticks.hex()}
+        if self.endless:
+            data["endless"] = True
+        if self.snapshot is not None:
+            data["snapshot"] = self.snapshot.hex()
+        with open(path, "w") as file:
+            json.dump(data, file)
+
+
+class InputReplay:
+    """Plays back a recording made by `InputRecorder`, one tick at a time."""
+
+    def __init__(self, seed, tick_rate, ticks, snapshot=None, endless=False):
+        self.seed = seed
+        self.tick_rate = tick_rate
+        self.ticks = ticks
+        self.endless = endless
+        # State the recording starts from, None for a new game
+        self.snapshot = snapshot
+        self.position = 0
+        self.inputs = InputState()
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as file:
+            data = json.load(file)
+        blob = bytes.fromhex(data["snapshot"]) if "snapshot" in data else None
+        return cls(data["seed"], data["tick_rate"], bytes.fromhex(data["inputs"]), blob, data.get("endless", False))
+
+    @property
+    def finished(self):
+        return self.position >= len(self.ticks)
+
+    def next(self):
+        """Input state of the next tick; no keys held once the recording ran out."""
+        bits = self.ticks[self.position] if not self.finished else 0
+        self.position += 1
+        return decode(bits, self.inputs)
+
+
+def replay(recording: InputReplay):
+    """Run a whole recording headless and return the final world."""
+    world = World(seed=recording.seed, config=GameConfig(endless_mode=recording.endless))
+    world.setup()
+    if recording.snapshot is not None:
+        snapshot.restore(world, recording.snapshot)
+    dt = 1 / recording.tick_rate
+    while not recording.finished and not world.game_over:
+        world.step(dt, recording.next())
+    return world
@@ -0,0 +1,208 @@
+import math
+import struct
+import sys
+from array import array
+from collections import deque
+import numpy as np
+from enums.event_type import EventType
+
+from settings import SNAPSHOT_HISTORY
+
+MAGIC = b"SINV"
+VERSION = 1
+# magic, version, seed, tick, score, wave, initial alien count, fleet columns, fleet rows,
+# fleet direction, game over, player lives, player can shoot, player cooldown, player x,
+# fleet offset x, fleet offset y, fleet speed, alien shoot timer, gauss_next (NaN for None),
+# player bullets, alien bullets, UFOs
+HEADER = struct.Struct("<4sHqqqqqHHb?q?dddddddHHH")
+RNG_WORDS = 625
+BULLET_FIELDS = 3   # x, y, speed
+UFO_FIELDS = 3      # x, direction, speed
+
+
+def to_little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+
+def capture(world):
+    """Encode the full state of a world into a compact binary blob.
+
+    Everything a later `step()` depends on is stored: the random number
+    generator, the player, which fleet slots are alive and where the fleet
+    is, every bullet and UFO, and the score. A full wave takes under 3 KiB,
+    most of it the generator state. Sizes come from `world.config`, so the
+    blob can only be restored into a world with the same fleet dimensions
+    (in endless mode, one whose fleet grows the same way)."""
+    player = world.player
+    fleet = world.fleet
+    rng_version, rng_words, gauss_next = world.rng.getstate()
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        world.seed, world.tick, world.score, world.wave, world.initial_alien_count,
+        fleet.columns, fleet.rows, world.fleet_direction, world.game_over,
+        player.lives, player.can_shoot, player.shoot_cooldown, player.center_x,
+        fleet.offset_x, fleet.offset_y, world.current_fleet_speed, world.alien_shoot_timer,
+        math.nan if gauss_next is None else gauss_next,
+        len(world.player_bullets), len(world.alien_bullets), len(world.ufos),
+    )
+
+    alive = bytearray(fleet.capacity)
+    for column in fleet.slots:
+        for alien in column:
+            if alien.alive:
+                alive[alien.col * fleet.rows + alien.row] = 1
+
+    # Player bullets first, one x, y, speed row per bullet
+    bullets = np.concatenate([
+        np.column_stack((side.x[slots], side.y[slots], side.vy[slots]))
+        for side in (world.player_bullets, world.alien_bullets)
+        for slots in (side.live(),)
+    ]).astype("<f8")
+    ufos = array("d")
+    for ufo in world.ufos:
+        ufos.extend((ufo.center_x, ufo.direction, ufo.speed))
+
+    return b"".join((
+        header,
+        to_little_endian(array("I", rng_words)).tobytes(),
+        pack_bits(alive),
+        bullets.tobytes(),
+        to_little_endian(ufos).tobytes(),
+    ))
+
+
+def restore(world, blob):
+    """Put a world back into the state captured in `blob`.
+
+    Entities that are there now are despawned and the captured ones are
+    spawned through `world.events`, like `World.setup()` does, so a view
+    hands its sprites back to their pools and takes them out again instead
+    of building new ones. UFOs come from the world's pool; bullets are
+    written straight back into its projectile arrays.
+
+    Raises ValueError, leaving the world as it was, if the blob is not a
+    snapshot this world can take."""
+    if len(blob) < HEADER.size:
+        raise ValueError("not a game snapshot, or one from another version")
+    (
+        magic, version,
+        seed, tick, score, wave, initial_alien_count,
+        columns, rows, fleet_direction, game_over,
+        lives, can_shoot, shoot_cooldown, player_x,
+        offset_x, offset_y, fleet_speed, alien_shoot_timer, gauss_next,
+        player_bullet_count, alien_bullet_count, ufo_count,
+    ) = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a game snapshot, or one from another version")
+    # In endless mode the fleet grows with the waves, so compare with the one the snapshot's wave has
+    expected = world.wave_size(wave) if world.config.endless_mode else (world.fleet.columns, world.fleet.rows)
+    if (columns, rows) != expected:
+        raise ValueError(f"snapshot has a {columns}x{rows} fleet, this world has {expected[0]}x{expected[1]}")
+    capacity = columns * rows
+    size = (
+        HEADER.size + RNG_WORDS * 4 + (capacity + 7) // 8
+        + (player_bullet_count + alien_bullet_count) * BULLET_FIELDS * 8 + ufo_count * UFO_FIELDS * 8
+    )
+    if len(blob) != size:
+        raise ValueError(f"snapshot is {len(blob)} bytes, its header describes {size}")
+
+    previous_fleet = world.fleet
+    if world.config.endless_mode:
+        # Build the fleet the snapshot's wave has
+        world.wave = wave
+        world.configure_wave()
+    fleet = world.fleet
+
+    offset = HEADER.size
+    rng_words = to_little_endian(array("I", blob[offset:offset + RNG_WORDS * 4]))
+    offset += RNG_WORDS * 4
+    alive = unpack_bits(blob[offset:offset + (fleet.capacity + 7) // 8], fleet.capacity)
+    offset += (fleet.capacity + 7) // 8
+    bullet_count = player_bullet_count + alien_bullet_count
+    bullets = np.frombuffer(blob, dtype="<f8", count=bullet_count * BULLET_FIELDS, offset=offset).reshape(bullet_count, BULLET_FIELDS)
+    offset += bullets.nbytes
+    ufos = to_little_endian(array("d", blob[offset:offset + ufo_count * UFO_FIELDS * 8]))
+
+    # ------------ Despawn what is there now ------------ #
+    for alien in previous_fleet:
+        world.events.append((EventType.DESPAWNED, alien))
+    world.clear_bullets()
+    world.clear_ufos()
+
+    # ------------ World and player ------------ #
+    world.seed = seed
+    world.rng.setstate((3, tuple(rng_words), None if math.isnan(gauss_next) else gauss_next))
+    world.tick = tick
+    world.score = score
+    world.wave = wave
+    world.game_over = game_over
+    world.initial_alien_count = initial_alien_count
+    world.fleet_direction = fleet_direction
+    world.current_fleet_speed = fleet_speed
+    world.alien_shoot_timer = alien_shoot_timer
+    player = world.player
+    player.lives = lives
+    player.can_shoot = can_shoot
+    player.shoot_cooldown = shoot_cooldown
+    player.center_x = player_x
+
+    # ------------ Spawn the captured entities ------------ #
+    fleet.restore(alive, offset_x, offset_y)
+    for alien in fleet:
+        world.events.append((EventType.SPAWNED, alien))
+    for i, (x, y, speed) in enumerate(bullets.tolist()):
+        (world.player_bullets if i < player_bullet_count else world.alien_bullets).add(x, y, speed)
+    for i in range(ufo_count):
+        x, direction, speed = ufos[i * UFO_FIELDS:(i + 1) * UFO_FIELDS]
+        ufo = world.ufo_pool.acquire()
+        ufo.reset(int(direction))
+        ufo.speed = speed
+        ufo.center_x = x
+        world.spawn(world.ufos, ufo)
+
+
+def pack_bits(flags):
+    packed = bytearray((len(flags) + 7) // 8)
+    for i, flag in enumerate(flags):
+        if flag:
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def unpack_bits(packed, count):
+    return [(packed[i >> 3] >> (i & 7)) & 1 for i in range(count)]
+
+
+def save(path, blob):
+    with open(path, "wb") as file:
+        file.write(blob)
+
+
+def load(path):
+    with open(path, "rb") as file:
+        return file.read()
+
+
+class SnapshotRing:
+    """The most recent snapshots, oldest dropped first, for rewinding.
+
+    Snapshots are immutable bytes, so keeping one costs only its few
+    kilobytes and taking one never copies the ones already kept."""
+
+    def __init__(self, capacity=SNAPSHOT_HISTORY):
+        self.snapshots = deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def push(self, blob):
+        self.snapshots.append(blob)
+
+    def pop(self):
+        """The most recent snapshot, taken out of the ring, or None if it is empty."""
+        return self.snapshots.pop() if self.snapshots else None
+
+    def clear(self):
+        self.snapshots.clear()
@@ -0,0 +1,90 @@
+from settings import COLLISION_CELL_SIZE
+
+
+class SpatialHash:
+    """Uniform grid broadphase.
+
+    Bodies are bucketed by the grid cells their box covers, so finding what
+    overlaps a box only looks at the handful of cells under it instead of
+    at every body. Keep the cell size at least as big as the largest body
+    so that each body lands in at most four cells.
+
+    Grids that are rebuilt every tick keep their cell lists and their query
+    result list, so a steady-state tick allocates nothing that outlives it."""
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}     # (cell x, cell y) -> bodies in that cell
+        self.keys = {}      # body -> cells it was inserted into
+        self.found = []     # Result of the last query, reused
+        self.seen = set()   # Bodies already in `found`, reused
+
+    def __len__(self):
+        return len(self.keys)
+
+    def clear(self):
+        self.cells.clear()
+        self.keys.clear()
+
+    def cell_range(self, left, bottom, right, top):
+        """All cell keys covered by a box."""
+        size = self.cell_size
+        x0, x1 = int(left // size), int(right // size)
+        y0, y1 = int(bottom // size), int(top // size)
+        return [(x, y) for x in range(x0, x1 + 1) for y in range(y0, y1 + 1)]
+
+    def insert(self, body):
+        """Register a body at its current position."""
+        keys = self.cell_range(body.left, body.bottom, body.right, body.top)
+        for key in keys:
+            bucket = self.cells.get(key)
+            if bucket is None:
+                self.cells[key] = [body]
+            else:
+                bucket.append(body)
+        self.keys[body] = keys
+
+    def remove(self, body):
+        """Unregister a body from the cells it was inserted into."""
+        for key in self.keys.pop(body, ()):
+            bucket = self.cells[key]
+            bucket.remove(body)
+            if not bucket:
+                del self.cells[key]
+
+    def rebuild(self, bodies):
+        """Empty the grid and insert all bodies at their current position.
+
+        The cell lists are emptied rather than thrown away, so they are
+        reused by the next rebuild."""
+        for bucket in self.cells.values():
+            bucket.clear()
+        self.keys.clear()
+        for body in bodies:
+            self.insert(body)
+
+    def query(self, left, bottom, right, top):
+        """Bodies whose cells overlap a box.
+
+        This is only a broadphase: callers still have to test the returned
+        bodies for an actual overlap. The returned list is reused by the
+        next query on this grid, so use it before querying again."""
+        found = self.found
+        found.clear()
+        seen = self.seen
+        seen.clear()
+        cells = self.cells
+        size = self.cell_size
+        for x in range(int(left // size), int(right // size) + 1):
+            for y in range(int(bottom // size), int(top // size) + 1):
+                bucket = cells.get((x, y))
+                if bucket:
+                    for body in bucket:
+                        if body not in seen:
+                            seen.add(body)
+                            found.append(body)
+        return found
+
+    def query_body(self, body):
+        """Bodies in the cells under another body's box."""
+        return self.query(body.left, body.bottom, body.right, body.top)
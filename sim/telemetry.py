@@ -0,0 +1,223 @@
+"""Gameplay telemetry: fixed-size event records, buffered in memory and written to column files.
+
+A telemetry file starts with a short header (which records the tick rate
+the game ran at, since everything is timed in ticks) and holds one
+segment per flushed batch. A segment is the record count followed by every column of
+RECORD_DTYPE on its own, zlib-compressed, so a reader can go through a
+file one segment at a time and only decompress the columns it needs.
+"""
+import os
+import struct
+import threading
+import time
+import zlib
+import numpy as np
+from enums.alien_type import AlienType
+from enums.event_type import EventType
+
+from settings import TELEMETRY_BATCH, TELEMETRY_BUFFER, TELEMETRY_DIR, TICK_RATE
+
+MAGIC = b"STEL"
+VERSION = 2
+FILE_HEADER = struct.Struct("<4sHH")  # magic, version, ticks per second
+SEGMENT_HEADER = struct.Struct("<I")     # records in the segment
+COLUMN_HEADER = struct.Struct("<I")      # compressed bytes of the column
+
+# ------------ Record kinds ------------ #
+GAME_STARTED = 0
+SHOT_FIRED = 1      # x, y: the nose of the ship that fired
+ALIEN_KILLED = 2    # detail: index into ALIEN_TYPES, x, y: where it died, value: points
+UFO_KILLED = 3      # x, y: where it died, value: points
+PLAYER_HIT = 4      # x, y: where the ship was, value: lives left
+WAVE_CLEARED = 5    # value: ticks the wave lasted, -1 when it started in a game state loaded from elsewhere
+GAME_OVER = 6       # value: final score
+REWOUND = 7         # tick: the tick a snapshot put the game back to, value: ticks it went back
+KIND_NAMES = (
+    "game_started", "shot_fired", "alien_killed", "ufo_killed", "player_hit", "wave_cleared", "game_over", "rewound",
+)
+ALIEN_TYPES = list(AlienType)
+ALIEN_TYPE_INDEX = {alien_type: index for index, alien_type in enumerate(ALIEN_TYPES)}
+
+# tick, game (per file), kind, detail, x, y, value; y goes far above the window in late endless waves
+RECORD = struct.Struct("<IHBbiii")
+RECORD_DTYPE = np.dtype([
+    ("tick", "<u4"), ("game", "<u2"), ("kind", "u1"), ("detail", "i1"),
+    ("x", "<i4"), ("y", "<i4"), ("value", "<i4"),
+])
+
+
+class Telemetry:
+    """Records what happens in games into a ring buffer that a writer thread drains to a file.
+
+    Call `start_game(world)` after every `World.setup()`, `record(world)`
+    after every step and `rewound(world)` after restoring a snapshot. The main thread only packs records into a
+    preallocated buffer and never waits: the writer thread wakes up once
+    `batch` records are waiting, and if it ever falls a whole buffer
+    behind, new records are dropped and counted in `dropped`. `close()`
+    writes what is left and raises any error the writer thread ran into.
+
+    `head` is only advanced by the main thread and `tail` only by the
+    writer thread, so the two never need a lock."""
+
+    def __init__(self, directory=TELEMETRY_DIR, tick_rate=TICK_RATE, capacity=TELEMETRY_BUFFER, batch=TELEMETRY_BATCH):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.stel")
+        self.tick_rate = tick_rate
+        self.capacity = capacity
+        self.batch = batch
+        self.buffer = bytearray(capacity * RECORD.size)
+        self.head = 0           # Records written so far
+        self.tail = 0           # Records flushed so far
+        self.dropped = 0
+        self.game = 0           # Number of the current game within the file
+        self.next_game = 0
+        self.tick = 0           # Tick of the last record
+        self.wave_started = 0   # Tick the current wave started on, None if unknown
+        self.wave_starts = {}   # wave -> tick it started on, in the current game
+        self.error = None
+        self.closing = False
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self.write_all, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    # ------------ Main thread ------------ #
+    def append(self, tick, kind, detail=-1, x=0, y=0, value=0):
+        self.tick = tick
+        head = self.head
+        if head - self.tail >= self.capacity:
+            self.dropped += 1
+            return
+        RECORD.pack_into(self.buffer, head % self.capacity * RECORD.size, tick, self.game, kind, detail, x, y, value)
+        self.head = head + 1
+        if (head + 1) % self.batch == 0:
+            self.wake.set()
+
+    def start_game(self, world):
+        self.game = self.next_game
+        self.next_game = (self.next_game + 1) & 0xFFFF
+        self.wave_started = world.tick
+        self.wave_starts = {world.wave: world.tick}
+        self.append(world.tick, GAME_STARTED)
+
+    def rewound(self, world):
+        """Mark that the game jumped to the state of a snapshot.
+
+        Whatever was recorded in this game after the tick it went back to
+        happened in a timeline that was thrown away, and the report leaves it
+        out. The current wave's start is looked up again; it is unknown when
+        the snapshot came from another game or run."""
+        self.append(world.tick, REWOUND, -1, 0, 0, self.tick - world.tick)
+        self.wave_started = self.wave_starts.get(world.wave)
+        if self.wave_started is not None and self.wave_started > world.tick:
+            self.wave_started = None
+
+    def record(self, world):
+        """Append a record for every gameplay event of the last step."""
+        tick = world.tick
+        for event, entity in world.events:
+            if event == EventType.SPAWNED or event == EventType.DESPAWNED:
+                continue
+            if event == EventType.SHOT_FIRED:
+                self.append(tick, SHOT_FIRED, -1, round(entity.center_x), round(entity.top))
+            elif event == EventType.ALIEN_KILLED:
+                self.append(
+                    tick, ALIEN_KILLED, ALIEN_TYPE_INDEX[entity.alien_type],
+                    round(entity.center_x), round(entity.center_y), entity.alien_type.score,
+                )
+            elif event == EventType.UFO_KILLED:
+                self.append(tick, UFO_KILLED, -1, round(entity.center_x), round(entity.center_y), world.config.ufo_score)
+            elif event == EventType.PLAYER_HIT:
+                self.append(tick, PLAYER_HIT, -1, round(entity.center_x), round(entity.center_y), entity.lives)
+            elif event == EventType.WAVE_CLEARED:
+                lasted = tick - self.wave_started if self.wave_started is not None else -1
+                self.append(tick, WAVE_CLEARED, -1, 0, 0, lasted)
+                self.wave_started = tick
+                self.wave_starts[world.wave] = tick
+            elif event == EventType.GAME_OVER:
+                self.append(tick, GAME_OVER, -1, 0, 0, world.score)
+
+    def close(self):
+        """Write every buffered record and stop the writer thread."""
+        if self.thread is None:
+            return
+        self.closing = True
+        self.wake.set()
+        self.thread.join()
+        self.thread = None
+        if self.error is not None:
+            raise self.error
+
+    # ------------ Writer thread ------------ #
+    def write_all(self):
+        try:
+            with open(self.path, "wb") as file:
+                file.write(FILE_HEADER.pack(MAGIC, VERSION, self.tick_rate))
+                while True:
+                    self.wake.wait()
+                    self.wake.clear()
+                    # Read after clearing, so records added meanwhile are written now or wake us again
+                    closing = self.closing
+                    self.write_pending(file)
+                    if closing:
+                        break
+        except OSError as error:
+            self.error = error
+
+    def write_pending(self, file):
+        """Write everything between tail and head, one segment per contiguous stretch of the buffer."""
+        head = self.head
+        while self.tail < head:
+            start = self.tail % self.capacity
+            count = min(head - self.tail, self.capacity - start)
+            records = np.frombuffer(
+                self.buffer[start * RECORD.size:(start + count) * RECORD.size], dtype=RECORD_DTYPE,
+            )
+            write_segment(file, records)
+            self.tail += count
+        file.flush()
+
+
+def write_segment(file, records):
+    file.write(SEGMENT_HEADER.pack(len(records)))
+    for name in RECORD_DTYPE.names:
+        column = zlib.compress(np.ascontiguousarray(records[name]).tobytes())
+        file.write(COLUMN_HEADER.pack(len(column)))
+        file.write(column)
+
+
+def read_header(file, path):
+    """Check the header at the start of an open telemetry file and return its tick rate."""
+    try:
+        magic, version, tick_rate = FILE_HEADER.unpack(file.read(FILE_HEADER.size))
+    except struct.error:
+        magic = None
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} telemetry file")
+    return tick_rate
+
+
+def read_tick_rate(path):
+    """Ticks per second of the games recorded in a telemetry file."""
+    with open(path, "rb") as file:
+        return read_header(file, path)
+
+
+def read_segments(path, columns=None):
+    """Yield the records of a telemetry file one segment at a time, as {column: array}.
+
+    Only `columns` (all by default) are decompressed; the rest are skipped."""
+    wanted = set(columns if columns is not None else RECORD_DTYPE.names)
+    with open(path, "rb") as file:
+        read_header(file, path)
+        while file.read(SEGMENT_HEADER.size):
+            segment = {}
+            try:
+                for name in RECORD_DTYPE.names:
+                    (size,) = COLUMN_HEADER.unpack(file.read(COLUMN_HEADER.size))
+                    if name in wanted:
+                        segment[name] = np.frombuffer(zlib.decompress(file.read(size)), dtype=RECORD_DTYPE[name])
+                    else:
+                        file.seek(size, os.SEEK_CUR)
+            except (struct.error, zlib.error):
+                return  # The last segment was cut off while it was being written
+            yield segment
@@ -0,0 +1,435 @@
+import random
+from dataclasses import replace
+from enums.event_type import EventType
+from sim.config import GameConfig
+from sim.entities import PlayerBody, UFOBody
+from sim.fleet import Fleet
+from sim.hit_shapes import overlaps
+from sim.inputs import InputState
+from sim.pool import Pool
+from sim.projectiles import ALIEN, HALF_HEIGHT, HALF_WIDTH, PLAYER, Projectiles
+from sim.spatial_hash import SpatialHash
+
+from settings import RANDOM_SEED, UFO_POOL_SIZE
+
+UFO_DIRECTIONS = (-1, 1)
+# Seeds are saved in snapshots as signed 64-bit integers
+SEED_LIMIT = 2**63
+
+
+class World:
+    """All game rules, without a window.
+
+    Owns the fleet, player, bullets, UFOs and score and advances them with
+    `step(delta_time, inputs)`. Anything a renderer needs to react to (an
+    entity appearing or going away, a hit, a shot) is appended to `events`
+    as an `(EventType, entity)` pair; `events` is cleared at the start of
+    every step, so read it after each one.
+
+    All randomness comes from one `random.Random` seeded with `seed`, so
+    the same seed and the same inputs always play out the same game.
+    Difficulty knobs are read from `config` rather than from `settings`, so
+    games with different settings can run side by side. In endless mode
+    (`config.endless_mode`) every wave brings a bigger fleet, more aliens
+    firing at once and more UFOs flying in together.
+
+    Bullets are not objects: each side's live in a `sim.projectiles`
+    set of NumPy arrays, moved, culled and tested against the player in
+    bulk, so they are not announced in `events` either (only the shot is).
+
+    Bodies and bullets that die during a step are only flagged dead; the
+    world lists and the projectile arrays are compacted once, at the end of
+    the step, so a tick with many removals does not pay for a removal each."""
+
+    def __init__(self, seed=RANDOM_SEED, config: GameConfig | None = None):
+        self.config = config = config or GameConfig()
+
+        # ------------ Randomness ------------ #
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        if not -SEED_LIMIT <= self.seed < SEED_LIMIT:
+            raise ValueError(f"seed {self.seed} does not fit in a signed 64-bit integer")
+        self.rng = random.Random(self.seed)
+        self.tick = 0
+
+        # ------------ Entities ------------ #
+        self.player = None
+        self.fleet = Fleet(self.rng, config)
+        self.player_bullets = Projectiles(PLAYER)
+        self.alien_bullets = Projectiles(ALIEN)
+        self.ufos = []
+        self.ufo_pool = Pool(lambda: UFOBody(1, config.ufo_speed), UFO_POOL_SIZE)
+        # Broadphase grids for the bodies that collisions are tested against
+        self.ufo_grid = SpatialHash()
+        # Bodies flagged dead since the lists were last compacted
+        self.removals = 0
+        self.score = 0
+        self.wave = 1
+        self.game_over = False
+        self.events = []
+        # Set to a sim.profiler.Profiler to time every phase of step()
+        self.profiler = None
+
+        # ------------ Alien Fleet info ------------ #
+        self.fleet_direction = 1    # 1 = right; -1 = left
+        self.fleet_speed = config.alien_speed       # pixels per second
+        self.fleet_drop = config.alien_drop        # pixels to drop when changing direction
+        self.alien_shoot_timer = config.alien_shoot_cooldown
+        self.initial_alien_count = 0
+        self.current_fleet_speed = self.fleet_speed
+        # Aliens firing together and UFOs flying in together; only endless mode raises them
+        self.volley = 1
+        self.ufo_squadron = 1
+
+    def setup(self):
+        """Set up the game and initialize the player and alien fleet."""
+        for alien in self.fleet:
+            self.events.append((EventType.DESPAWNED, alien))
+        self.clear_bullets()
+        self.clear_ufos()
+        if self.player is not None:
+            self.events.append((EventType.DESPAWNED, self.player))
+
+        self.score = 0
+        self.wave = 1
+        self.game_over = False
+        self.tick = 0
+        self.rng.seed(self.seed)
+        self.fleet_direction = 1
+        self.alien_shoot_timer = self.config.alien_shoot_cooldown
+        self.current_fleet_speed = self.fleet_speed
+
+        # ------------ Set up player ------------ #
+        self.player = PlayerBody(self.config)
+        self.events.append((EventType.SPAWNED, self.player))
+
+        # ------------ Set up aliens ------------ #
+        self.configure_wave()
+        self.create_fleet()
+
+    def step(self, delta_time, inputs: InputState):
+        """Advance the game by `delta_time` seconds."""
+        self.events.clear()
+        self.tick += 1
+        profiler = self.profiler
+        if profiler:
+            profiler.start_tick()
+
+        # ------------ Player ------------ #
+        self.player.change_x = inputs.direction
+        if inputs.fire and self.player.shoot_bullet(self.player_bullets) is not None:
+            self.events.append((EventType.SHOT_FIRED, self.player))
+        self.player.update(delta_time)
+        if profiler:
+            profiler.lap("player")
+
+        # ------------ Player Bullet Movement --------------#
+        # Bullets that fly off the top are flagged dead along the way
+        self.player_bullets.advance(delta_time)
+        if profiler:
+            profiler.lap("bullet_movement")
+
+        if len(self.fleet) == 0:
+            # All aliens destroyed, reset fleet and clear bullets
+            self.reset()
+            if profiler:
+                profiler.lap("wave_reset")
+
+        # Check for collisions
+        self.check_collisions()
+        if profiler:
+            profiler.lap("collisions")
+
+        # ------------ Alien Fleet Movement and Shooting --------------#
+        self.update_fleet(delta_time)
+        if profiler:
+            profiler.lap("fleet")
+
+        # Randomly spawn a UFO occasionally
+        if self.rng.random() < self.config.ufo_spawn_rate * delta_time:
+            for i in range(self.ufo_squadron):
+                self.spawn_ufo(i)
+        for ufo in self.ufos:
+            if ufo.alive:
+                ufo.update(delta_time)
+                if ufo.off_screen:
+                    self.despawn(ufo)
+        if profiler:
+            profiler.lap("ufos")
+
+        # ------------ Check for alien invasion ------------ #
+        self.invasion()
+        if profiler:
+            profiler.lap("invasion")
+
+        # ------------ Drop everything that died this tick ------------ #
+        if self.removals:
+            self.compact()
+        self.player_bullets.compact()
+        self.alien_bullets.compact()
+        if profiler:
+            profiler.lap("compact")
+            self.count_entities(profiler)
+
+    def count_entities(self, profiler):
+        """Report live entities and removals of this tick to the profiler."""
+        profiler.count("aliens", len(self.fleet))
+        profiler.count("player_bullets", len(self.player_bullets))
+        profiler.count("alien_bullets", len(self.alien_bullets))
+        profiler.count("ufos", len(self.ufos))
+        despawned = sum(1 for event, _ in self.events if event == EventType.DESPAWNED)
+        profiler.count("removals", despawned + self.player_bullets.dropped + self.alien_bullets.dropped)
+        profiler.end_tick(self.tick)
+
+    #------------------- Helper Methods -------------------#
+    def spawn(self, entities, entity):
+        """Add an entity to one of the world lists."""
+        entities.append(entity)
+        self.events.append((EventType.SPAWNED, entity))
+
+    def despawn(self, entity):
+        """Flag a UFO dead; it leaves its list when the lists are next compacted."""
+        if entity.alive:
+            entity.alive = False
+            self.events.append((EventType.DESPAWNED, entity))
+            self.removals += 1
+
+    def compact(self):
+        """Drop dead UFOs from the world list, in one pass, and hand them back to their pool.
+
+        Live UFOs keep their order, and the list is filled in place, so
+        compacting allocates nothing."""
+        ufos = self.ufos
+        kept = 0
+        for ufo in ufos:
+            if ufo.alive:
+                ufos[kept] = ufo
+                kept += 1
+            else:
+                self.ufo_pool.release(ufo)
+        del ufos[kept:]
+        self.removals = 0
+
+    def clear_bullets(self):
+        """Remove every bullet."""
+        self.player_bullets.clear()
+        self.alien_bullets.clear()
+
+    def clear_ufos(self):
+        """Remove every UFO and hand them back to the pool."""
+        for ufo in self.ufos:
+            if ufo.alive:
+                ufo.alive = False
+                self.events.append((EventType.DESPAWNED, ufo))
+            self.ufo_pool.release(ufo)
+        self.ufos.clear()
+
+    def kill_alien(self, alien):
+        """Remove an alien from the fleet grid."""
+        self.fleet.kill(alien)
+        self.events.append((EventType.DESPAWNED, alien))
+
+    def end_game(self):
+        """Flag the game as over; the owner decides what to do next."""
+        if not self.game_over:
+            self.game_over = True
+            self.events.append((EventType.GAME_OVER, self.player))
+
+    def configure_wave(self):
+        """Size the fleet and the fire for the current wave.
+
+        Outside endless mode every wave is the same. In endless mode each
+        wave adds rows on top of the formation (the bottom row always
+        starts where it does in wave 1, so extra rows wait above the
+        screen), adds columns while they fit, and raises how many aliens
+        fire at once and how many UFOs fly in together, up to
+        `endless_max_ufos`. The fleet is only rebuilt when its size
+        changes, to the size `wave_size` gives."""
+        config = self.config
+        if not config.endless_mode:
+            return
+        extra = self.wave - 1
+        columns, rows = self.wave_size(self.wave)
+        if (columns, rows) != (self.fleet.columns, self.fleet.rows):
+            added_columns = columns - config.alien_columns
+            added_rows = rows - config.alien_rows
+            # Extra rows are top aliens; the formation stays centered where it started
+            self.fleet = Fleet(self.rng, replace(
+                config,
+                alien_columns=columns,
+                alien_rows=rows,
+                top_alien_rows=config.top_alien_rows + added_rows,
+                alien_start_x=config.alien_start_x - added_columns * config.alien_x_spacing / 2,
+                alien_start_y=config.alien_start_y + added_rows * config.alien_y_spacing,
+            ))
+        self.volley = 1 + extra * config.endless_shooters_per_wave
+        self.ufo_squadron = min(1 + extra // config.endless_waves_per_ufo, config.endless_max_ufos)
+
+    def wave_size(self, wave):
+        """(columns, rows) of the fleet in a wave, without building it."""
+        config = self.config
+        if not config.endless_mode:
+            return config.alien_columns, config.alien_rows
+        extra = wave - 1
+        columns = max(min(config.alien_columns + extra * config.endless_columns_per_wave, config.endless_max_columns), config.alien_columns)
+        return columns, config.alien_rows + extra * config.endless_rows_per_wave
+
+    def create_fleet(self):
+        """Bring the whole alien fleet back to its starting formation."""
+        self.fleet.reset()
+        for alien in self.fleet:
+            self.events.append((EventType.SPAWNED, alien))
+
+        self.initial_alien_count = len(self.fleet)
+
+    def move_fleet(self, delta_time):
+        """Move the alien fleet."""
+        # Only the outermost live columns can hit an edge
+        change_direction = self.fleet.move(self.fleet_direction * self.current_fleet_speed * delta_time)
+
+        # If we need to change direction, do so and drop the fleet down
+        if change_direction:
+            self.fleet_direction *= -1
+            self.fleet.drop(self.fleet_drop)
+
+    def update_fleet(self, delta_time):
+        """Update the alien fleet movement and shooting.
+
+        - Move the fleet horizontally and drop when it reaches screen edges.
+        - Update alien shooting timer and handle shooting.
+        - Move alien bullets."""
+
+        # Update fleet speed based on remaining aliens
+        self.update_fleet_speed()
+        # Move the fleet using updated speed
+        self.move_fleet(delta_time)
+        # Dynamic cooldown for alien shooting (less aliens = faster shooting)
+        current_cooldown = self.config.alien_shoot_cooldown * (len(self.fleet) / self.fleet.capacity)
+        current_cooldown = max(current_cooldown, self.config.min_cooldown)
+        # Update alien shooting timer
+        self.alien_shoot_timer -= delta_time
+
+        # Pick random aliens from the bottom of any column to shoot
+        if self.alien_shoot_timer <= 0 and len(self.fleet) > 0:
+            # The fleet tracks the bottom alien of every column
+            for _ in range(self.volley):
+                self.fleet.random_shooter().shoot(self.alien_bullets)
+
+            # Reset alien shoot timer
+            self.alien_shoot_timer = current_cooldown
+
+        # Move alien bullets, flagging the ones that fall off the bottom
+        self.alien_bullets.advance(delta_time)
+
+    def update_fleet_speed(self):
+        """Recalculate the fleet speed dynamically based on remaining aliens."""
+        if len(self.fleet) > 0:
+            self.current_fleet_speed = min(self.fleet_speed * (self.initial_alien_count / len(self.fleet)), self.config.max_fleet_speed)
+        else:
+            self.current_fleet_speed = 0
+
+    def invasion(self):
+        """Handle alien invasion (aliens reaching the bottom)."""
+        # If the lowest live row reaches the bottom, end the game
+        if len(self.fleet) > 0 and self.fleet.bottom <= 0:
+            self.end_game()
+
+    def reset(self):
+        """Reset the alien fleet to its initial state and clears existing bullets.
+        Called when all aliens are destroyed."""
+        self.clear_bullets()
+        self.wave += 1
+        self.events.append((EventType.WAVE_CLEARED, None))
+
+        # Recreate the alien fleet
+        self.configure_wave()
+        self.create_fleet()
+
+        # Reset fleet parameters
+        self.fleet_direction = 1
+        self.update_fleet_speed()
+
+        # Reset alien shoot timer
+        self.alien_shoot_timer = self.config.alien_shoot_cooldown
+
+    def spawn_ufo(self, place=0):
+        """Spawn a UFO that moves across the top of the screen.
+
+        UFOs flying in together each pick a side; `place` is how many come
+        in ahead of this one, and it starts that many lengths further out."""
+        direction = self.rng.choice(UFO_DIRECTIONS)
+        ufo = self.ufo_pool.acquire()
+        ufo.reset(direction)
+        ufo.center_x -= direction * place * 2 * ufo.width
+        self.spawn(self.ufos, ufo)
+
+    def hit_player(self):
+        """Take a life from the player and end the game when none are left."""
+        self.player.lives -= 1
+        self.events.append((EventType.PLAYER_HIT, self.player))
+        if self.player.lives <= 0:
+            self.end_game()
+
+    def first_hit(self, shape, x, y, candidates):
+        """First live candidate from a broadphase query that really overlaps `shape` centered at (x, y)."""
+        for other in candidates:
+            if other.alive and overlaps(shape, x, y, other.shape, other.center_x, other.center_y):
+                return other
+        return None
+
+    def check_collisions(self):
+        # ------------ Broadphase ------------ #
+        # The fleet keeps its own grid up to date and UFOs are rebuilt into theirs;
+        # alien bullets are found by comparing their boxes all at once, and the
+        # ones that may cancel out a player bullet are paired up by x once per tick
+        self.ufo_grid.rebuild(self.ufos)
+        player_bullets = self.player_bullets
+        alien_bullets = self.alien_bullets
+        shape = player_bullets.shape
+        crossing = alien_bullets.overlapping(player_bullets) if self.config.bullet_cancellation else {}
+
+        # Player bullet collision with aliens
+        for bullet in range(player_bullets.count):
+            # Bullets that left the screen this tick are still in the arrays
+            if not player_bullets.alive[bullet]:
+                continue
+            x = player_bullets.x.item(bullet)
+            y = player_bullets.y.item(bullet)
+            box = (x - HALF_WIDTH, y - HALF_HEIGHT, x + HALF_WIDTH, y + HALF_HEIGHT)
+            alien = self.first_hit(shape, x, y, self.fleet.query(*box))
+            if alien:
+                # Increase score based on alien type
+                self.score += alien.alien_type.score
+                self.events.append((EventType.ALIEN_KILLED, alien))
+                self.kill_alien(alien)
+                player_bullets.kill(bullet)
+                continue  # Bullet can only hit one alien
+
+            # Check for UFO collision
+            ufo = self.first_hit(shape, x, y, self.ufo_grid.query(*box))
+            if ufo:
+                self.score += self.config.ufo_score  # UFO gives extra points
+                self.events.append((EventType.UFO_KILLED, ufo))
+                self.despawn(ufo)
+                player_bullets.kill(bullet)
+                continue  # Bullet can only hit one UFO
+
+            # Bullets shooting each other down
+            if crossing:
+                for other in crossing.get(bullet, ()):
+                    if alien_bullets.alive[other] and overlaps(
+                        shape, x, y, shape, alien_bullets.x.item(other), alien_bullets.y.item(other),
+                    ):
+                        alien_bullets.kill(other)
+                        player_bullets.kill(bullet)
+                        break
+
+        # Alien bullets vs player
+        player = self.player
+        for bullet in alien_bullets.in_box(player.left, player.bottom, player.right, player.top).tolist():
+            if alien_bullets.hits(bullet, player.shape, player.center_x, player.center_y):
+                alien_bullets.kill(bullet)
+                self.hit_player()
+
+        # Player vs aliens
+        if self.first_hit(player.shape, player.center_x, player.center_y, self.fleet.query_body(player)):
+            self.hit_player()
@@ -0,0 +1,29 @@
+from sim.pool import Pool
+
+
+class SpritePool(Pool):
+    """Pool of sprites that stay in a layer of a RenderBatch and are hidden while unused.
+
+    Showing and hiding a sprite is much cheaper than adding it to and
+    removing it from a SpriteList, and never changes the list while it is
+    being iterated."""
+
+    def __init__(self, factory, batch, layer, size=0):
+        self.batch = batch
+        self.layer = layer
+        super().__init__(factory, size)
+
+    def create(self):
+        sprite = super().create()
+        sprite.visible = False
+        self.batch.add(sprite, self.layer)
+        return sprite
+
+    def acquire(self):
+        sprite = super().acquire()
+        sprite.visible = True
+        return sprite
+
+    def release(self, sprite):
+        sprite.visible = False
+        super().release(sprite)
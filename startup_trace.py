@@ -0,0 +1,40 @@
+import time
+
+
+class StartupTrace:
+    """Time of every startup stage, from the first line of `main.py` to the first game frame.
+
+    `mark(stage)` records how long the stage that just finished took. It
+    does nothing unless tracing was turned on with `enable()`, and the
+    report is printed once the first game frame has been drawn."""
+
+    FIRST_FRAME = "first game frame"
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.stages = []    # (stage, seconds it took, seconds since start)
+        self.enabled = False
+
+    def enable(self):
+        self.enabled = True
+
+    def mark(self, stage):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.stages.append((stage, now - self.last, now - self.start))
+        self.last = now
+        if stage == self.FIRST_FRAME:
+            print(self.report())
+            self.enabled = False
+
+    def report(self):
+        lines = [f"{'stage':<28} {'ms':>8} {'total ms':>9}"]
+        for stage, elapsed, total in self.stages:
+            lines.append(f"{stage:<28} {elapsed * 1000:8.1f} {total * 1000:9.1f}")
+        return "\n".join(lines)
+
+
+# Started as soon as main.py imports it, before arcade is imported
+trace = StartupTrace()
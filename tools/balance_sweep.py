@@ -0,0 +1,131 @@
+"""Balance sweeper: plays many headless games for every point of a parameter grid.
+
+Each grid point overrides some of the difficulty settings, and every game
+is played by the scripted bot in `sim.policy` across a process pool.
+
+    python -m tools.balance_sweep --param ALIEN_SPEED=40,50,60 --param MIN_COOLDOWN=1,1.5 --games 1000
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from settings import TICK_RATE
+from sim.config import GameConfig
+from sim.policy import ScriptedPlayer, play
+from sim.world import World
+
+# Games handed to a worker at once
+CHUNK_SIZE = 25
+
+
+def parse_param(text):
+    """`NAME=v1,v2,...` -> (NAME, [v1, v2, ...])"""
+    name, _, values = text.partition("=")
+    if not values:
+        raise argparse.ArgumentTypeError(f"expected NAME=v1,v2,... but got {text!r}")
+    return name.strip(), [value.strip() for value in values.split(",")]
+
+
+def grid_points(params):
+    """Every combination of the swept values, as override dicts."""
+    names = [name for name, _ in params]
+    for values in itertools.product(*(values for _, values in params)):
+        yield dict(zip(names, values))
+
+
+def parsed(overrides):
+    """The overrides with each value converted to its config field's type, as the games will use it."""
+    config = GameConfig().with_overrides(overrides)
+    return {name: getattr(config, name.lower()) for name in overrides}
+
+
+def run_games(overrides, seeds, max_ticks):
+    """Worker: play one game per seed and return (survival seconds, waves cleared, score) for each."""
+    config = GameConfig().with_overrides(overrides)
+    dt = 1 / TICK_RATE
+    results = []
+    for seed in seeds:
+        world = World(seed, config)
+        world.setup()
+        play(world, ScriptedPlayer(), dt, max_ticks)
+        results.append((world.tick * dt, world.wave - 1, world.score))
+    return results
+
+
+def percentile(sorted_values, fraction):
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(overrides, results):
+    """Aggregate the games of one grid point."""
+    survival = sorted(result[0] for result in results)
+    waves = sorted(result[1] for result in results)
+    scores = sorted(result[2] for result in results)
+    return {
+        "params": overrides,
+        "games": len(results),
+        "survival_seconds": {
+            "mean": sum(survival) / len(survival),
+            "p10": percentile(survival, 0.1),
+            "p50": percentile(survival, 0.5),
+            "p90": percentile(survival, 0.9),
+        },
+        "waves_cleared": {"mean": sum(waves) / len(waves), "max": waves[-1]},
+        "score": {
+            "mean": sum(scores) / len(scores),
+            "min": scores[0],
+            "p10": percentile(scores, 0.1),
+            "p50": percentile(scores, 0.5),
+            "p90": percentile(scores, 0.9),
+            "max": scores[-1],
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--param", type=parse_param, action="append", default=[], metavar="NAME=v1,v2",
+                        help="setting to sweep and its values (repeat for a grid)")
+    parser.add_argument("--games", type=int, default=1000, help="games per grid point")
+    parser.add_argument("--max-seconds", type=float, default=600, help="stop a game after this much game time")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="first game seed; every point uses the same seeds")
+    parser.add_argument("--output", default="sweep_results.json", help="where to write the aggregate results")
+    args = parser.parse_args()
+
+    # Fails before starting the pool if a name or value is wrong
+    points = [parsed(overrides) for overrides in grid_points(args.param)]
+
+    max_ticks = int(args.max_seconds * TICK_RATE)
+    seeds = list(range(args.seed, args.seed + args.games))
+    chunks = [seeds[i:i + CHUNK_SIZE] for i in range(0, len(seeds), CHUNK_SIZE)]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            [pool.submit(run_games, overrides, chunk, max_ticks) for chunk in chunks]
+            for overrides in points
+        ]
+        summaries = []
+        for overrides, point_futures in zip(points, futures):
+            results = [result for future in point_futures for result in future.result()]
+            summary = summarize(overrides, results)
+            summaries.append(summary)
+            print(
+                f"{overrides or 'defaults'}: survival {summary['survival_seconds']['mean']:.1f}s, "
+                f"waves {summary['waves_cleared']['mean']:.2f}, "
+                f"score p10/p50/p90 {summary['score']['p10']}/{summary['score']['p50']}/{summary['score']['p90']}"
+            )
+    elapsed = time.perf_counter() - start
+
+    with open(args.output, "w") as file:
+        json.dump({"games_per_point": args.games, "max_seconds": args.max_seconds, "points": summaries}, file, indent=2)
+    print(f"{len(points) * args.games} games in {elapsed:.1f}s, results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Load test for the game server: many spectators on one machine.
+
+Opens hundreds of spectator connections, applies and acknowledges every
+frame like a real client, and reports bandwidth per client, frames missed
+to backpressure and how evenly frames arrive, against the tick rate the
+server announces. With --spawn-server a server is started on a free
+loopback port at --tick-rate and its own tick report is printed too.
+
+    python -m tools.load_test --clients 300 --seconds 10 --spawn-server
+    python -m tools.load_test --clients 300 --spawn-server --tick-rate 120
+    python -m tools.load_test --port 7777 --clients 300
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+from net import protocol
+from net.protocol import StateMirror, message, read_message
+
+from settings import SERVER_HOST, SERVER_PORT, TICK_RATE
+
+
+class Spectator:
+    """Statistics of one connection."""
+    def __init__(self):
+        self.bytes = 0
+        self.frames = 0
+        self.missed = 0         # Ticks between consecutive frames that were never received
+        self.unknown_baseline = 0
+        self.intervals = []     # Seconds between consecutive frames
+        self.mirror = StateMirror()
+        self.tick_rate = None   # As announced by the server
+
+
+async def spectate(host, port, seconds, spectator):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(message(protocol.HELLO_MESSAGE.pack(protocol.HELLO, protocol.SPECTATOR)))
+    welcome = await read_message(reader)
+    _, _, _, spectator.tick_rate, _, _ = protocol.WELCOME_MESSAGE.unpack(welcome)
+    end = time.perf_counter() + seconds
+    last_tick = last_arrival = None
+    while time.perf_counter() < end:
+        payload = await read_message(reader)
+        if payload is None:
+            break
+        now = time.perf_counter()
+        spectator.bytes += len(payload) + protocol.LENGTH.size
+        tick = spectator.mirror.apply(payload)
+        if tick is None:
+            spectator.unknown_baseline += 1
+            continue
+        spectator.frames += 1
+        if last_tick is not None:
+            spectator.missed += max(tick - last_tick - 1, 0)
+            spectator.intervals.append(now - last_arrival)
+        last_tick, last_arrival = tick, now
+        writer.write(message(protocol.ACK_MESSAGE.pack(protocol.ACK, tick)))
+    writer.close()
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+def report(spectators, seconds):
+    bandwidth = sorted(spectator.bytes / seconds / 1024 for spectator in spectators)
+    intervals = sorted(interval for spectator in spectators for interval in spectator.intervals)
+    frames = sum(spectator.frames for spectator in spectators)
+    keyframes = sum(spectator.mirror.keyframes for spectator in spectators)
+    missed = sum(spectator.missed for spectator in spectators)
+    print(f"{len(spectators)} spectators for {seconds:.0f} s, {frames} frames applied ({keyframes} keyframes)")
+    print(
+        f"bandwidth per client KiB/s  mean {statistics.fmean(bandwidth):.2f}  p50 {percentile(bandwidth, 0.5):.2f}"
+        f"  p99 {percentile(bandwidth, 0.99):.2f}  max {bandwidth[-1]:.2f}"
+    )
+    print(f"frames missed to backpressure {missed}  deltas against unknown baselines {sum(s.unknown_baseline for s in spectators)}")
+    if intervals:
+        dt = 1000 / spectators[0].tick_rate
+        print(
+            f"frame interval ms (tick {dt:.2f})  p50 {percentile(intervals, 0.5) * 1000:.2f}"
+            f"  p99 {percentile(intervals, 0.99) * 1000:.2f}  stdev {statistics.pstdev(intervals) * 1000:.2f}"
+        )
+
+
+def free_port(host):
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+async def wait_for_server(host, port, timeout=10.0):
+    end = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > end:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def run(args):
+    server = None
+    if args.spawn_server:
+        args.port = free_port(args.host)
+        server = subprocess.Popen([
+            sys.executable, "-m", "net.server", "--host", args.host, "--port", str(args.port),
+            "--seed", "1", "--duration", str(args.seconds + 5), "--tick-rate", str(args.tick_rate),
+        ])
+    try:
+        await wait_for_server(args.host, args.port)
+        spectators = [Spectator() for _ in range(args.clients)]
+        results = await asyncio.gather(
+            *(spectate(args.host, args.port, args.seconds, spectator) for spectator in spectators),
+            return_exceptions=True,
+        )
+        failed = [result for result in results if isinstance(result, Exception)]
+        if failed:
+            print(f"{len(failed)} connections failed, first: {failed[0]!r}")
+        report([s for s, r in zip(spectators, results) if not isinstance(r, Exception)], args.seconds)
+    finally:
+        if server is not None:
+            # The server prints its tick report when its duration is up
+            server.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default=SERVER_HOST)
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--clients", type=int, default=300, help="spectator connections to open")
+    parser.add_argument("--seconds", type=float, default=10.0, help="how long every spectator watches")
+    parser.add_argument("--tick-rate", type=int, default=TICK_RATE, help="tick rate of the server started by --spawn-server")
+    parser.add_argument("--spawn-server", action="store_true", help="start a server on a free loopback port")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
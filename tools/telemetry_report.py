@@ -0,0 +1,178 @@
+"""Telemetry report: aggregates gameplay event files into one summary.
+
+Files are read one segment at a time and every statistic is a running
+total or a fixed-size histogram, so memory use does not grow with the
+number of events. Records a rewind or quick-load threw away are left out:
+a first pass over each file finds the rewinds, and the second drops every
+earlier record of the same game from after the tick the game went back to.
+
+    python -m tools.telemetry_report                      # every file in TELEMETRY_DIR
+    python -m tools.telemetry_report telemetry/ other.stel --bins 16
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import numpy as np
+
+from settings import TELEMETRY_DIR, WINDOW_WIDTH
+from sim import telemetry
+from sim.telemetry import ALIEN_TYPES, KIND_NAMES, read_segments, read_tick_rate
+
+# Waves longer than this many seconds all land in the last histogram bucket
+MAX_WAVE_SECONDS = 600
+
+
+class Summary:
+    """Running totals over any number of segments."""
+
+    def __init__(self, bins):
+        self.bins = bins
+        self.files = 0
+        self.events = 0
+        self.rewinds = 0
+        self.thrown_away = 0    # Records of timelines a rewind threw away
+        self.unknown_waves = 0  # Waves cleared whose start was not recorded
+        self.kinds = np.zeros(len(KIND_NAMES), dtype=np.int64)
+        self.alien_kills = np.zeros(len(ALIEN_TYPES), dtype=np.int64)
+        self.points = 0
+        self.hit_positions = np.zeros(bins, dtype=np.int64)
+        self.wave_seconds = np.zeros(MAX_WAVE_SECONDS + 1, dtype=np.int64)
+        self.final_score_total = 0
+        self.best_score = 0
+
+    def add(self, segment, tick_rate, thrown_away=None):
+        """Count a segment of a file recorded at `tick_rate`, leaving out the records in `thrown_away`."""
+        if thrown_away is not None and thrown_away.any():
+            self.thrown_away += int(np.count_nonzero(thrown_away))
+            kept = ~thrown_away
+            segment = {name: column[kept] for name, column in segment.items()}
+        kind = segment["kind"]
+        detail = segment["detail"]
+        x = segment["x"]
+        value = segment["value"]
+        self.events += len(kind)
+        self.kinds += np.bincount(kind, minlength=len(KIND_NAMES))[:len(KIND_NAMES)]
+
+        killed = kind == telemetry.ALIEN_KILLED
+        self.alien_kills += np.bincount(detail[killed], minlength=len(ALIEN_TYPES))[:len(ALIEN_TYPES)]
+        self.points += int(value[killed | (kind == telemetry.UFO_KILLED)].sum(dtype=np.int64))
+
+        hit_x = x[kind == telemetry.PLAYER_HIT]
+        buckets = np.clip(hit_x.astype(np.int64) * self.bins // WINDOW_WIDTH, 0, self.bins - 1)
+        self.hit_positions += np.bincount(buckets, minlength=self.bins)
+
+        self.rewinds += int(np.count_nonzero(kind == telemetry.REWOUND))
+
+        durations = value[kind == telemetry.WAVE_CLEARED]
+        known = durations >= 0
+        self.unknown_waves += len(durations) - int(np.count_nonzero(known))
+        seconds = np.minimum(durations[known] // tick_rate, MAX_WAVE_SECONDS)
+        self.wave_seconds += np.bincount(seconds, minlength=MAX_WAVE_SECONDS + 1)
+
+        scores = value[kind == telemetry.GAME_OVER]
+        if len(scores):
+            self.final_score_total += int(scores.sum(dtype=np.int64))
+            self.best_score = max(self.best_score, int(scores.max()))
+
+    def count(self, kind):
+        return int(self.kinds[kind])
+
+    def lines(self):
+        shots = self.count(telemetry.SHOT_FIRED)
+        kills = int(self.alien_kills.sum())
+        ufos = self.count(telemetry.UFO_KILLED)
+        games = self.count(telemetry.GAME_STARTED)
+        finished = self.count(telemetry.GAME_OVER)
+
+        def share(part, whole):
+            return f"{part / whole:6.1%}" if whole else "     -"
+
+        lines = [
+            f"{self.events} events in {self.files} files, {games} games ({finished} played to the end)",
+            f"shots fired {shots}  hits {kills + ufos}  accuracy {share(kills + ufos, shots)}  points from kills {self.points}",
+            f"{'alien type':<12}{'kills':>10}{'of shots':>10}{'of kills':>10}",
+        ]
+        for alien_type, alien_kills in zip(ALIEN_TYPES, self.alien_kills):
+            lines.append(f"{alien_type.name.lower():<12}{alien_kills:>10}{share(alien_kills, shots):>10}{share(alien_kills, kills):>10}")
+        lines.append(f"{'ufo':<12}{ufos:>10}{share(ufos, shots):>10}")
+
+        waves = int(self.wave_seconds.sum())
+        if waves:
+            cumulative = np.cumsum(self.wave_seconds)
+            p50, p90 = (int(np.searchsorted(cumulative, fraction * waves)) for fraction in (0.5, 0.9))
+            lines.append(f"waves cleared {waves}  duration s  p50 {p50}  p90 {p90}")
+        if self.unknown_waves:
+            lines.append(f"waves cleared without a known start {self.unknown_waves}")
+        if self.rewinds:
+            lines.append(f"rewinds {self.rewinds}  records thrown away by them {self.thrown_away}")
+        if finished:
+            lines.append(f"final score  mean {self.final_score_total / finished:.0f}  best {self.best_score}")
+
+        hits = int(self.hit_positions.sum())
+        lines.append(f"player hits {hits} by screen position (left to right):")
+        width = WINDOW_WIDTH / self.bins
+        peak = max(int(self.hit_positions.max()), 1)
+        for index, count in enumerate(self.hit_positions):
+            bar = "#" * round(40 * count / peak)
+            lines.append(f"  {index * width:5.0f}-{(index + 1) * width:<5.0f}{count:>8} {bar}")
+        return lines
+
+
+def rewinds(path):
+    """(record index, game, tick gone back to) of every rewind in a telemetry file."""
+    found = []
+    start = 0
+    for segment in read_segments(path, ("tick", "game", "kind")):
+        at = np.flatnonzero(segment["kind"] == telemetry.REWOUND)
+        found.extend(zip((at + start).tolist(), segment["game"][at].tolist(), segment["tick"][at].tolist()))
+        start += len(segment["kind"])
+    return found
+
+
+def thrown_away(segment, start, marks):
+    """Which records of a segment starting at record `start` a later rewind threw away."""
+    count = len(segment["kind"])
+    index = np.arange(start, start + count)
+    mask = np.zeros(count, dtype=bool)
+    for at, game, tick in marks:
+        if at > start:
+            mask |= (index < at) & (segment["game"] == game) & (segment["tick"] > tick)
+    return mask
+
+
+def telemetry_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(glob.glob(os.path.join(path, "*.stel")))
+        else:
+            yield path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("paths", nargs="*", default=[TELEMETRY_DIR], help="telemetry files or directories of them")
+    parser.add_argument("--bins", type=int, default=10, help="screen columns of the player hit histogram")
+    args = parser.parse_args()
+
+    summary = Summary(args.bins)
+    start = time.perf_counter()
+    for path in telemetry_files(args.paths):
+        summary.files += 1
+        tick_rate = read_tick_rate(path)
+        marks = rewinds(path)
+        first = 0
+        for segment in read_segments(path, ("tick", "game", "kind", "detail", "x", "value")):
+            summary.add(segment, tick_rate, thrown_away(segment, first, marks) if marks else None)
+            first += len(segment["kind"])
+    elapsed = time.perf_counter() - start
+    if not summary.files:
+        print("no telemetry files found")
+        sys.exit(1)
+    print("\n".join(summary.lines()))
+    print(f"read in {elapsed:.2f} s ({summary.events / max(elapsed, 1e-9) / 1e6:.1f} M events/s)")
+
+
+if __name__ == "__main__":
+    main()
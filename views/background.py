@@ -0,0 +1,33 @@
+import arcade
+from asset_manager import assets
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT, BACKGROUND_IMAGE, BACKGROUND_ALPHA
+
+
+class StaticBackground:
+    """The dimmed background image, blended once into an offscreen framebuffer.
+
+    Every frame it is copied into the logical screen with a framebuffer
+    blit, which also replaces clearing it, instead of alpha-blending the
+    full screen image again."""
+
+    def __init__(self, window):
+        self.ctx = window.ctx
+        size = (WINDOW_WIDTH, WINDOW_HEIGHT)
+        self.framebuffer = self.ctx.framebuffer(color_attachments=[self.ctx.texture(size, components=4)])
+        with arcade.Camera2D(render_target=self.framebuffer).activate():
+            self.framebuffer.clear(color=arcade.color.BLACK)
+            arcade.draw_texture_rect(
+                assets.texture(BACKGROUND_IMAGE),
+                arcade.LBWH(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT),
+                alpha=BACKGROUND_ALPHA,
+            )
+
+    def draw(self):
+        """Copy the background into the framebuffer being drawn into (the logical screen).
+
+        Returns the number of draw calls issued; the blit counts as one."""
+        target = self.ctx.active_framebuffer
+        self.ctx.copy_framebuffer(self.framebuffer, target, depth=False)
+        # The blit leaves our framebuffer bound for reading; bind the target for both again
+        target.use(force=True)
+        return 1
@@ -0,0 +1,96 @@
+import numpy as np
+from arcade.gl import BufferDescription
+from pyglet import gl
+from asset_manager import assets
+from settings import BULLET_CAPACITY, BULLET_HEIGHT, BULLET_TEXTURE, BULLET_WIDTH
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform float point_size;
+
+in vec2 in_position;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_position, 0.0, 1.0);
+    gl_PointSize = point_size;
+}
+"""
+
+# The point is a square as big as the bullet is tall; the texture fills the middle of it
+FRAGMENT_SHADER = """
+#version 330
+
+uniform sampler2D image;
+uniform float width_share;
+
+out vec4 out_color;
+
+void main() {
+    float u = (gl_PointCoord.x - 0.5) / width_share + 0.5;
+    if (u < 0.0 || u > 1.0) {
+        discard;
+    }
+    out_color = texture(image, vec2(u, gl_PointCoord.y));
+}
+"""
+
+
+class BulletBatch:
+    """Every bullet in flight drawn straight from the world's projectile arrays, with one draw call.
+
+    There is no sprite per bullet. `sync()` copies all positions into one
+    vertex array with a couple of array operations and `draw()` uploads it
+    and draws each bullet as a textured point."""
+
+    def __init__(self, ctx, capacity=BULLET_CAPACITY):
+        self.ctx = ctx
+        self.count = 0
+        self.vertices = np.zeros((capacity, 2), dtype=np.float32)
+        image = assets.texture(BULLET_TEXTURE).image.convert("RGBA")
+        self.texture = ctx.texture(image.size, components=4, data=image.tobytes(), filter=(ctx.NEAREST, ctx.NEAREST))
+
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.program["point_size"] = BULLET_HEIGHT
+        self.program["width_share"] = BULLET_WIDTH / BULLET_HEIGHT
+        self.buffer = ctx.buffer(reserve=self.vertices.nbytes, usage="stream")
+        self.geometry = ctx.geometry([BufferDescription(self.buffer, "2f", ["in_position"])], mode=ctx.POINTS)
+
+    def __len__(self):
+        return self.count
+
+    def sync(self, sides, lag=0.0):
+        """Place every bullet of each `sim.projectiles` set in `sides` where it was `lag` seconds ago.
+
+        Bullets only ever move straight up or down at a fixed speed, so this
+        is the same as interpolating from their position before the last
+        tick, without keeping it. Between world steps every slot in use
+        holds a live bullet."""
+        count = sum(bullets.count for bullets in sides)
+        if count > len(self.vertices):
+            self.vertices = np.zeros((max(count, 2 * len(self.vertices)), 2), dtype=np.float32)
+            self.buffer.orphan(size=self.vertices.nbytes)
+        start = 0
+        for bullets in sides:
+            end = start + bullets.count
+            vertices = self.vertices[start:end]
+            vertices[:, 0] = bullets.x[:bullets.count]
+            np.multiply(bullets.vy[:bullets.count], -lag, out=vertices[:, 1], casting="same_kind")
+            vertices[:, 1] += bullets.y[:bullets.count]
+            start = end
+        self.count = count
+
+    def draw(self):
+        """Draw every bullet; returns the number of draw calls issued."""
+        if not self.count:
+            return 0
+        self.buffer.write(self.vertices[:self.count])
+        self.texture.use(0)
+        with self.ctx.enabled(self.ctx.BLEND, gl.GL_PROGRAM_POINT_SIZE):
+            self.geometry.render(self.program, vertices=self.count)
+        return 1
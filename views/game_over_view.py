@@ -1,65 +1,83 @@
 import arcade
+import pyglet
 from settings import WINDOW_WIDTH, WINDOW_HEIGHT
 
 
+LINE_HEIGHT = 22
+
+
 class GameOverView(arcade.View):
-    """View to show when the game is over."""
-    def __init__(self, final_score):
+    """View to show when the game is over, with the leaderboard.
+
+    `high_scores` are (score, wave, played_at) best first, and `rank` is
+    the place the game just played took among them, if any."""
+    def __init__(self, final_score, rank=None, high_scores=()):
         super().__init__()
         self.score = final_score
+        self.rank = rank
+        self.window.prepare_renderers()
+        self.background = self.window.background
 
-    def on_show(self):
-        """Called when switching to this view."""
-        arcade.set_background_color(arcade.color.BLACK)
-
-    def on_draw(self):
-        """Draw the game over screen."""
-        self.clear()
-        # Using Text objects for better performance
-        game_over = arcade.Text(
+        # The text never changes, so lay it out once and draw it as one batch
+        self.batch = pyglet.graphics.Batch()
+        self.game_over = arcade.Text(
             "GAME OVER",
             WINDOW_WIDTH / 2,
-            WINDOW_HEIGHT / 2 + 50,
+            WINDOW_HEIGHT / 2 + 200,
             arcade.color.RED,
             font_size=40,
             font_name="Pixeled",
             anchor_x="center",
+            batch=self.batch,
         )
-        instruction = arcade.Text(
+        self.instruction = arcade.Text(
             "PRESS ESC TO QUIT OR R TO RESTART",
             WINDOW_WIDTH / 2,
-            WINDOW_HEIGHT / 2 - 100,
+            WINDOW_HEIGHT / 2 - 240,
             arcade.color.WHITE,
             font_size=16,
             font_name="Pixeled",
             anchor_x="center",
+            batch=self.batch,
         )
-        
-        final_score = arcade.Text(
-            f"FINAL SCORE: {self.score}",
+        self.final_score = arcade.Text(
+            f"FINAL SCORE: {self.score}" + (f"  -  NEW HIGH SCORE #{rank}" if rank else ""),
             WINDOW_WIDTH / 2,
-            WINDOW_HEIGHT / 2 - 10,
-            arcade.color.WHITE,
-            font_size=20,
+            WINDOW_HEIGHT / 2 + 130,
+            arcade.color.YELLOW if rank else arcade.color.WHITE,
+            font_size=16,
             font_name="Pixeled",
             anchor_x="center",
+            batch=self.batch,
         )
+        self.leaderboard = []
+        for place, (score, wave, _) in enumerate(high_scores, start=1):
+            y = WINDOW_HEIGHT / 2 + 70 - (place - 1) * LINE_HEIGHT
+            color = arcade.color.YELLOW if place == rank else arcade.color.WHITE
+            for text, x, anchor_x in (
+                (f"{place}.", WINDOW_WIDTH / 2 - 70, "right"),
+                (str(score), WINDOW_WIDTH / 2 + 30, "right"),
+                (f"WAVE {wave}", WINDOW_WIDTH / 2 + 70, "left"),
+            ):
+                self.leaderboard.append(arcade.Text(
+                    text, x, y, color, font_size=10, font_name="Pixeled", anchor_x=anchor_x, batch=self.batch,
+                ))
 
-        arcade.draw_texture_rect(
-            arcade.load_texture("assets/bg.jpg"),
-            arcade.LBWH(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT),
-            alpha=120,
-        )
-        game_over.draw()
-        instruction.draw()
-        final_score.draw()
+    def on_show(self):
+        """Called when switching to this view."""
+        arcade.set_background_color(arcade.color.BLACK)
+
+    def on_draw(self):
+        """Draw the game over screen."""
+        screen = self.window.logical_screen
+        with screen.activate():
+            self.background.draw()
+            self.batch.draw()
+        screen.present()
 
     def on_key_press(self, key, modifiers):
         """Handle key presses."""
         if key == arcade.key.ESCAPE:
             arcade.close_window()
         elif key == arcade.key.R:
-            from .game_view import GameView
-            game_view = GameView()
-            game_view.setup()
-            self.window.show_view(game_view)
\ No newline at end of file
+            self.window.show_game()
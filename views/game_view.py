@@ -1,201 +1,300 @@
-import random
+import time
+from dataclasses import replace
 import arcade
+from asset_manager import assets
+from audio_manager import AudioManager
+from input_latency import InputLatency
 from sprites.player import Player
 from sprites.alien import Alien
-from enums.alien_type import AlienType
 from sprites.ufo import UFO
-from sprites.hitsplat import HitSplat
+from sprites.pool import SpritePool
+from views.hud import HUD
+from views.render_batch import RenderBatch
+from views.profiler_overlay import ProfilerOverlay
+from enums.alien_type import AlienType
+from enums.event_type import EventType
+from sim.entities import PlayerBody, AlienBody, UFOBody
+from sim.clock import FixedTimestep
+from sim.config import GameConfig
+from sim.inputs import InputState
+from sim.profiler import Profiler
+from sim import snapshot
+from sim.replay import InputRecorder, InputReplay
+from sim.snapshot import SnapshotRing
+from sim.telemetry import Telemetry
+from sim.world import World
+from startup_trace import trace
 
 from settings import *
 
+# Keys that steer the game -> the InputState field they set
+GAME_KEYS = {arcade.key.A: "left", arcade.key.D: "right", arcade.key.SPACE: "fire"}
+# Entities centered higher than this are out of sight, whatever sprite draws them
+HIDDEN_ABOVE = WINDOW_HEIGHT + SPRITE_SIZE
 
 
-class GameView(arcade.View):
-    """Main game class."""
 
-    def __init__(self):
+class GameView(arcade.View):
+    """Main game class.
+
+    The game rules live in `sim.world.World`; this view feeds it keyboard
+    input, keeps one sprite per world entity and draws them. Bullets have
+    no sprites: they are drawn straight from the world's projectile arrays.
+
+    The world runs at a fixed tick rate no matter how fast the display is,
+    and sprites are drawn interpolated between the last two ticks. Every
+    tick's input is recorded, and a recording can be passed back in as
+    `replay` to play the same game again.
+
+    A snapshot of the world is kept every few ticks: BACKSPACE rewinds to
+    the last one, F5 quick-saves (also to a file that `snapshot` can start
+    a game from) and F9 quick-loads.
+
+    F3 toggles a profiler overlay. A `profiler` passed in (to stream
+    timings to a file) stays attached for the whole game, and so does a
+    `telemetry` recorder, which gets every gameplay event, and a `latency`
+    tracker, which gets every game key event and the start of every tick.
+
+    Key handlers only change `inputs`; each tick samples it as it starts."""
+
+    def __init__(
+        self,
+        seed=RANDOM_SEED,
+        replay: InputReplay | None = None,
+        config: GameConfig | None = None,
+        profiler: Profiler | None = None,
+        snapshot: bytes | None = None,
+        telemetry: Telemetry | None = None,
+        latency: InputLatency | None = None,
+        tick_rate=TICK_RATE,
+    ):
         super().__init__()
 
-        # ------------ Sprite lists ------------ #
-        self.player_list = arcade.SpriteList()
-        self.alien_list = arcade.SpriteList()
-        self.player_bullet_list = arcade.SpriteList()
-        self.alien_bullet_list = arcade.SpriteList()
-        self.ufo_list = arcade.SpriteList()
-        self.hitsplat_list = arcade.SpriteList()
-
-        # ------------ Set up the player info ------------ #
-        self.player_sprite = None
-        self.score = 0
-
-        # ------------ Alien Fleet info ------------ #
-        self.fleet_direction = 1    # 1 = right; -1 = left
-        self.fleet_speed = ALIEN_SPEED       # pixels per second
-        self.fleet_drop = ALIEN_DROP        # pixels to drop when changing direction
-        self.alien_shoot_timer = ALIEN_SHOOT_COOLDOWN
-        self.initial_alien_count = 0
-        self.current_fleet_speed = self.fleet_speed
+        # ------------ Rendering ------------ #
+        # Every sprite goes into one batch, drawn back to front in this order
+        self.sprite_batch = RenderBatch(["player", "aliens", "ufos"])
+        # The background, bullets, debris and GPU timer belong to the window and outlive this view
+        self.window.prepare_renderers()
+        self.background = self.window.background
+        # Bullets, drawn under the sprites
+        self.bullets = self.window.bullet_batch
+        # Explosion debris, drawn over the sprites
+        self.particles = self.window.particles
+        # Draw calls issued and CPU/GPU time spent by the last on_draw
+        self.render_stats = {"draw_calls": 0, "frame_ms": 0.0, "gpu_ms": 0.0}
+        self.drawn = False
+        self.gpu_query = self.window.gpu_query
+
+        # ------------ Simulation ------------ #
+        self.replay = replay
+        if replay is not None:
+            seed = replay.seed
+            config = replace(config or GameConfig(), endless_mode=replay.endless)
+        self.clock = FixedTimestep(replay.tick_rate if replay is not None else tick_rate)
+        self.world = World(seed, config)
+        self.recorder = InputRecorder(self.world.seed, self.clock.tick_rate, self.world.config.endless_mode)
+        # World entity -> sprite drawing it
+        self.sprites = {}
+        # World entity -> position before the last tick, for interpolation
+        self.previous_positions = {}
+
+        # ------------ Snapshots ------------ #
+        # State to start from instead of a new game (a replay brings its own)
+        self.start_snapshot = replay.snapshot if replay is not None else snapshot
+        self.snapshots = SnapshotRing()
+        self.quick_save = None
+
+        # ------------ Profiling (None while off) ------------ #
+        self.profiler = profiler
+        self.world.profiler = profiler
+        self.profiler_overlay = None
+        self.telemetry = telemetry
+        self.latency = latency
+
+        # ------------ Sprite pools ------------ #
+        fleet = self.world.fleet
+        self.alien_pools = {
+            alien_type: SpritePool(
+                lambda alien_type=alien_type: Alien(alien_type),
+                self.sprite_batch,
+                "aliens",
+                sum(1 for column in fleet.slots for alien in column if alien.alien_type == alien_type),
+            )
+            for alien_type in AlienType
+        }
+        self.player_pool = SpritePool(Player, self.sprite_batch, "player", 1)
+        self.ufo_pool = SpritePool(UFO, self.sprite_batch, "ufos", UFO_POOL_SIZE)
+        # Sprite -> pool it came from
+        self.pool_of = {}
 
         # ----------- Input tracking ------------ #
-        self.left_pressed = False
-        self.right_pressed = False
+        self.inputs = InputState()
+
+        # ----------- Shared SFX (loaded once by the asset manager) ------------ #
+        self.shoot_sound = assets.sound(SHOOT_SOUND)
+        self.explosion_sound = assets.sound(EXPLOSION_SOUND)
+        self.player_hit_sound = assets.sound(PLAYER_HIT_SOUND)
+        self.audio = AudioManager()
 
-        # ----------- Load background image ------------ #
-        self.background_img = arcade.load_texture("assets/bg.jpg")
+        # ----------- Score and lives display ------------ #
+        self.hud = HUD(self.world.config.player_lives)
 
-        # ----------- Load lives icon texture ------------ #
-        self.lives_texture = arcade.load_texture("assets/Sprite-Ship.png")
+    @property
+    def score(self):
+        return self.world.score
 
-        # ----------- Load SFX ------------ #
-        self.shoot_sound = arcade.load_sound("assets/sfx/Shoot24.wav")
-        self.explosion_sound = arcade.load_sound("assets/sfx/Boom75.wav")
-        self.player_hit_sound = arcade.load_sound("assets/sfx/Hit61.wav")
+    @property
+    def player_sprite(self):
+        return self.sprites.get(self.world.player)
 
 
     def setup(self):
         """Set up the game and initialize the player and alien fleet."""
-        # ------------ Clear existing sprites ------------ #
-        self.player_list.clear()
-        self.alien_list.clear()
-        self.player_bullet_list.clear()
-        self.alien_bullet_list.clear()
-        self.ufo_list.clear()
-        self.hitsplat_list.clear()
-
-        # ------------ Set up player ------------ #
-        self.player_sprite = Player()
-        self.player_sprite.center_x = WINDOW_WIDTH // 2
-        self.player_sprite.center_y = 60
-        self.player_list.append(self.player_sprite)
-
-
-        # ------------ Set up aliens ------------ #
-        self.create_fleet()
+        # ------------ Clear leftover debris ------------ #
+        self.particles.clear()
+
+        # ------------ Set up player and aliens ------------ #
+        # The world despawns everything it had, which hands the sprites back to their pools
+        self.world.setup()
+        self.handle_events()
+        # The bullet batch is shared with earlier games; drop their bullets before the first frame
+        self.sync_sprites()
+        if self.telemetry:
+            self.telemetry.start_game(self.world)
+        self.snapshots.clear()
+        if self.start_snapshot is not None:
+            self.restore_snapshot(self.start_snapshot)
 
 
     def on_draw(self):
         """Render the screen."""
-        # ------------ Clear the screen ------------ #
-        self.clear()
-
-        # ------------ Draw the background image ------------ #
-        arcade.draw_texture_rect(
-            self.background_img,
-            arcade.LBWH(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT),
-            alpha=120,
-        )
-
-        # ------------ Draw the score and lives ------------ #
-        # Using Text objects for better performance
-        # lives = arcade.Text(
-        #     "LIVES:",
-        #     3,
-        #     10,
-        #     arcade.color.WHITE,
-        #     10,
-        #     font_name="Pixeled",
-        # )
-
-        # Draw ship icons to represent lives
-        for i in range(self.player_sprite.lives):
-            x = 20 + i * (32 * LIVES_ICON_SCALING + 5) # 32 is the original width of the ship sprite + 5 pixels spacing
-            y = 15
-            arcade.draw_texture_rect(
-                self.lives_texture,
-                arcade.XYWH(x, y, 32 * LIVES_ICON_SCALING, 32 * LIVES_ICON_SCALING)
-            )
-
-        score = arcade.Text(
-            f"SCORE: {self.score}",
-            WINDOW_WIDTH // 2,
-            WINDOW_HEIGHT - 30,
-            arcade.color.WHITE,
-            10,
-            font_name="Pixeled",
-            anchor_x="center",
-        )
-        # lives.draw()
-        score.draw()
-
-        # ------------ Draw all the sprites ------------ #
-        self.player_list.draw(pixelated=True)
-        self.alien_list.draw(pixelated=True)
-        self.player_bullet_list.draw(pixelated=True)
-        self.alien_bullet_list.draw(pixelated=True)
-        self.ufo_list.draw(pixelated=True)
-        self.hitsplat_list.draw(pixelated=True)
-
-
-    def update_player_direction(self):
-        """Update the player's horizontal direction based on keys pressed.
-        - `-1` = left
-        - `1` = right
-        - `0` = no movement"""
-        # ------------ Calculate direction based on the keys pressed ------------ #
-        # change_x: -1 = left; 1 = right
-        self.player_sprite.change_x = 0
-        if self.left_pressed and not self.right_pressed:
-            self.player_sprite.change_x = -1
-        elif self.right_pressed and not self.left_pressed:
-            self.player_sprite.change_x = 1
+        start = time.perf_counter()
+        if self.profiler:
+            # Timing the GPU waits for it to finish the frame, so only do it while profiling
+            with self.gpu_query:
+                self.draw_frame()
+            self.render_stats["gpu_ms"] = self.gpu_query.time_elapsed / 1e6
+            self.profiler.count("draw_calls", self.render_stats["draw_calls"])
+            self.profiler.count("gpu_ms", round(self.render_stats["gpu_ms"], 3))
+            # The view's laps and counts since the last frame, whether it ran ticks or not
+            self.profiler.end_frame()
+        else:
+            self.draw_frame()
+        self.render_stats["frame_ms"] = (time.perf_counter() - start) * 1000
+        if not self.drawn:
+            self.drawn = True
+            trace.mark(trace.FIRST_FRAME)
+
+    def draw_frame(self):
+        """Issue every draw call of one frame: background, sprites, HUD, overlay, then the upscale.
+
+        Each part returns how many draw calls it issued, and their sum is reported in `render_stats`."""
+        profiler = self.profiler
+        if profiler:
+            profiler.start()
+
+        screen = self.window.logical_screen
+        with screen.activate():
+            # ------------ Copy the pre-blended background (also clears the screen) ------------ #
+            draw_calls = self.background.draw()
+            if profiler:
+                profiler.lap("draw_background")
+
+            # ------------ Draw every bullet, then all the sprites in one batch ------------ #
+            draw_calls += self.bullets.draw()
+            draw_calls += self.sprite_batch.draw()
+            if profiler:
+                profiler.lap("draw_sprites")
+
+            # ------------ Draw every particle in one call ------------ #
+            draw_calls += self.particles.draw()
+            if profiler:
+                profiler.lap("draw_particles")
+
+            # ------------ Draw the score and lives ------------ #
+            self.hud.update(self.score, self.world.player.lives)
+            draw_calls += self.hud.draw()
+            if profiler:
+                profiler.lap("draw_hud")
+
+            if self.profiler_overlay:
+                draw_calls += self.profiler_overlay.draw()
+
+        # ------------ Scale the finished frame up to the window ------------ #
+        draw_calls += screen.present()
+        if profiler:
+            profiler.lap("present")
+        self.render_stats["draw_calls"] = draw_calls
 
 
     def on_update(self, delta_time):
         """Movement and game logic."""
-        # ------------ Update all sprites ------------ #
-        self.player_list.update()
-        self.player_bullet_list.update()
-        self.alien_list.update()
-        self.alien_bullet_list.update()
-        self.hitsplat_list.update()
-
-
-# ------------ Player Bullet Movement --------------#
-        for bullet in self.player_bullet_list:
-            bullet.center_y += bullet.speed * delta_time
-            # Remove bullet if off-screen
-            if bullet.bottom > WINDOW_HEIGHT:
-                bullet.remove_from_sprite_lists()
-                continue
-
-        if len(self.alien_list) == 0:
-            # All aliens destroyed, reset fleet and clear bullets
-            self.reset()
-        
-        # Check for collisions
-        self.check_collisions()
-
-# ------------ Alien Fleet Movement and Shooting --------------#
-        self.update_fleet(delta_time)
-
-        # Randomly spawn a UFO occasionally
-        if random.random() < 0.001:  # Adjust probability as needed
-            self.spawn_ufo()
-        self.ufo_list.update()
+        # ------------ Step the simulation in fixed ticks ------------ #
+        for _ in range(self.clock.advance(delta_time)):
+            self.remember_positions()
+            if self.latency:
+                self.latency.tick_started()
+            inputs = self.replay.next() if self.replay is not None else self.inputs
+            self.recorder.record(inputs)
+            self.world.step(self.clock.dt, inputs)
+            # SPACE only fires once per press, and keys tapped since the last tick are let go
+            self.inputs.sampled()
+            self.handle_events()
+            if self.telemetry:
+                self.telemetry.record(self.world)
+            if self.world.tick % SNAPSHOT_INTERVAL == 0:
+                self.snapshots.push(snapshot.capture(self.world))
+            if self.profiler:
+                self.profiler.lap("events")
+            if self.world.game_over:
+                break
 
-        # ------------ Check for alien invasion ------------ #
-        self.invasion()
+        # ------------ Start this frame's sounds ------------ #
+        self.audio.flush()
+
+        # ------------ Update all sprites and particles ------------ #
+        if self.profiler:
+            self.profiler.start()
+        self.sync_sprites(self.clock.alpha)
+        if self.profiler:
+            self.profiler.lap("sync_sprites")
+        # Debris is cosmetic, so it moves every frame rather than every tick
+        self.particles.update(delta_time)
+        if self.profiler:
+            self.profiler.lap("particles")
+            self.profiler.count("particles", len(self.particles))
+            self.profiler.count("voices", self.audio.active)
+            self.profiler.count("sounds_dropped", self.audio.dropped)
+        if self.profiler_overlay:
+            self.profiler_overlay.update(delta_time)
+
+        if self.world.game_over:
+            self.window.show_game_over()
 
 
     def on_key_press(self, key, modifiers):
         """Called whenever a key is pressed."""
-        # ------------ Handle player movement ------------ #
-        if key == arcade.key.A:
-            self.left_pressed = True
-            self.update_player_direction()
-        elif key == arcade.key.D:
-            self.right_pressed = True
-            self.update_player_direction()
-
-        # ------------ Handle shooting ------------ #
-        elif key == arcade.key.SPACE:
-            # Add the bullet to the player's bullet list
-            bullet = self.player_sprite.shoot_bullet()
-            if bullet:
-                self.player_bullet_list.append(bullet)
-                # Play shooting sound
-                arcade.play_sound(self.shoot_sound)
-        
+        # ------------ Handle player movement and shooting ------------ #
+        game_key = GAME_KEYS.get(key)
+        if game_key:
+            self.inputs.press(game_key)
+            if self.latency:
+                self.latency.key_event()
+
+        # ------------ Toggle the profiler overlay ------------ #
+        elif key == arcade.key.F3:
+            self.toggle_profiler()
+
+        # ------------ Rewind, quick-save and quick-load (not while replaying) ------------ #
+        elif self.replay is None:
+            if key == arcade.key.BACKSPACE:
+                self.rewind()
+            elif key == arcade.key.F5:
+                self.quick_save = snapshot.capture(self.world)
+                snapshot.save(QUICKSAVE_FILE, self.quick_save)
+            elif key == arcade.key.F9 and self.quick_save is not None:
+                self.restore_snapshot(self.quick_save)
+
         # ------------ Handle quitting the game ------------ #
         if key == arcade.key.ESCAPE:
             arcade.close_window()
@@ -204,183 +303,127 @@ class GameView(arcade.View):
     def on_key_release(self, key, modifiers):
         """Called when the user releases a key."""
         # ------------ Handle player movement ------------ #
-        if key == arcade.key.A:
-            self.left_pressed = False
-            self.update_player_direction()
-        elif key == arcade.key.D:
-            self.right_pressed = False
-            self.update_player_direction()
-
-
-    #------------------- Helper Methods -------------------#    
-    def create_fleet(self):
-        """Create the alien fleet."""
-        for col in range(ALIEN_COLUMNS):
-            for row in range(ALIEN_ROWS):
-                # Determine alien type based on row
-                if row < TOP_ALIEN_ROWS:
-                    alien_type = AlienType.TOP
-                elif row < TOP_ALIEN_ROWS + MID_ALIEN_ROWS:
-                    alien_type = AlienType.MID
-                else:
-                    alien_type = AlienType.BOTTOM
-                # Create and position alien
-                alien = Alien(alien_type)
-                alien.center_x = ALIEN_START_X + col * ALIEN_X_SPACING
-                alien.center_y = ALIEN_START_Y - row * ALIEN_Y_SPACING
-                self.alien_list.append(alien)
-
-        self.initial_alien_count = len(self.alien_list)
-
-
-    def move_fleet(self, delta_time):
-        """Move the alien fleet."""
-        # Determine if any alien has hit the edge
-        change_direction = False
-        for alien in self.alien_list:
-            alien.center_x += self.fleet_direction * self.current_fleet_speed * delta_time
-            if alien.right >= WINDOW_WIDTH or alien.left <= 0:
-                change_direction = True
-
-        # If we need to change direction, do so and drop the fleet down
-        if change_direction:
-            self.fleet_direction *= -1
-            for alien in self.alien_list:
-                alien.center_y -= self.fleet_drop
-
-    def update_fleet(self, delta_time):
-        """Update the alien fleet movement and shooting.
-
-        - Move the fleet horizontally and drop when it reaches screen edges.
-        - Update alien shooting timer and handle shooting.
-        - Move alien bullets and check for collisions with the player."""
-
-        # Update fleet speed based on remaining aliens
-        self.update_fleet_speed()
-        # Move the fleet using updated speed
-        self.move_fleet(delta_time)
-        # Dynamic cooldown for alien shooting (less aliens = faster shooting)
-        current_cooldown = ALIEN_SHOOT_COOLDOWN * (len(self.alien_list) / (ALIEN_COLUMNS * ALIEN_ROWS))
-        current_cooldown = max(current_cooldown, MIN_COOLDOWN)
-        # Update alien shooting timer
-        self.alien_shoot_timer -= delta_time
-
-        # Pick a random alien from the bottom of any column to shoot
-        if self.alien_shoot_timer <= 0 and len(self.alien_list) > 0:
-            # Find bottom aliens in each column
-            bottom_aliens = {}
-            for alien in self.alien_list:
-                col = int((alien.center_x - ALIEN_START_X) // ALIEN_X_SPACING)
-                if col not in bottom_aliens or alien.center_y < bottom_aliens[col].center_y:
-                    bottom_aliens[col] = alien
-
-            # Choose a random bottom alien to shoot
-            shooter = random.choice(list(bottom_aliens.values()))
-            bullet = shooter.shoot()
-            self.alien_bullet_list.append(bullet)
-
-            # Reset alien shoot timer
-            self.alien_shoot_timer = current_cooldown
-
-        # Update alien bullets
-        for bullet in self.alien_bullet_list:
-            bullet.center_y += bullet.speed * delta_time
-
-            if bullet.top < 0:
-                bullet.remove_from_sprite_lists()
-                continue
-
-    
-    def update_fleet_speed(self):
-        """Recalculate the fleet speed dynamically based on remaining aliens."""
-        if len(self.alien_list) > 0:
-            self.current_fleet_speed = min(self.fleet_speed * (self.initial_alien_count / len(self.alien_list)), MAX_FLEET_SPEED)
+        game_key = GAME_KEYS.get(key)
+        if game_key and game_key != "fire":
+            self.inputs.release(game_key)
+            if self.latency:
+                self.latency.key_event()
+
+
+    #------------------- Helper Methods -------------------#
+    def toggle_profiler(self):
+        """Show or hide the profiler overlay, profiling only while it is shown
+        (or for the whole game when streaming to a file)."""
+        if self.profiler_overlay:
+            self.profiler_overlay = None
+            if self.profiler.stream is None:
+                self.profiler = None
         else:
-            self.current_fleet_speed = 0
-
-
-    def invasion(self):
-        """Handle alien invasion (aliens reaching the bottom)."""
-        # If an alien reaches the bottom, end the game
-        for alien in self.alien_list:
-            if alien.bottom <= 0:
-                self.window.show_game_over()
-                break
-
-    def reset(self):
-        """Reset the alien fleet to its initial state and clears existing bullets.
-        Called when all aliens are destroyed."""
-        self.alien_list.clear()
-        self.player_bullet_list.clear()
-        self.alien_bullet_list.clear()
-        
-        # Recreate the alien fleet
-        self.create_fleet()
-
-        # Reset fleet parameters
-        self.fleet_direction = 1
-        self.update_fleet_speed()
-
-        # Reset alien shoot timer
-        self.alien_shoot_timer = ALIEN_SHOOT_COOLDOWN
-
-    def spawn_ufo(self):
-        """Spawn a UFO that moves across the top of the screen."""
-        direction = random.choice([-1, 1])
-        ufo = UFO(direction)
-        self.ufo_list.append(ufo)
-
-
-    def check_collisions(self):
-        # Player bullet collision with aliens
-        for bullet in self.player_bullet_list:
-                hits = arcade.check_for_collision_with_list(bullet, self.alien_list)
-                for alien in hits:
-                    # Increase score based on alien type
-                    self.score += alien.alien_type.score
-                    # Hitsplat at alien position
-                    self.hitsplat_list.append(HitSplat(alien.center_x, alien.center_y))
-                    # Play explosion sound
-                    arcade.play_sound(self.explosion_sound)
-
-                    alien.remove_from_sprite_lists()
-                    bullet.remove_from_sprite_lists()
-                    break  # Bullet can only hit one alien
-
-                # Check for UFO collision
-                ufo_hits = arcade.check_for_collision_with_list(bullet, self.ufo_list)
-                for ufo in ufo_hits:
-                    self.score += 100  # UFO gives extra points
-                    # Hitsplat at UFO position
-                    self.hitsplat_list.append(HitSplat(ufo.center_x, ufo.center_y))
-                    # Play explosion sound
-                    arcade.play_sound(self.explosion_sound)
-
-                    ufo.remove_from_sprite_lists()
-                    bullet.remove_from_sprite_lists()
-                    break  # Bullet can only hit one UFO
-
-        # Alien bullets vs player
-        for bullet in self.alien_bullet_list:
-            if arcade.check_for_collision(bullet, self.player_sprite):
-                    bullet.remove_from_sprite_lists()
-                    # Show hitsplat at player position
-                    self.hitsplat_list.append(HitSplat(self.player_sprite.center_x, self.player_sprite.center_y))
-                    # Play player hit sound
-                    arcade.play_sound(self.player_hit_sound)
-                    # Reduce player lives
-                    self.player_sprite.lives -= 1
-                    if self.player_sprite.lives <= 0:
-                        self.window.show_game_over()
-
-        # Player vs aliens
-        if arcade.check_for_collision_with_list(self.player_sprite, self.alien_list):
-                # Reduce player lives
-                    self.player_sprite.lives -= 1
-                    # Show hitsplat at player position
-                    self.hitsplat_list.append(HitSplat(self.player_sprite.center_x, self.player_sprite.center_y))
-                    # Play player hit sound
-                    arcade.play_sound(self.player_hit_sound)
-                    # Check for game over
-                    if self.player_sprite.lives <= 0:
-                        self.window.show_game_over()
\ No newline at end of file
+            if self.profiler is None:
+                self.profiler = Profiler()
+            self.profiler_overlay = ProfilerOverlay(self.profiler)
+        self.world.profiler = self.profiler
+
+    def rewind(self):
+        """Jump back to the most recent snapshot in the ring buffer."""
+        blob = self.snapshots.pop()
+        if blob is not None:
+            self.restore_snapshot(blob)
+
+    def restore_snapshot(self, blob):
+        """Put the world back into the state of a snapshot.
+
+        Sprites are handed back to their pools and taken out again for the
+        restored entities, so nothing is rebuilt. The input recording starts
+        over from the snapshot so it still replays the game being played, and
+        telemetry marks the jump so the ticks thrown away are not counted twice."""
+        self.particles.clear()
+        snapshot.restore(self.world, blob)
+        self.handle_events()
+        if self.telemetry:
+            self.telemetry.rewound(self.world)
+        self.recorder.restart(blob)
+        # Do not interpolate across the jump
+        self.remember_positions()
+        self.sync_sprites()
+
+    def handle_events(self):
+        """React to everything that happened during the last world step."""
+        for event, entity in self.world.events:
+            if event == EventType.SPAWNED:
+                self.add_sprite(entity)
+            elif event == EventType.DESPAWNED:
+                self.remove_sprite(entity)
+            elif event == EventType.SHOT_FIRED:
+                self.audio.request(self.shoot_sound)
+            elif event == EventType.ALIEN_KILLED:
+                # Debris flies out of whatever was shot down
+                self.particles.burst(entity.center_x, entity.center_y, *ALIEN_BURST)
+                self.audio.request(self.explosion_sound)
+            elif event == EventType.UFO_KILLED:
+                self.particles.burst(entity.center_x, entity.center_y, *UFO_BURST)
+                self.audio.request(self.explosion_sound)
+            elif event == EventType.PLAYER_HIT:
+                self.particles.burst(entity.center_x, entity.center_y, *PLAYER_BURST)
+                self.audio.request(self.player_hit_sound)
+
+    def add_sprite(self, entity):
+        """Take a sprite out of its pool to draw a newly spawned world entity."""
+        if isinstance(entity, AlienBody):
+            pool = self.alien_pools[entity.alien_type]
+        elif isinstance(entity, UFOBody):
+            pool = self.ufo_pool
+        elif isinstance(entity, PlayerBody):
+            pool = self.player_pool
+        else:
+            return
+        sprite = pool.acquire()
+        sprite.position = entity.center_x, entity.center_y
+        self.sprites[entity] = sprite
+        self.pool_of[sprite] = pool
+        # Nothing to interpolate from yet
+        self.previous_positions[entity] = sprite.position
+
+    def remove_sprite(self, entity):
+        """Hand the sprite of a world entity that went away back to its pool."""
+        sprite = self.sprites.pop(entity, None)
+        self.previous_positions.pop(entity, None)
+        pool = self.pool_of.pop(sprite, None)
+        if pool is not None:
+            pool.release(sprite)
+
+    def pool_stats(self):
+        """Size, active count and high-water mark of every pool, for sizing them."""
+        stats = {f"alien_{alien_type.name.lower()}": pool.stats() for alien_type, pool in self.alien_pools.items()}
+        stats["player"] = self.player_pool.stats()
+        stats["ufo"] = self.ufo_pool.stats()
+        stats["particles"] = self.particles.stats()
+        stats["player_bullets"] = self.world.player_bullets.stats()
+        stats["alien_bullets"] = self.world.alien_bullets.stats()
+        return stats
+
+    def remember_positions(self):
+        """Store where every entity is before the next tick moves it.
+
+        Aliens waiting above the window (endless mode stacks rows there)
+        are skipped until one tick of dropping could bring them into view."""
+        limit = HIDDEN_ABOVE + self.world.fleet_drop
+        previous_positions = self.previous_positions
+        for entity in self.sprites:
+            y = entity.center_y
+            if y <= limit:
+                previous_positions[entity] = entity.center_x, y
+
+    def sync_sprites(self, alpha=1.0):
+        """Place the sprites between their previous and current world position, and the bullets with them.
+
+        Sprites of entities above the window stay where they are, out of sight."""
+        self.bullets.sync((self.world.player_bullets, self.world.alien_bullets), (1.0 - alpha) * self.clock.dt)
+        for entity, sprite in self.sprites.items():
+            if entity.center_y > HIDDEN_ABOVE:
+                continue
+            previous_x, previous_y = self.previous_positions.get(entity, (entity.center_x, entity.center_y))
+            sprite.position = (
+                previous_x + (entity.center_x - previous_x) * alpha,
+                previous_y + (entity.center_y - previous_y) * alpha,
+            )
@@ -0,0 +1,55 @@
+import arcade
+import pyglet
+from asset_manager import assets
+from settings import *
+
+
+class HUD:
+    """Score and lives display that is built once and kept between frames.
+
+    The score text is only laid out again when the score changes, and the
+    lives icons are preallocated sprites that are shown or hidden when the
+    number of lives changes, one for every life the game starts with (as
+    many as fit across the window). Everything is drawn with one sprite
+    list draw and one text batch draw."""
+
+    def __init__(self, max_lives=PLAYER_LIVES):
+        self.batch = pyglet.graphics.Batch()
+        self.score = None
+        self.lives = None
+        self.score_text = arcade.Text(
+            "",
+            WINDOW_WIDTH // 2,
+            WINDOW_HEIGHT - 30,
+            arcade.color.WHITE,
+            10,
+            font_name="Pixeled",
+            anchor_x="center",
+            batch=self.batch,
+        )
+
+        # Ship icons to represent lives
+        self.lives_list = arcade.SpriteList()
+        texture = assets.texture(SHIP_TEXTURE)
+        spacing = 32 * LIVES_ICON_SCALING + 5  # 32 is the original width of the ship sprite + 5 pixels spacing
+        for i in range(min(max_lives, int((WINDOW_WIDTH - 20) // spacing))):
+            icon = arcade.Sprite(texture, scale=LIVES_ICON_SCALING)
+            icon.center_x = 20 + i * spacing
+            icon.center_y = 15
+            self.lives_list.append(icon)
+
+    def update(self, score, lives):
+        """Rebuild only the parts whose value changed."""
+        if score != self.score:
+            self.score = score
+            self.score_text.text = f"SCORE: {score}"
+        if lives != self.lives:
+            self.lives = lives
+            for i, icon in enumerate(self.lives_list):
+                icon.visible = i < lives
+
+    def draw(self):
+        """Draw the lives and the score; returns the number of draw calls issued."""
+        self.lives_list.draw(pixelated=True)
+        self.batch.draw()
+        return 2
@@ -0,0 +1,53 @@
+import arcade
+import pyglet
+from asset_manager import assets
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+from startup_trace import trace
+
+BAR_WIDTH = 300
+BAR_HEIGHT = 12
+
+
+class LoadingView(arcade.View):
+    """Shown while the asset manager decodes textures and sounds on its loader thread.
+
+    It uses no assets itself, so it can be drawn on the very first frame.
+    Every update it collects what the loader thread finished, uploading the
+    sprite textures, and starts the game once everything is in."""
+    def __init__(self):
+        super().__init__()
+        self.progress = 0.0
+        self.drawn = False
+        self.batch = pyglet.graphics.Batch()
+        self.title = arcade.Text(
+            "LOADING",
+            WINDOW_WIDTH / 2,
+            WINDOW_HEIGHT / 2 + 30,
+            arcade.color.WHITE,
+            font_size=20,
+            font_name="Pixeled",
+            anchor_x="center",
+            batch=self.batch,
+        )
+
+    def on_show_view(self):
+        assets.start_loading()
+
+    def on_draw(self):
+        screen = self.window.logical_screen
+        with screen.activate():
+            screen.clear()
+            self.batch.draw()
+            left = (WINDOW_WIDTH - BAR_WIDTH) / 2
+            bottom = WINDOW_HEIGHT / 2 - BAR_HEIGHT
+            arcade.draw_lbwh_rectangle_outline(left, bottom, BAR_WIDTH, BAR_HEIGHT, arcade.color.WHITE)
+            arcade.draw_lbwh_rectangle_filled(left, bottom, BAR_WIDTH * self.progress, BAR_HEIGHT, arcade.color.WHITE)
+        screen.present()
+        if not self.drawn:
+            self.drawn = True
+            trace.mark("first loading frame")
+
+    def on_update(self, delta_time):
+        self.progress = assets.poll(self.window.ctx.default_atlas)
+        if assets.loaded:
+            self.window.assets_ready()
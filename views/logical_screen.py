@@ -0,0 +1,87 @@
+import arcade
+from arcade.gl import geometry
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT
+
+VERTEX_SHADER = """
+#version 330
+in vec2 in_vert;
+in vec2 in_uv;
+out vec2 uv;
+void main() {
+    gl_Position = vec4(in_vert, 0.0, 1.0);
+    uv = in_uv;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+uniform sampler2D image;
+in vec2 uv;
+out vec4 color;
+void main() {
+    color = texture(image, uv);
+}
+"""
+
+
+class LogicalScreen:
+    """Offscreen framebuffer at the game's fixed resolution, scaled to the window in one draw.
+
+    Views draw into it in WINDOW_WIDTH x WINDOW_HEIGHT game coordinates
+    between `activate()` and `present()`, so filling sprites, particles and
+    the background costs the same on any display. `present()` copies it to
+    the window as one nearest-neighbour textured quad, at the largest
+    whole-number scale that fits (shrunk to fit if the window is smaller
+    than the game), centered between black bars. A quad rather than a
+    scaling framebuffer blit, which software renderers do several times
+    slower."""
+
+    def __init__(self, window, width=WINDOW_WIDTH, height=WINDOW_HEIGHT):
+        self.ctx = ctx = window.ctx
+        self.width = width
+        self.height = height
+        self.texture = ctx.texture((width, height), components=4, filter=(ctx.NEAREST, ctx.NEAREST))
+        self.framebuffer = ctx.framebuffer(color_attachments=[self.texture])
+        self.camera = arcade.Camera2D(render_target=self.framebuffer)
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        self.quad = geometry.quad_2d_fs()
+        # Window framebuffer size, and left, bottom, width, height of the scaled image in it
+        self.window_size = (width, height)
+        self.viewport = (0, 0, width, height)
+        self.letterboxed = False
+        self.resize(*window.get_framebuffer_size())
+
+    def resize(self, width, height):
+        """Fit the image to a window framebuffer of `width` x `height` pixels."""
+        scale = min(width // self.width, height // self.height)
+        if scale >= 1:
+            scaled_width, scaled_height = self.width * scale, self.height * scale
+        else:
+            fit = min(width / self.width, height / self.height)
+            scaled_width, scaled_height = max(round(self.width * fit), 1), max(round(self.height * fit), 1)
+        self.window_size = (width, height)
+        self.viewport = ((width - scaled_width) // 2, (height - scaled_height) // 2, scaled_width, scaled_height)
+        self.letterboxed = (scaled_width, scaled_height) != (width, height)
+
+    def activate(self):
+        """Context manager drawing into the framebuffer in game coordinates."""
+        return self.camera.activate()
+
+    def clear(self):
+        self.framebuffer.clear(color=arcade.color.BLACK)
+
+    def present(self):
+        """Copy the finished image to the window, leaving the window framebuffer bound.
+
+        Returns the number of draw calls issued."""
+        screen = self.ctx.screen
+        screen.use()
+        if self.letterboxed:
+            screen.clear(color=arcade.color.BLACK)
+        screen.viewport = self.viewport
+        self.texture.use(0)
+        # Copied as is, not blended over what the window had
+        with self.ctx.enabled_only():
+            self.quad.render(self.program)
+        screen.viewport = (0, 0, *self.window_size)
+        return 1
@@ -0,0 +1,153 @@
+import math
+import numpy as np
+from arcade.gl import BufferDescription
+from pyglet import gl
+from settings import PARTICLE_BUDGET, PARTICLE_GRAVITY, PARTICLE_LIFETIME, PARTICLE_SIZE
+
+VERTEX_SHADER = """
+#version 330
+
+uniform WindowBlock {
+    mat4 projection;
+    mat4 view;
+} window;
+
+uniform float point_size;
+
+in vec2 in_position;
+in vec4 in_color;
+
+out vec4 v_color;
+
+void main() {
+    gl_Position = window.projection * window.view * vec4(in_position, 0.0, 1.0);
+    gl_PointSize = point_size;
+    v_color = in_color;
+}
+"""
+
+FRAGMENT_SHADER = """
+#version 330
+
+in vec4 v_color;
+
+out vec4 out_color;
+
+void main() {
+    out_color = v_color;
+}
+"""
+
+# Columns of a particle's vertex: position, then colour with the alpha it fades out by
+X, Y, R, G, B, ALPHA = range(6)
+
+
+class ParticleSystem:
+    """Explosion debris kept in NumPy arrays and drawn as square points with one draw call.
+
+    Live particles are packed at the front of the arrays, oldest first.
+    `update()` moves, ages and fades all of them with a few array operations
+    and packs the survivors again; `burst()` appends new ones behind them.
+    There are never more than `budget` live particles: a burst that does not
+    fit culls the oldest ones to make room."""
+
+    def __init__(self, ctx, budget=PARTICLE_BUDGET, seed=None):
+        self.ctx = ctx
+        self.budget = budget
+        self.count = 0
+        self.high_water = 0
+        self.culled = 0
+        # Position and colour, in the layout the vertex buffer expects
+        self.vertices = np.zeros((budget, 6), dtype=np.float32)
+        self.velocity = np.zeros((budget, 2), dtype=np.float32)
+        self.age = np.zeros(budget, dtype=np.float32)
+        self.lifetime = np.ones(budget, dtype=np.float32)
+        self.arrays = (self.vertices, self.velocity, self.age, self.lifetime)
+        # Purely cosmetic, so the game's seeded random numbers are left alone
+        self.rng = np.random.default_rng(seed)
+
+        self.program = ctx.program(vertex_shader=VERTEX_SHADER, fragment_shader=FRAGMENT_SHADER)
+        # In pixels of the logical screen, which is scaled up to the window as a whole
+        self.program["point_size"] = PARTICLE_SIZE
+        self.buffer = ctx.buffer(reserve=self.vertices.nbytes, usage="stream")
+        self.geometry = ctx.geometry(
+            [BufferDescription(self.buffer, "2f 4f", ["in_position", "in_color"])],
+            mode=ctx.POINTS,
+        )
+
+    def __len__(self):
+        return self.count
+
+    def burst(self, x, y, count, speed, color):
+        """Throw `count` particles out of (x, y) in every direction at up to `speed` pixels/s."""
+        count = min(count, self.budget)
+        overflow = self.count + count - self.budget
+        if overflow > 0:
+            self.cull(overflow)
+        start, end = self.count, self.count + count
+
+        angle = self.rng.uniform(0.0, 2 * math.pi, count)
+        # The square root spreads the speeds evenly over the disc instead of bunching them in the middle
+        magnitude = speed * np.sqrt(self.rng.random(count))
+        velocity = self.velocity[start:end]
+        velocity[:, 0] = np.cos(angle) * magnitude
+        velocity[:, 1] = np.sin(angle) * magnitude
+
+        vertices = self.vertices[start:end]
+        vertices[:, X] = x
+        vertices[:, Y] = y
+        shade = self.rng.uniform(0.6, 1.0, count)
+        vertices[:, R:ALPHA] = np.multiply.outer(shade, color) / 255
+        vertices[:, ALPHA] = 1.0
+        self.age[start:end] = 0.0
+        self.lifetime[start:end] = self.rng.uniform(0.5, 1.0, count) * PARTICLE_LIFETIME
+
+        self.count = end
+        if end > self.high_water:
+            self.high_water = end
+
+    def cull(self, count):
+        """Drop the `count` oldest particles."""
+        live = self.count
+        for array in self.arrays:
+            array[:live - count] = array[count:live]
+        self.count = live - count
+        self.culled += count
+
+    def clear(self):
+        self.count = 0
+
+    def update(self, delta_time):
+        """Move every live particle, fade it by its age and drop the ones that ran out."""
+        count = self.count
+        if not count:
+            return
+        age = self.age[:count]
+        lifetime = self.lifetime[:count]
+        velocity = self.velocity[:count]
+        vertices = self.vertices[:count]
+
+        age += delta_time
+        velocity[:, 1] -= PARTICLE_GRAVITY * delta_time
+        vertices[:, X:R] += velocity * delta_time
+        np.subtract(1.0, age / lifetime, out=vertices[:, ALPHA])
+
+        alive = age < lifetime
+        if not alive.all():
+            # Packing the survivors keeps them in order, so the oldest stay in front
+            keep = np.flatnonzero(alive)
+            for array in self.arrays:
+                array[:len(keep)] = array[keep]
+            self.count = len(keep)
+
+    def draw(self):
+        """Draw every live particle; returns the number of draw calls issued."""
+        if not self.count:
+            return 0
+        self.buffer.write(self.vertices[:self.count])
+        with self.ctx.enabled(self.ctx.BLEND, gl.GL_PROGRAM_POINT_SIZE):
+            self.geometry.render(self.program, vertices=self.count)
+        return 1
+
+    def stats(self):
+        return {"size": self.budget, "active": self.count, "high_water": self.high_water, "culled": self.culled}
@@ -0,0 +1,39 @@
+import arcade
+from sim.profiler import Profiler
+from settings import WINDOW_HEIGHT, PROFILER_REFRESH
+
+
+class ProfilerOverlay:
+    """Shows the profiler's rolling percentiles in the corner of the screen.
+
+    The text is only laid out again a few times per second, so the overlay
+    does not add much to the frame time it is measuring."""
+
+    def __init__(self, profiler: Profiler):
+        self.profiler = profiler
+        self.since_refresh = PROFILER_REFRESH
+        self.text = arcade.Text(
+            "",
+            10,
+            WINDOW_HEIGHT - 50,
+            arcade.color.LIME_GREEN,
+            9,
+            width=360,
+            multiline=True,
+            font_name=("Courier New", "monospace"),
+            anchor_y="top",
+        )
+
+    def update(self, delta_time):
+        self.since_refresh += delta_time
+        if self.since_refresh >= PROFILER_REFRESH:
+            self.since_refresh = 0.0
+            self.text.text = "\n".join(self.profiler.summary_lines())
+
+    def draw(self):
+        """Draw the panel and its text; returns the number of draw calls issued."""
+        arcade.draw_lbwh_rectangle_filled(
+            self.text.left - 4, self.text.bottom - 4, self.text.content_width + 8, self.text.content_height + 8, (0, 0, 0, 170)
+        )
+        self.text.draw()
+        return 2
@@ -0,0 +1,34 @@
+import arcade
+
+
+class RenderBatch:
+    """Every game sprite in one SpriteList, ordered by layer and drawn with one call.
+
+    All sprites share the texture atlas, so the number of draw calls does
+    not grow with the number of entity types. Sprites added after the batch
+    was first drawn can land out of layer order, so the list is re-sorted
+    once before the next draw when that happens."""
+
+    def __init__(self, layers):
+        self.layers = {name: index for index, name in enumerate(layers)}
+        self.sprites = arcade.SpriteList()
+        self.unsorted = False
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def add(self, sprite, layer):
+        sprite.layer = self.layers[layer]
+        if len(self.sprites) and self.sprites[-1].layer > sprite.layer:
+            self.unsorted = True
+        self.sprites.append(sprite)
+
+    def draw(self):
+        """Draw every sprite; returns the number of draw calls issued."""
+        if not len(self.sprites):
+            return 0
+        if self.unsorted:
+            self.sprites.sort(key=lambda sprite: sprite.layer)
+            self.unsorted = False
+        self.sprites.draw(pixelated=True)
+        return 1
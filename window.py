@@ -1,18 +1,146 @@
+import gc
 import arcade
-from settings import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE
+from asset_manager import assets
+from high_scores import HighScoreStore
+from input_latency import InputLatency
+from settings import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, RANDOM_SEED, HIGH_SCORE_FILE, TELEMETRY_DIR, TICK_RATE
+from sim import snapshot
+from sim.config import GameConfig
+from sim.profiler import Profiler
+from sim.replay import InputReplay
+from sim.telemetry import Telemetry
+from startup_trace import trace
+from views.background import StaticBackground
+from views.bullet_batch import BulletBatch
 from views.game_view import GameView
 from views.game_over_view import GameOverView
+from views.loading_view import LoadingView
+from views.logical_screen import LogicalScreen
+from views.particles import ParticleSystem
 
 
 class GameWindow(arcade.Window):
-    def __init__(self):
-        super().__init__(WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE)
+    def __init__(
+        self, seed=RANDOM_SEED, replay_path=None, record_path=None, profile_path=None, snapshot_path=None, asset_report=False,
+        telemetry_dir=TELEMETRY_DIR, game_config: GameConfig | None = None, tick_rate=TICK_RATE, vsync=False, latency=False,
+        fullscreen=False, size=(WINDOW_WIDTH, WINDOW_HEIGHT), high_score_file=HIGH_SCORE_FILE,
+    ):
+        super().__init__(
+            *size, WINDOW_TITLE, fullscreen=fullscreen, resizable=True, vsync=vsync,
+            # Only the upscale blit draws to the window, and a scaling blit cannot target a multisampled one
+            antialiasing=False,
+        )
+        # Every view draws at the game's resolution into this, and it is scaled up to the window
+        self.logical_screen = LogicalScreen(self)
+        # Shared by every view, made by prepare_renderers() once the assets are loaded
+        self.background = None
+        self.bullet_batch = None
+        self.particles = None
+        self.gpu_query = None
+        trace.mark("create window")
+        self.asset_report = asset_report
+
+        self.seed = seed
+        self.game_config = game_config
+        self.replay = InputReplay.load(replay_path) if replay_path else None
+        self.record_path = record_path
+        self.snapshot = snapshot.load(snapshot_path) if snapshot_path else None
+        # Streams per-tick timings of every game to a file
+        self.profiler = Profiler(stream_path=profile_path) if profile_path else None
+        # Read at startup so a game over never waits on the disk; no leaderboard without a file
+        self.high_scores = HighScoreStore(high_score_file) if high_score_file else None
+        # Gameplay events of every game played (not replayed) go to a file in telemetry_dir
+        self.telemetry = Telemetry(telemetry_dir, tick_rate) if telemetry_dir else None
+        self.tick_rate = tick_rate
+        # Key-to-present latency of every game played, printed on exit
+        self.latency = InputLatency() if latency else None
+
+    def start(self):
+        """Show the loading view while the assets load, or the game if they already are."""
+        if assets.loaded:
+            self.assets_ready()
+        else:
+            self.show_view(LoadingView())
+
+    def assets_ready(self):
+        """Every asset is loaded; share the sprite textures through one atlas and start playing."""
+        assets.pack(self.ctx.default_atlas)
+        trace.mark("load and upload assets")
+        if self.asset_report:
+            print(assets.report())
+        # Assets, fonts and arcade's own objects live for the whole run; keep the
+        # garbage collector from walking them again on every full collection
+        gc.collect()
+        gc.freeze()
+        self.show_game()
+
+    def prepare_renderers(self):
+        """Make the GPU resources the views draw with, the first time a view needs them.
+
+        A view is built for every game and every game over; sharing these
+        keeps a restart from uploading the background and compiling shaders
+        again, and from leaving the old ones behind."""
+        if self.background is None:
+            self.background = StaticBackground(self)
+            self.bullet_batch = BulletBatch(self.ctx)
+            self.particles = ParticleSystem(self.ctx)
+            self.gpu_query = self.ctx.query(samples=False, primitives=False)
 
     def show_game(self):
-        game = GameView()
+        # A replay or a snapshot is only played back for the first game
+        game = GameView(
+            self.seed, self.replay, self.game_config, profiler=self.profiler, snapshot=self.snapshot,
+            telemetry=self.telemetry if self.replay is None else None,
+            latency=self.latency if self.replay is None else None, tick_rate=self.tick_rate,
+        )
+        self.replay = None
+        self.snapshot = None
         game.setup()
+        trace.mark("build game view")
         self.show_view(game)
 
     def show_game_over(self):
-        game_over = GameOverView(final_score=self.current_view.score)
+        self.save_recording()
+        game = self.current_view
+        # A replayed game was already played once
+        rank = None
+        top = ()
+        if self.high_scores:
+            if game.replay is None:
+                rank = self.high_scores.submit(game.score, game.world.wave)
+            top = self.high_scores.top()
+        game_over = GameOverView(final_score=game.score, rank=rank, high_scores=top)
         self.show_view(game_over)
+
+    def save_recording(self):
+        """Write the inputs of the current game to the --record file, if any."""
+        if self.record_path and isinstance(self.current_view, GameView):
+            self.current_view.recorder.save(self.record_path)
+
+    def on_resize(self, width, height):
+        super().on_resize(width, height)
+        # Created after the window, which can already report a size while it is being created
+        if hasattr(self, "logical_screen"):
+            self.logical_screen.resize(*self.get_framebuffer_size())
+
+    def on_key_press(self, key, modifiers):
+        # Views handle their own keys first; this one works in all of them
+        if key == arcade.key.F11:
+            self.set_fullscreen(not self.fullscreen)
+
+    def flip(self):
+        super().flip()
+        if self.latency:
+            self.latency.presented()
+
+    def close(self):
+        self.save_recording()
+        if self.latency:
+            print(self.latency.report(self.tick_rate, self.vsync))
+        if self.profiler:
+            self.profiler.close()
+        if self.high_scores:
+            self.high_scores.close()
+        if self.telemetry:
+            self.telemetry.close()
+        super().close()